@@ -0,0 +1,231 @@
+"""Procesarea în lot a mai multor modele ETABS, în paralel pe procese separate.
+
+Fiecare model rulează într-un proces propriu, cu instanța lui de ETABS (sau model simulat)
+și cu un folder de lucru propriu (frames.db, beam_selection_temp.json, Excel, jurnal),
+astfel încât o eroare într-un model nu le afectează pe celelalte.
+
+Lotul este descris de un fișier JSON:
+    {
+        "template": "Template.xlsx",
+        "output_dir": "batch_output",
+        "jobs": [
+            {"model": "C:/Models/V1.edb", "selection": "selectie_V1.json"},
+            {"model": "C:/Models/V2.edb", "selection": "selectie_V2.json", "name": "V2"}
+        ]
+    }
+
+Utilizare:
+    python batch.py lot.json --workers 4
+    python batch.py lot.json --backend fake --skip-excel
+    python batch.py lot.json --results
+"""
+import contextlib
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+import traceback
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+# Numărul de frame-uri al modelului simulat (backend "fake") dacă jobul nu specifică altul
+FAKE_FRAMES = 10000
+
+
+def _job_name(job):
+    return job.get("name") or os.path.splitext(os.path.basename(job["model"]))[0]
+
+
+def _open_backend(job, backend):
+    """Creează SapModel-ul procesului: instanță ETABS proprie sau model simulat"""
+    from etabs_api.connection import set_sap_model, start_etabs_instance
+    from etabs_api.instrumentation import instrument
+
+    if backend == "fake":
+        from etabs_api.fake_model import FakeSapModel, generate_model
+        seed = zlib.crc32(job["model"].encode("utf-8"))
+        data = generate_model(job.get("frames", FAKE_FRAMES), seed=seed)
+        data.filename = job["model"]
+        etabs_object, sap_model = None, FakeSapModel(data, latency=job.get("latency", 0.0))
+    else:
+        etabs_object, sap_model = start_etabs_instance(os.path.abspath(job["model"]))
+
+    # Procesul poate fi refolosit pentru alt model: cache-urile și statisticile pornesc de la zero
+    from etabs_api.instrumentation import call_statistics
+    from etabs_api.operations import invalidate_caches
+    invalidate_caches()
+    call_statistics.reset()
+
+    # Apelurile sunt contorizate mereu în lot, pentru raportul final
+    set_sap_model(instrument(sap_model))
+    return etabs_object
+
+
+def _count_beams(db_path):
+    from db.session import session
+
+    with session(db_path, readonly=True) as conn:
+        return conn.execute("SELECT COUNT(*) FROM Frames").fetchone()[0]
+
+
+def run_job(job, template, output_dir, backend="etabs", skip_excel=False, results=False):
+    """Rulează un model: baza de date și Excel-ul, în folderul propriu. Returnează o intrare de raport."""
+    name = _job_name(job)
+    work_dir = os.path.join(output_dir, name)
+    os.makedirs(work_dir, exist_ok=True)
+    selection = job["selection"]
+
+    report = {"name": name, "model": job["model"], "status": "error", "beams": 0, "com_calls": 0,
+              "stages": {}, "work_dir": work_dir, "error": None, "pid": os.getpid()}
+    start = time.perf_counter()
+    etabs_object = None
+
+    log_path = os.path.join(work_dir, "batch.log")
+    with open(log_path, "w", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+        os.chdir(work_dir)
+        try:
+            from etabs_api.connection import close_etabs_instance
+            from etabs_api.instrumentation import call_statistics
+
+            etabs_object = _open_backend(job, backend)
+            report["stages"]["connect"] = time.perf_counter() - start
+
+            shutil.copyfile(selection, "beam_selection_temp.json")
+
+            stage_start = time.perf_counter()
+            from db.operations import create_database
+            if not create_database([]):
+                raise RuntimeError("create_database a eșuat")
+            report["stages"]["database"] = time.perf_counter() - stage_start
+            report["beams"] = _count_beams("frames.db")
+
+            if results:
+                # Eforturile și armătura necesară: pas separat, doar la cerere (modelul trebuie să fie analizat)
+                stage_start = time.perf_counter()
+                from db.operations import store_analysis_results
+                if not store_analysis_results("frames.db"):
+                    raise RuntimeError("store_analysis_results a eșuat")
+                report["stages"]["results"] = time.perf_counter() - stage_start
+
+            if not skip_excel:
+                if not template or not os.path.exists(template):
+                    raise RuntimeError(f"Fișierul template nu există: {template}")
+                stage_start = time.perf_counter()
+                from excel.operations import copy_excel_file_with_column_widths, create_structured_excel_layout
+                excel_path = os.path.join(work_dir, f"{name}.xlsx")
+                if not copy_excel_file_with_column_widths(template, excel_path):
+                    raise RuntimeError("Fișierul template nu a putut fi copiat")
+                if not create_structured_excel_layout(excel_path, template, "frames.db"):
+                    raise RuntimeError("Structura Excel nu a putut fi creată")
+                report["stages"]["excel"] = time.perf_counter() - stage_start
+                report["excel"] = excel_path
+
+            report["com_calls"] = sum(stats.count for stats in call_statistics.snapshot().values())
+            report["status"] = "ok"
+        except Exception as e:
+            report["error"] = f"{type(e).__name__}: {e}"
+            traceback.print_exc(file=log)
+        finally:
+            # Procesul poate fi refolosit: conexiunile la baza de date a acestui model se închid
+            from db.session import close_connections
+            close_connections()
+            if etabs_object is not None:
+                close_etabs_instance(etabs_object)
+            report["seconds"] = time.perf_counter() - start
+    return report
+
+
+def run_batch(jobs, template=None, output_dir="batch_output", workers=None, backend="etabs", skip_excel=False,
+              results=False):
+    """Rulează toate modelele pe un pool de procese și returnează raportul consolidat"""
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    # Procesele își schimbă folderul curent, deci toate căile trebuie să fie absolute
+    output_dir = os.path.abspath(output_dir)
+    template = os.path.abspath(template) if template else None
+    jobs = [dict(job, model=os.path.abspath(job["model"]), selection=os.path.abspath(job["selection"]))
+            for job in jobs]
+    os.makedirs(output_dir, exist_ok=True)
+    print(f"-- Lot de {len(jobs)} modele pe {workers} procese (backend: {backend})")
+
+    start = time.perf_counter()
+    reports = []
+    # "spawn": fiecare proces pornește curat (fără stare COM moștenită de la procesul părinte)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {pool.submit(run_job, job, template, output_dir, backend, skip_excel, results): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                report = future.result()
+            except Exception as e:
+                # Procesul a căzut (ex: ETABS închis forțat) - modelul este raportat ca eșuat
+                report = {"name": _job_name(job), "model": job["model"], "status": "error", "beams": 0,
+                          "com_calls": 0, "stages": {}, "seconds": 0.0, "error": f"{type(e).__name__}: {e}"}
+            reports.append(report)
+            mark = "✓✓" if report["status"] == "ok" else "⮽⮽"
+            print(f"{mark} {report['name']}: {report['status']} în {report['seconds']:.1f} s"
+                  f"{'' if report['status'] == 'ok' else ' - ' + str(report['error'])}")
+
+    summary = {
+        "created_at": datetime.now().isoformat(),
+        "backend": backend,
+        "workers": workers,
+        "wall_seconds": time.perf_counter() - start,
+        "serial_seconds": sum(report.get("seconds", 0.0) for report in reports),
+        "ok": sum(report["status"] == "ok" for report in reports),
+        "failed": sum(report["status"] != "ok" for report in reports),
+        "jobs": sorted(reports, key=lambda report: report["name"]),
+    }
+    with open(os.path.join(output_dir, "batch_report.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    print(format_report(summary))
+    return summary
+
+
+def format_report(summary):
+    """Tabelul text al raportului consolidat"""
+    lines = [f"-- Raport lot: {summary['ok']} reușite, {summary['failed']} eșuate, "
+             f"{summary['wall_seconds']:.1f} s (serial: {summary['serial_seconds']:.1f} s)",
+             f"   {'Model':<24} {'Status':<7} {'Grinzi':>7} {'Apeluri COM':>12} {'Timp (s)':>9}"]
+    for report in summary["jobs"]:
+        lines.append(f"   {report['name']:<24} {report['status']:<7} {report['beams']:>7} "
+                     f"{report['com_calls']:>12} {report.get('seconds', 0.0):>9.1f}")
+    return "\n".join(lines)
+
+
+def load_batch_file(path):
+    """Citește descrierea lotului; căile relative sunt față de fișierul lotului"""
+    with open(path, "r", encoding="utf-8") as f:
+        batch = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+
+    def resolve(value):
+        return value if not value or os.path.isabs(value) else os.path.join(base, value)
+
+    for job in batch["jobs"]:
+        job["model"] = resolve(job["model"])
+        job["selection"] = resolve(job["selection"])
+    batch["template"] = resolve(batch.get("template"))
+    batch["output_dir"] = resolve(batch.get("output_dir", "batch_output"))
+    return batch
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Procesare în lot a modelelor ETABS")
+    parser.add_argument("batch_file", help="fișierul JSON cu modelele și selecțiile")
+    parser.add_argument("--workers", type=int, default=None, help="numărul de procese (implicit: nuclee)")
+    parser.add_argument("--backend", choices=["etabs", "fake"], default="etabs")
+    parser.add_argument("--skip-excel", action="store_true", help="doar baza de date, fără Excel")
+    parser.add_argument("--results", action="store_true",
+                        help="extrage și eforturile / armătura necesară din ETABS în baza de date")
+    args = parser.parse_args()
+
+    batch = load_batch_file(args.batch_file)
+    summary = run_batch(batch["jobs"], batch["template"], batch["output_dir"], args.workers,
+                        args.backend, args.skip_excel, args.results)
+    sys.exit(0 if summary["failed"] == 0 else 1)
@@ -0,0 +1,179 @@
+import hashlib
+import os
+import sqlite3
+from datetime import datetime
+
+from db.session import session
+
+# Versiunea formulei de hash; o schimbare invalidează amprentele salvate anterior
+FINGERPRINT_VERSION = 3
+
+RELEASES_TABLE = "Frame Assignments - Releases and Partial Fixity"
+RELEASE_FIELDS = ["PI", "V2I", "V3I", "TI", "M2I", "M3I", "PJ", "V2J", "V3J", "TJ", "M2J", "M3J"]
+
+# Eforturile depind și de încărcări și combinații: definițiile lor intră în hash-ul global
+# (un apel pe tabel; tabelele care lipsesc din model contează ca goale)
+LOAD_TABLES = (
+    "Load Pattern Definitions",
+    "Load Case Definitions - Summary",
+    "Load Combination Definitions",
+    "Frame Loads - Distributed",
+    "Frame Loads - Point",
+    "Area Loads - Uniform",
+    "Joint Loads - Force",
+)
+
+
+class ModelFingerprint:
+    """Amprenta modelului: hash per frame (secțiune, geometrie, eliberări, label) și hash global.
+
+    Hash-ul global cuprinde și loads_hash (încărcări, combinații, starea analizei și a proiectării),
+    deci eforturile și rezultatele de proiectare se refolosesc doar dacă nici acestea nu s-au schimbat.
+    """
+
+    def __init__(self, frame_hashes, model_hash=None, loads_hash=""):
+        self.frame_hashes = dict(frame_hashes)
+        self.loads_hash = loads_hash
+        self.model_hash = model_hash or _model_hash(self.frame_hashes, loads_hash)
+
+    def __len__(self):
+        return len(self.frame_hashes)
+
+
+def _frame_hash(*parts):
+    text = "|".join(str(part) for part in parts)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _model_hash(frame_hashes, loads_hash=""):
+    digest = hashlib.blake2b(f"v{FINGERPRINT_VERSION}|{loads_hash}".encode("utf-8"), digest_size=16)
+    for name in sorted(frame_hashes):
+        digest.update(f"{name}:{frame_hashes[name]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _read_releases():
+    """Eliberările tuturor frame-urilor dintr-un singur tabel ETABS ({nume: text})"""
+    from etabs_api.tables import read_table_data, table_column
+
+    fields, number_records, table_data = read_table_data(RELEASES_TABLE, fields=["UniqueName", *RELEASE_FIELDS])
+    if "UniqueName" not in fields or number_records == 0:
+        return {}
+    columns = [table_column(fields, table_data, field) for field in RELEASE_FIELDS if field in fields]
+    return {name: ",".join(values) for name, *values in zip(table_column(fields, table_data, "UniqueName"), *columns)}
+
+
+def _analysis_stamp(sap_model):
+    """Starea analizei: statusul cazurilor, data fișierului .LOG (rescris la fiecare rulare a analizei)
+    și disponibilitatea rezultatelor proiectării la beton"""
+    status = sap_model.Analyze.GetCaseStatus()
+    parts = [str(sap_model.GetModelIsLocked()), f"design={sap_model.DesignConcrete.GetResultsAvailable()}"]
+    if status[-1] == 0:
+        parts.extend(f"{case}={value}" for case, value in zip(status[1], status[2]))
+    log_path = os.path.splitext(sap_model.GetModelFilename())[0] + ".LOG"
+    if os.path.exists(log_path):
+        parts.append(f"log={os.path.getmtime(log_path)}")
+    return ",".join(parts)
+
+
+def _loads_hash(sap_model):
+    """Hash-ul tabelelor de încărcări / combinații și al stării analizei"""
+    from etabs_api.tables import read_table_data
+
+    digest = hashlib.blake2b(digest_size=16)
+    for table_key in LOAD_TABLES:
+        try:
+            fields, number_records, table_data = read_table_data(table_key)
+        except Exception:
+            # Tabel indisponibil (ex: modelul nu are încărcări de acest tip)
+            fields, number_records, table_data = [], 0, []
+        digest.update(f"{table_key}|{'|'.join(fields)}|{number_records}\n".encode("utf-8"))
+        digest.update("|".join(str(value) for value in table_data).encode("utf-8"))
+    digest.update(_analysis_stamp(sap_model).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def compute_model_fingerprint():
+    """Calculează amprenta modelului din apeluri bulk (GetAllFrames, GetLabelNameList, tabelul de eliberări,
+    tabelele de încărcări și statusul analizei)"""
+    from etabs_api.connection import get_sap_model
+
+    sap_model = get_sap_model()
+    frames = sap_model.FrameObj.GetAllFrames()
+    if frames[-1] != 0:
+        raise RuntimeError(f"FrameObj.GetAllFrames a returnat eroare: {frames[-1]}")
+    labels = sap_model.FrameObj.GetLabelNameList()
+    if labels[-1] != 0:
+        raise RuntimeError(f"FrameObj.GetLabelNameList a returnat eroare: {labels[-1]}")
+    label_by_name = dict(zip(labels[1], labels[2]))
+
+    try:
+        releases = _read_releases()
+    except Exception as e:
+        print(f"⮽⮽ Eliberările nu au putut fi citite pentru amprentă: {e}")
+        releases = {}
+
+    names, sections, stories = frames[1], frames[2], frames[3]
+    coordinates = zip(frames[6], frames[7], frames[8], frames[9], frames[10], frames[11])
+    frame_hashes = {}
+    for name, section, story, coords, angle, cardinal in zip(names, sections, stories, coordinates,
+                                                             frames[12], frames[19]):
+        geometry = ",".join(f"{value:.6f}" for value in coords)
+        frame_hashes[name] = _frame_hash(label_by_name.get(name, ""), story, section, geometry,
+                                         f"{angle:.6f}", cardinal, releases.get(name, ""))
+
+    try:
+        loads_hash = _loads_hash(sap_model)
+    except Exception as e:
+        # Fără hash de încărcări amprenta globală nu se potrivește cu nicio rulare, eforturile se re-extrag
+        print(f"⮽⮽ Încărcările nu au putut fi citite pentru amprentă: {e}")
+        loads_hash = os.urandom(16).hex()
+
+    fingerprint = ModelFingerprint(frame_hashes, loads_hash=loads_hash)
+    print(f"-- Amprenta modelului: {len(fingerprint)} frame-uri, hash {fingerprint.model_hash[:12]}")
+    return fingerprint
+
+
+def clear_fingerprint(cursor):
+    """Șterge amprenta salvată (rezultatele din baza de date nu mai corespund unui model cunoscut)"""
+    cursor.execute("DROP TABLE IF EXISTS FrameFingerprints")
+    cursor.execute("DROP TABLE IF EXISTS ModelFingerprint")
+
+
+def save_fingerprint(cursor, fingerprint, frame_names):
+    """Salvează amprenta modelului și hash-urile grinzilor ale căror rezultate au fost extrase"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS FrameFingerprints (
+        UniqueName TEXT PRIMARY KEY,
+        Hash TEXT NOT NULL
+    )
+    """)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS ModelFingerprint (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        Hash TEXT NOT NULL,
+        FrameCount INTEGER,
+        Version INTEGER,
+        CreatedAt TEXT
+    )
+    """)
+    cursor.executemany("INSERT OR REPLACE INTO FrameFingerprints (UniqueName, Hash) VALUES (?, ?)",
+                       ((name, fingerprint.frame_hashes[name]) for name in frame_names
+                        if name in fingerprint.frame_hashes))
+    cursor.execute("INSERT OR REPLACE INTO ModelFingerprint (id, Hash, FrameCount, Version, CreatedAt) "
+                   "VALUES (1, ?, ?, ?, ?)",
+                   (fingerprint.model_hash, len(fingerprint), FINGERPRINT_VERSION, datetime.now().isoformat()))
+
+
+def load_previous_run(db_path):
+    """Citește amprenta salvată la o extragere de rezultate (None dacă lipsește)"""
+    try:
+        with session(db_path, readonly=True) as conn:
+            row = conn.execute("SELECT Hash, Version FROM ModelFingerprint WHERE id = 1").fetchone()
+            if row is None or row[1] != FINGERPRINT_VERSION:
+                return None
+            frame_hashes = dict(conn.execute("SELECT UniqueName, Hash FROM FrameFingerprints"))
+            return {"model_hash": row[0], "frame_hashes": frame_hashes}
+    except sqlite3.Error:
+        # Bază de date fără rezultate extrase (sau creată înainte de amprentare)
+        return None
@@ -1,19 +1,31 @@
 import sqlite3
 import os
 import json
+import contextlib
+import io
 from datetime import datetime  # Add missing import
 
+from etabs_api.instrumentation import instrumented_stage
+from db.fingerprint import clear_fingerprint, save_fingerprint
+from db.schema import (INSERT_GROUP_COMBO_SQL, INSERT_GROUP_SQL, create_frame_indexes, create_schema, group_rows,
+                       load_group_combos)
+from db.session import bulk_session, close_connections, session
 
+
+@instrumented_stage("create_database")
 def create_database(frame_list):
     """ Creează baza de date pentru elementele de tip frame (grinzi) din toate grupurile."""
 
     # Calea către baza de date în folderul root
     db_path = "frames.db"
 
-    # Verifică dacă baza de date există deja și o șterge
+    # Baza de date veche este păstrată: store_analysis_results preia din ea rezultatele modelului neschimbat
+    previous_db_path = db_path + ".prev"
+    close_connections(db_path)
+    close_connections(previous_db_path)
     if os.path.exists(db_path):
-        os.remove(db_path)
-        print("-- Am șters baza de date veche pentru a o recrea!")
+        os.replace(db_path, previous_db_path)
+        print(f"-- Baza de date veche păstrată ca {previous_db_path} pentru reîmprospătare incrementală")
 
     # Încarcă datele din fișierul JSON temporar
     json_data = load_temp_json_data()
@@ -21,140 +33,206 @@ def create_database(frame_list):
         print("⮽⮽ Nu s-au putut încărca datele din fișierul JSON temporar!")
         return False
 
-    # Conectează-te la baza de date
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    # Creează tabelă cu noile coloane pentru poziția Excel
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS Frames (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        UniqueName TEXT NOT NULL,
-        Label TEXT,
-        GUID TEXT,
-        GroupID INTEGER,
-        OrderID INTEGER,
-        Scenario TEXT,
-        Rezistente TEXT,
-        DCL TEXT,
-        DCM TEXT,
-        DCH TEXT,
-        Secundare TEXT,
-        DirX TEXT,
-        DirY TEXT,
-        CombUpper TEXT,
-        CombLower TEXT,
-        Etaj TEXT,
-        SelectionTime TEXT,
-        ExcelColumn TEXT,      
-        ExcelRow INTEGER,      
-        SheetName TEXT         
-    )
-    """)
-    print("-- Am creat tabela Frames cu noile coloane Excel!")
-
-    # Procesează TOATE grupurile de grinzi din ambele scenarii
-    total_beams_added = 0
-
-    # Procesează scenariul A (Infrastructura)
-    if "scenario_a" in json_data:
-        scenario_a_data = json_data["scenario_a"]
-        beam_groups_a = scenario_a_data.get("beam_groups", [])
-        print(f"-- Procesare scenariu A (Infrastructura) cu {len(beam_groups_a)} grupuri")
-        total_beams_added += process_beam_groups_from_json(cursor, beam_groups_a, "A")
-    else:
-        print("-- Niciun scenariu A găsit în JSON")
-
-    # Procesează scenariul B (Suprastructura)
-    if "scenario_b" in json_data:
-        scenario_b_data = json_data["scenario_b"]
-        beam_groups_b = scenario_b_data.get("beam_groups", [])
-        print(f"-- Procesare scenariu B (Suprastructura) cu {len(beam_groups_b)} grupuri")
-        total_beams_added += process_beam_groups_from_json(cursor, beam_groups_b, "B")
-    else:
-        print("-- Niciun scenariu B găsit în JSON")
-
-    # Salvează schimbările
-    conn.commit()
+    # Conexiune dedicată cu setări pentru scriere în bloc; commit și închidere la ieșirea din bloc
+    with bulk_session(db_path) as conn:
+        cursor = conn.cursor()
+
+        # Creează tabelele Groups / GroupCombos / Frames (schema curentă)
+        create_schema(cursor)
+        print("-- Am creat tabelele Groups, GroupCombos și Frames!")
+
+        # Faza 1: atributele tuturor grinzilor (label, GUID) extrase în bloc, înainte de orice INSERT
+        # (un număr constant de apeluri, deci nu se preiau din rularea anterioară)
+        beam_names = collect_beam_names_from_json(json_data)
+        frame_table = get_frame_attributes(beam_names) if beam_names else None
+        attributes = prefetch_beam_attributes(beam_names, frame_table)
+
+        # Faza 2: rândurile pentru ambele scenarii (grupurile o dată, grinzile cu un singur executemany)
+        selection_time = datetime.now().isoformat()
+        rows, groups, combos = [], [], []
+        for scenario_key, scenario in (("scenario_a", "A"), ("scenario_b", "B")):
+            if scenario_key not in json_data:
+                print(f"-- Niciun scenariu {scenario} găsit în JSON")
+                continue
+            beam_groups = json_data[scenario_key].get("beam_groups", [])
+            scenario_rows, scenario_groups, scenario_combos = build_frame_rows(beam_groups, scenario, attributes,
+                                                                               selection_time)
+            rows.extend(scenario_rows)
+            groups.extend(scenario_groups)
+            combos.extend(scenario_combos)
+        cursor.executemany(INSERT_GROUP_SQL, groups)
+        cursor.executemany(INSERT_GROUP_COMBO_SQL, combos)
+        total_beams_added = insert_frame_rows(cursor, rows)
+
+        # Indexurile se creează după inserarea în bloc (o singură sortare în loc de actualizări per rând)
+        create_frame_indexes(cursor)
 
     print(f"-- S-au adăugat {total_beams_added} grinzi în baza de date din toate grupurile!")
-
-    # Închide conexiunea
-    conn.close()
     print("-- Conexiunea la baza de date a fost închisă!")
     return True
 
 
-def process_beam_groups_from_json(cursor, beam_groups, scenario):
-    """Procesează toate grupurile de grinzi pentru un scenariu cu setările individuale din JSON"""
-    total_beams = 0
+@instrumented_stage("store_analysis_results")
+def store_analysis_results(db_path="frames.db"):
+    """Extrage din ETABS eforturile și armătura necesară pentru grinzile din Frames (pas separat, la cerere).
+
+    Nu face parte din create_database: modelul trebuie să fie analizat (și proiectat la beton pentru
+    BeamDesign), iar extragerea schimbă temporar selecția de output din ETABS (restaurată la final).
+    Din eforturi se calculează apoi înfășurătorile CombUpper / CombLower (FrameEnvelopes).
+    Rezultatele extrase deja pentru un model cu aceeași amprentă (în această bază de date sau în
+    db_path + ".prev") sunt păstrate / copiate; din ETABS se cere doar ce lipsește, iar dacă nu
+    lipsește nimic nu se face niciun apel de extragere.
+    """
+    if not os.path.exists(db_path):
+        print(f"⮽⮽ Baza de date {db_path} nu există - creați-o întâi")
+        return False
+
+    previous_db_path = db_path + ".prev"
+    fingerprint = get_model_fingerprint()
+    current_run = load_matching_run(db_path, fingerprint)
+    previous_run = load_matching_run(previous_db_path, fingerprint)
+
+    with session(db_path) as conn:
+        cursor = conn.cursor()
+        beam_names = [row[0] for row in cursor.execute("SELECT DISTINCT UniqueName FROM Frames")]
+        if not beam_names:
+            print("⮽⮽ Nu există grinzi în baza de date pentru extragerea rezultatelor")
+            return False
+
+        create_frame_forces_table(cursor)
+        create_beam_design_table(cursor)
+        if current_run is None:
+            # Rezultatele extrase pentru alt model (sau fără amprentă) sunt înlocuite
+            cursor.execute("DELETE FROM FrameForces")
+            cursor.execute("DELETE FROM BeamDesign")
+            clear_fingerprint(cursor)
+
+        # Perechile grindă - combinație și grinzile pentru proiectare care nu au încă rezultate
+        beam_combos = frame_force_requests(cursor)
+        discard_stored_frame_forces(cursor, beam_combos)
+        design_names = [name for name in beam_names
+                        if current_run is None or name not in current_run["frame_hashes"]]
+        if previous_run is not None:
+            copied = copy_previous_frame_forces(cursor, previous_db_path, beam_combos)
+            design_names, copied_design = copy_previous_beam_design(cursor, previous_db_path, design_names,
+                                                                    previous_run["frame_hashes"])
+            print(f"-- Preluate din rularea anterioară: {copied} perechi grindă - combinație, "
+                  f"proiectarea pentru {copied_design} grinzi")
+
+        force_names = [name for name, combos in beam_combos.items() if combos]
+        group_names = list(dict.fromkeys(force_names + design_names))
+        design_stored = True
+        if group_names:
+            # Un singur grup ETABS temporar, folosit atât pentru eforturi cât și pentru proiectare
+            with beam_results_group(group_names) as group_name:
+                # Eforturile pentru combinațiile CombUpper / CombLower ale grinzilor (un singur apel FrameForce)
+                store_frame_forces(cursor, beam_combos, group_name)
+
+                # Armătura necesară din proiectarea ETABS la beton (un singur apel GetSummaryResultsBeam)
+                if design_names:
+                    design_stored = store_beam_design(cursor, design_names, group_name) is not None
+        else:
+            print("-- Modelul nu s-a schimbat: toate rezultatele sunt preluate, fără extragere din ETABS")
+
+        # Amprenta modelului și grinzile acoperite de rezultate, pentru următoarea extragere
+        # (fără amprentă dacă proiectarea a eșuat, altfel grinzile ar apărea ca acoperite)
+        if fingerprint is not None and design_stored:
+            save_fingerprint(cursor, fingerprint, beam_names)
+
+    close_connections(previous_db_path)
+
+    # Înfășurătorile se calculează din FrameForces salvat (fără apeluri ETABS)
+    store_frame_envelopes(db_path)
+    print(f"✓✓ Rezultatele ETABS au fost salvate în {db_path}")
+    return True
+
+
+FRAME_COLUMNS = (
+    "UniqueName", "Label", "GUID", "GroupID", "OrderID", "Scenario", "SelectionTime",
+    "ExcelColumn", "ExcelRow", "SheetName",
+)
+
+INSERT_FRAME_SQL = (f"INSERT INTO Frames ({', '.join(FRAME_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(FRAME_COLUMNS))})")
+
+
+def prefetch_beam_attributes(beam_names, frame_table=None):
+    """Label și GUID pentru toate grinzile: {grindă: (label, guid)}.
+
+    Ordinea surselor: frame_table (extras bulk din ETABS), indexul modelului pentru label;
+    doar GUID-urile care lipsesc tot sunt cerute per grindă.
+    """
+    attributes = {}
+    missing = []
+    for frame_name in beam_names:
+        if frame_table is not None and frame_table.get(frame_name, "Label") is not None:
+            attributes[frame_name] = (frame_table.get(frame_name, "Label"), frame_table.get(frame_name, "GUID"))
+        else:
+            attributes[frame_name] = (None, None)
+        if attributes[frame_name][0] is None or attributes[frame_name][1] is None:
+            missing.append(frame_name)
+
+    if missing:
+        print(f"-- {len(missing)} grinzi fără label / GUID în extragerea bulk, se completează individual")
+        for frame_name in missing:
+            label, guid = attributes[frame_name]
+            if label is None:
+                label, _ = get_label_and_story(frame_name)
+            if guid is None:
+                guid = get_frame_guid(frame_name)
+            attributes[frame_name] = (label, guid)
+    return attributes
 
+
+def build_frame_rows(beam_groups, scenario, attributes, selection_time):
+    """Rândurile tabelelor Frames, Groups și GroupCombos pentru toate grupurile unui scenariu.
+
+    Setările se citesc o dată pe grup; returnează (rânduri Frames, rânduri Groups, rânduri GroupCombos).
+    """
+    rows, groups, combos = [], [], []
     if not beam_groups:
         print(f"-- Niciun grup de grinzi găsit pentru scenariul {scenario}")
-        return 0
+        return rows, groups, combos
 
     print(f"-- Procesare {len(beam_groups)} grupuri pentru scenariul {scenario}")
-
     for group_data in beam_groups:
-        group_number = group_data.get("group_number", 1)
-
         if not isinstance(group_data, dict):
-            print(f"⮽⮽ Format neașteptat pentru grupul {group_number}: {type(group_data)}")
+            print(f"⮽⮽ Format neașteptat pentru grup: {type(group_data)}")
             continue
 
+        group_number = group_data.get("group_number", 1)
         beams_in_group = group_data.get("beams", [])
         group_settings = group_data.get("settings", {})
-
-        print(f"-- Procesare grup {group_number} cu {len(beams_in_group)} grinzi")
+        design_data = get_design_data_from_group_settings(group_settings, f"grupul {group_number}",
+                                                          group_number, None, scenario)
+        group, group_combos = group_rows(scenario, group_number, design_data,
+                                         combo_list(group_settings.get("selected_combinations_upper", [])),
+                                         combo_list(group_settings.get("selected_combinations_lower", [])))
+        groups.append(group)
+        combos.extend(group_combos)
+        settings = (scenario, selection_time,
+                    None, None, None)  # ExcelColumn, ExcelRow, SheetName - populate mai târziu
 
         for order_in_group, frame_name in enumerate(beams_in_group, 1):
-            try:
-                label, story = get_label_and_story(frame_name)
-                guid = get_frame_guid(frame_name)
+            label, guid = attributes.get(frame_name, (None, None))
+            rows.append((frame_name, label, guid, group_number, order_in_group) + settings)
+        print(f"-- Grup {group_number}: {len(beams_in_group)} grinzi (Scenariu {scenario})")
+    return rows, groups, combos
+
+
+def combo_list(combinations):
+    """Lista combinațiilor selectate ale unui grup (lista din JSON sau textul "C1, C2")"""
+    from etabs_api.results import split_combos
+
+    if isinstance(combinations, list):
+        return [str(combo) for combo in combinations if combo]
+    return split_combos(combinations)
+
 
-                design_data = get_design_data_from_group_settings(group_settings, frame_name, group_number,
-                                                                  order_in_group, scenario)
-
-                # Inserează datele în baza de date cu noile coloane (inițial NULL)
-                cursor.execute("""
-                INSERT INTO Frames (
-                    UniqueName, Label, GUID, GroupID, OrderID, Scenario,
-                    Rezistente, DCL, DCM, DCH, Secundare, DirX, DirY,
-                    CombUpper, CombLower, Etaj, SelectionTime,
-                    ExcelColumn, ExcelRow, SheetName
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    frame_name,
-                    label,
-                    guid,
-                    group_number,
-                    order_in_group,
-                    scenario,
-                    design_data["rezistente"],
-                    design_data["dcl"],
-                    design_data["dcm"],
-                    design_data["dch"],
-                    design_data["secundare"],
-                    design_data["dir_x"],
-                    design_data["dir_y"],
-                    design_data["comb_upper"],
-                    design_data["comb_lower"],
-                    design_data["etaj"],
-                    design_data["selection_time"],
-                    None,  # ExcelColumn - va fi populat mai târziu
-                    None,  # ExcelRow - va fi populat mai târziu
-                    None   # SheetName - va fi populat mai târziu
-                ))
-
-                print(f"-- Grinda {frame_name} adăugată (Scenariu {scenario}, Grup {group_number}, Poziția {order_in_group})")
-                total_beams += 1
-
-            except Exception as e:
-                print(f"⮽⮽ EROARE la procesarea grinzii {frame_name}: {e}")
-                import traceback
-                traceback.print_exc()
-
-    return total_beams
+def insert_frame_rows(cursor, rows):
+    """Inserează toate rândurile în Frames cu un singur executemany (în tranzacția curentă)"""
+    cursor.executemany(INSERT_FRAME_SQL, rows)
+    return len(rows)
 
 
 def get_design_data_from_group_settings(group_settings, frame_name, group_id, order_id, scenario):
@@ -273,7 +351,361 @@ def load_temp_json_data():
         return None
 
 
+def collect_beam_names_from_json(json_data):
+    """Returnează numele unice ale tuturor grinzilor din ambele scenarii ale JSON-ului"""
+    names = []
+    seen = set()
+    for scenario_key in ["scenario_a", "scenario_b"]:
+        for group in json_data.get(scenario_key, {}).get("beam_groups", []):
+            if not isinstance(group, dict):
+                continue
+            for frame_name in group.get("beams", []):
+                if frame_name not in seen:
+                    seen.add(frame_name)
+                    names.append(frame_name)
+    return names
+
+
+def create_frame_forces_table(cursor):
+    """Creează tabela FrameForces: eforturile pe stații (BLOB float64) per grindă și combinație"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS FrameForces (
+        UniqueName TEXT NOT NULL,
+        Combo TEXT NOT NULL,
+        Stations BLOB,
+        P BLOB,
+        V2 BLOB,
+        T BLOB,
+        M3 BLOB,
+        PRIMARY KEY (UniqueName, Combo)
+    )
+    """)
+
+
+def create_frame_envelopes_table(cursor):
+    """Creează tabela FrameEnvelopes: max / min pe stații (BLOB float64) și combinațiile guvernante (JSON)
+    per rând din Frames, set de combinații (Upper / Lower) și componentă"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS FrameEnvelopes (
+        Scenario TEXT NOT NULL,
+        GroupID INTEGER NOT NULL,
+        OrderID INTEGER NOT NULL,
+        UniqueName TEXT NOT NULL,
+        CombSet TEXT NOT NULL,
+        Component TEXT NOT NULL,
+        Stations BLOB,
+        MaxValues BLOB,
+        MaxCombos TEXT,
+        MinValues BLOB,
+        MinCombos TEXT,
+        PRIMARY KEY (Scenario, GroupID, OrderID, CombSet, Component)
+    )
+    """)
+
+
+def store_frame_envelopes(db_path="frames.db"):
+    """Calculează înfășurătorile din FrameForces și le salvează în FrameEnvelopes (le înlocuiește pe cele vechi)"""
+    try:
+        from etabs_api.envelopes import compute_group_envelopes
+
+        rows, envelopes = compute_group_envelopes(db_path)
+        records = []
+        for comb_set, components in envelopes.items():
+            for component, envelope in components.items():
+                for i, (scenario, group_id, order_id, unique_name) in enumerate(rows):
+                    entry = envelope.row(i)
+                    # Rândurile fără eforturi (ex: combinații neextrase) nu au înfășurătoare
+                    if not len(entry["Station"]):
+                        continue
+                    records.append((scenario, group_id, order_id, unique_name, comb_set.capitalize(), component,
+                                    entry["Station"].tobytes(), entry["Max"].tobytes(), json.dumps(entry["MaxCombo"]),
+                                    entry["Min"].tobytes(), json.dumps(entry["MinCombo"])))
+
+        with session(db_path) as conn:
+            cursor = conn.cursor()
+            create_frame_envelopes_table(cursor)
+            cursor.execute("DELETE FROM FrameEnvelopes")
+            cursor.executemany(
+                "INSERT INTO FrameEnvelopes (Scenario, GroupID, OrderID, UniqueName, CombSet, Component, Stations, "
+                "MaxValues, MaxCombos, MinValues, MinCombos) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", records)
+        print(f"-- Salvate {len(records)} înfășurători în FrameEnvelopes")
+        return len(records)
+    except Exception as e:
+        print(f"⮽⮽ Înfășurătorile nu au putut fi calculate: {e}")
+        return 0
+
+
+def load_frame_envelopes(db_path="frames.db", frame_name=None):
+    """Citește FrameEnvelopes: {(grindă, scenariu, set, componentă): {"Station", "Max", "MaxCombo", "Min", "MinCombo"}}"""
+    import numpy as np
+
+    try:
+        with session(db_path, readonly=True) as conn:
+            query = ("SELECT UniqueName, Scenario, CombSet, Component, Stations, MaxValues, MaxCombos, MinValues, MinCombos "
+                     "FROM FrameEnvelopes")
+            params = ()
+            if frame_name is not None:
+                query += " WHERE UniqueName = ?"
+                params = (frame_name,)
+            envelopes = {}
+            for unique_name, scenario, comb_set, component, stations, max_values, max_combos, min_values, \
+                    min_combos in conn.execute(query, params):
+                envelopes[(unique_name, scenario, comb_set, component)] = {
+                    "Station": np.frombuffer(stations, dtype=np.float64),
+                    "Max": np.frombuffer(max_values, dtype=np.float64),
+                    "MaxCombo": json.loads(max_combos),
+                    "Min": np.frombuffer(min_values, dtype=np.float64),
+                    "MinCombo": json.loads(min_combos),
+                }
+            return envelopes
+    except sqlite3.Error as e:
+        print(f"⮽⮽ Eroare la citirea înfășurătorilor din {db_path}: {e}")
+        return {}
+
+
+def create_beam_design_table(cursor):
+    """Creează tabela BeamDesign: armătura necesară din ETABS pe stații, legată de Frames prin UniqueName"""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS BeamDesign (
+        UniqueName TEXT NOT NULL,
+        StationIndex INTEGER NOT NULL,
+        Location REAL,
+        TopArea REAL,
+        TopCombo TEXT,
+        BotArea REAL,
+        BotCombo TEXT,
+        VmajorArea REAL,
+        VmajorCombo TEXT,
+        TLArea REAL,
+        TTrnArea REAL,
+        ErrorSummary TEXT,
+        WarningSummary TEXT,
+        PRIMARY KEY (UniqueName, StationIndex)
+    )
+    """)
+
+
+def store_beam_design(cursor, frame_names, group_name=None):
+    """Extrage din ETABS armătura necesară pentru grinzile date și o salvează în BeamDesign"""
+    create_beam_design_table(cursor)
+    try:
+        from etabs_api.design import extract_beam_design
+
+        results = extract_beam_design(frame_names, group_name)
+
+        rows = []
+        for frame_name, entry in results.items():
+            for i, location in enumerate(entry["Location"]):
+                rows.append((frame_name, i, float(location),
+                             float(entry["TopArea"][i]), entry["TopCombo"][i],
+                             float(entry["BotArea"][i]), entry["BotCombo"][i],
+                             float(entry["VmajorArea"][i]), entry["VmajorCombo"][i],
+                             float(entry["TLArea"][i]), float(entry["TTrnArea"][i]),
+                             entry["ErrorSummary"][i], entry["WarningSummary"][i]))
+        cursor.executemany(
+            "INSERT OR REPLACE INTO BeamDesign (UniqueName, StationIndex, Location, TopArea, TopCombo, BotArea, "
+            "BotCombo, VmajorArea, VmajorCombo, TLArea, TTrnArea, ErrorSummary, WarningSummary) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        print(f"-- Salvate rezultatele de proiectare pentru {len(results)} grinzi ({len(rows)} stații)")
+        return len(results)
+    except Exception as e:
+        print(f"⮽⮽ Rezultatele de proiectare nu au putut fi extrase: {e}")
+        return None
+
+
+def load_beam_design(db_path="frames.db", frame_name=None):
+    """Citește BeamDesign: {grindă: {"Location", "TopArea", "BotArea", "VmajorArea": array, ...Combo: listă}}"""
+    import numpy as np
+
+    try:
+        with session(db_path, readonly=True) as conn:
+            query = ("SELECT UniqueName, Location, TopArea, TopCombo, BotArea, BotCombo, VmajorArea, VmajorCombo "
+                     "FROM BeamDesign")
+            params = ()
+            if frame_name is not None:
+                query += " WHERE UniqueName = ?"
+                params = (frame_name,)
+            rows = conn.execute(query + " ORDER BY UniqueName, StationIndex", params).fetchall()
+    except sqlite3.OperationalError:
+        return {}
+
+    design = {}
+    for unique_name, *values in rows:
+        entry = design.setdefault(unique_name, {field: [] for field in (
+            "Location", "TopArea", "TopCombo", "BotArea", "BotCombo", "VmajorArea", "VmajorCombo")})
+        for field, value in zip(("Location", "TopArea", "TopCombo", "BotArea", "BotCombo", "VmajorArea",
+                                 "VmajorCombo"), values):
+            entry[field].append(value)
+    for entry in design.values():
+        for field in ("Location", "TopArea", "BotArea", "VmajorArea"):
+            entry[field] = np.asarray(entry[field], dtype=float)
+    return design
+
+
+def frame_force_requests(cursor):
+    """Combinațiile CombUpper / CombLower ale fiecărei grinzi din Frames: {grindă: set(combinații)}"""
+    # Combinațiile se citesc o dată pe grup, nu pe fiecare grindă
+    group_combos = load_group_combos(cursor)
+    beam_combos = {}
+    cursor.execute("SELECT UniqueName, Scenario, GroupID FROM Frames")
+    for unique_name, scenario, group_id in cursor.fetchall():
+        combos = beam_combos.setdefault(unique_name, set())
+        for names in group_combos.get((scenario, group_id), {}).values():
+            combos.update(names)
+    return beam_combos
+
+
+def discard_stored_frame_forces(cursor, beam_combos):
+    """Scoate din beam_combos perechile care au deja eforturi în FrameForces"""
+    from etabs_api.results import base_combo_name
+
+    for unique_name, combo in cursor.execute("SELECT UniqueName, Combo FROM FrameForces").fetchall():
+        if unique_name in beam_combos:
+            beam_combos[unique_name].discard(base_combo_name(combo))
+
+
+def store_frame_forces(cursor, beam_combos, group_name=None):
+    """Extrage din ETABS eforturile pentru {grindă: combinații} și le salvează în FrameForces.
+
+    group_name este grupul temporar construit de store_analysis_results (None = extract_frame_forces
+    își creează grupul).
+    """
+    create_frame_forces_table(cursor)
+    try:
+        from etabs_api.results import extract_frame_forces
+
+        results = extract_frame_forces(beam_combos, group_name)
+        cursor.executemany(
+            "INSERT OR REPLACE INTO FrameForces (UniqueName, Combo, Stations, P, V2, T, M3) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((frame_name, combo, forces["Station"].tobytes(), forces["P"].tobytes(), forces["V2"].tobytes(),
+              forces["T"].tobytes(), forces["M3"].tobytes())
+             for (frame_name, combo), forces in results.items()))
+        print(f"-- Salvate eforturile pentru {len(results)} perechi grindă - combinație")
+        return len(results)
+    except Exception as e:
+        print(f"⮽⮽ Eforturile nu au putut fi extrase (modelul este analizat?): {e}")
+        return 0
+
+
+def copy_previous_frame_forces(cursor, previous_db_path, beam_combos):
+    """Copiază eforturile din baza anterioară și scoate din beam_combos combinațiile acoperite"""
+    from etabs_api.results import base_combo_name
+
+    if not os.path.exists(previous_db_path):
+        return 0
+    try:
+        with session(previous_db_path, readonly=True) as previous:
+            rows = previous.execute("SELECT UniqueName, Combo, Stations, P, V2, T, M3 FROM FrameForces").fetchall()
+    except sqlite3.Error as e:
+        print(f"⮽⮽ Eforturile anterioare nu au putut fi citite: {e}")
+        return 0
+
+    copied_rows = [row for row in rows if base_combo_name(row[1]) in beam_combos.get(row[0], ())]
+    cursor.executemany(
+        "INSERT OR REPLACE INTO FrameForces (UniqueName, Combo, Stations, P, V2, T, M3) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        copied_rows)
+    for unique_name, combo, *_ in copied_rows:
+        beam_combos[unique_name].discard(base_combo_name(combo))
+    return len(copied_rows)
+
+
+def copy_previous_beam_design(cursor, previous_db_path, frame_names, covered_names):
+    """Copiază BeamDesign din baza anterioară pentru grinzile acoperite de extragerea ei.
+
+    covered_names - grinzile pentru care a rulat extragerea anterioară (și cele fără rezultate de
+    proiectare, ex: grinzile metalice). Returnează (grinzile rămase de extras, numărul celor copiate).
+    """
+    reused = [name for name in frame_names if name in covered_names]
+    if not reused:
+        return list(frame_names), 0
+    try:
+        with session(previous_db_path, readonly=True) as previous:
+            rows = previous.execute("SELECT * FROM BeamDesign").fetchall()
+    except sqlite3.Error as e:
+        print(f"⮽⮽ Rezultatele de proiectare anterioare nu au putut fi citite: {e}")
+        return list(frame_names), 0
+
+    reused_set = set(reused)
+    cursor.executemany(
+        "INSERT OR REPLACE INTO BeamDesign (UniqueName, StationIndex, Location, TopArea, TopCombo, BotArea, "
+        "BotCombo, VmajorArea, VmajorCombo, TLArea, TTrnArea, ErrorSummary, WarningSummary) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (row for row in rows if row[0] in reused_set))
+    return [name for name in frame_names if name not in reused_set], len(reused)
+
+
+def load_frame_forces(db_path="frames.db", frame_name=None):
+    """Citește FrameForces: {(grindă, combinație): {"Station", "P", "V2", "T", "M3": array}}"""
+    import numpy as np
+
+    try:
+        with session(db_path, readonly=True) as conn:
+            query = "SELECT UniqueName, Combo, Stations, P, V2, T, M3 FROM FrameForces"
+            params = ()
+            if frame_name is not None:
+                query += " WHERE UniqueName = ?"
+                params = (frame_name,)
+            forces = {}
+            for unique_name, combo, *blobs in conn.execute(query, params):
+                arrays = [np.frombuffer(blob, dtype=np.float64) for blob in blobs]
+                forces[(unique_name, combo)] = dict(zip(("Station", "P", "V2", "T", "M3"), arrays))
+            return forces
+    except sqlite3.Error as e:
+        print(f"⮽⮽ Eroare la citirea eforturilor din {db_path}: {e}")
+        return {}
+
+
 # Funcții helper pentru a evita erorile de import
+@contextlib.contextmanager
+def beam_results_group(beam_names):
+    """Funcție helper pentru grupul ETABS temporar al grinzilor (None dacă ETABS nu e disponibil)"""
+    try:
+        from etabs_api.results import temporary_frame_group
+        group = temporary_frame_group(beam_names)
+    except Exception as e:
+        print(f"⮽⮽ Grupul temporar al grinzilor nu a putut fi creat: {e}")
+        yield None
+        return
+    with group as group_name:
+        yield group_name
+
+
+def get_model_fingerprint():
+    """Funcție helper pentru amprenta modelului (None dacă ETABS nu e disponibil)"""
+    try:
+        from db.fingerprint import compute_model_fingerprint
+        return compute_model_fingerprint()
+    except Exception as e:
+        print(f"⮽⮽ Amprenta modelului nu a putut fi calculată, se re-extrag toate grinzile: {e}")
+        return None
+
+
+def load_matching_run(db_path, fingerprint):
+    """Amprenta salvată în db_path dacă este a aceluiași model (altfel None): {"model_hash", "frame_hashes"}"""
+    if fingerprint is None or not os.path.exists(db_path):
+        return None
+    from db.fingerprint import load_previous_run
+
+    previous = load_previous_run(db_path)
+    if previous is None or previous["model_hash"] != fingerprint.model_hash:
+        return None
+    return previous
+
+
+def get_frame_attributes(names, columns=("Label", "GUID")):
+    """Funcție helper pentru a extrage bulk atributele grinzilor (None dacă ETABS nu e disponibil).
+
+    Sunt citite doar tabelele și câmpurile pentru coloanele cerute (implicit Label și GUID).
+    """
+    try:
+        from etabs_api.tables import get_frame_assignments
+        return get_frame_assignments(names, columns=columns)
+    except Exception as e:
+        print(f"⮽⮽ Extragerea bulk a atributelor a eșuat, se continuă per grindă: {e}")
+        return None
+
+
 def get_label_and_story(name):
     """Funcție helper pentru a obține label și story"""
     try:
@@ -300,3 +732,74 @@ def get_section_name(name):
     except Exception as e:
         return "Section1"
 
+
+
+def _benchmark_inserts(n_beams=100_000, group_size=50):
+    """Compară inserarea rând cu rând (setări implicite) cu executemany + BULK_PRAGMAS pe n_beams grinzi"""
+    import tempfile
+    import time
+
+    settings = {
+        "rezistente_type": "Normale", "etaj": "Story1",
+        "selected_combinations_upper": ["ULS1"], "selected_combinations_lower": ["SEISM EX+", "SEISM EX-"],
+        "button_states": {"DCL": False, "DCM": True, "DCH": False, "Secundare": False, "Dir X": True, "Dir Y": False},
+    }
+    names = [str(i) for i in range(1, n_beams + 1)]
+    beam_groups = [{"beams": names[start:start + group_size], "settings": settings, "group_number": number}
+                   for number, start in enumerate(range(0, n_beams, group_size), 1)]
+    attributes = {name: (f"B{name}", f"guid-{name}") for name in names}
+
+    legacy_columns = ("UniqueName", "Label", "GUID", "GroupID", "OrderID", "Scenario", "Rezistente", "DCL", "DCM",
+                      "DCH", "Secundare", "DirX", "DirY", "CombUpper", "CombLower", "Etaj", "SelectionTime",
+                      "ExcelColumn", "ExcelRow", "SheetName")
+    legacy_insert = (f"INSERT INTO Frames ({', '.join(legacy_columns)}) "
+                     f"VALUES ({', '.join('?' * len(legacy_columns))})")
+
+    with tempfile.TemporaryDirectory() as folder, contextlib.redirect_stdout(io.StringIO()):
+        # Varianta veche: un execute per grindă, setările repetate pe fiecare rând și recalculate per grindă
+        row_path = os.path.join(folder, "row.db")
+        conn = sqlite3.connect(row_path)
+        conn.execute(f"CREATE TABLE Frames (id INTEGER PRIMARY KEY AUTOINCREMENT, {', '.join(legacy_columns)})")
+        start = time.perf_counter()
+        for group in beam_groups:
+            for order, name in enumerate(group["beams"], 1):
+                data = get_design_data_from_group_settings(group["settings"], name, group["group_number"], order, "A")
+                conn.execute(legacy_insert, (name, *attributes[name], group["group_number"], order, "A",
+                                             data["rezistente"], data["dcl"], data["dcm"], data["dch"],
+                                             data["secundare"], data["dir_x"], data["dir_y"], data["comb_upper"],
+                                             data["comb_lower"], data["etaj"], data["selection_time"],
+                                             None, None, None))
+        conn.commit()
+        row_time = time.perf_counter() - start
+        conn.close()
+
+        # Varianta nouă: setările o dată pe grup (Groups / GroupCombos), grinzile cu un singur executemany
+        bulk_path = os.path.join(folder, "bulk.db")
+        with bulk_session(bulk_path) as conn:
+            cursor = conn.cursor()
+            create_schema(cursor)
+            start = time.perf_counter()
+            rows, groups, combos = build_frame_rows(beam_groups, "A", attributes, datetime.now().isoformat())
+            build_time = time.perf_counter() - start
+            cursor.executemany(INSERT_GROUP_SQL, groups)
+            cursor.executemany(INSERT_GROUP_COMBO_SQL, combos)
+            insert_frame_rows(cursor, rows)
+            conn.commit()
+            bulk_time = time.perf_counter() - start
+        row_size, bulk_size = os.path.getsize(row_path), os.path.getsize(bulk_path)
+
+    print(f"-- {n_beams} grinzi în {len(beam_groups)} grupuri")
+    print(f"   rând cu rând:          {row_time:.2f} s ({n_beams / row_time:,.0f} inserări/s)")
+    print(f"   executemany + PRAGMA:  {bulk_time:.2f} s ({n_beams / bulk_time:,.0f} inserări/s, "
+          f"din care construirea rândurilor {build_time:.2f} s)")
+    print(f"   dimensiune fișier:     {row_size / 1e6:.1f} MB -> {bulk_size / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark inserare în tabela Frames")
+    parser.add_argument("--beams", type=int, default=100_000)
+    args = parser.parse_args()
+
+    _benchmark_inserts(args.beams)
@@ -0,0 +1,363 @@
+"""Schema bazei de date frames.db: tabelele, indexurile, versiunea și migrările.
+
+Setările de proiectare sunt păstrate o singură dată pe grup (Groups) și combinațiile o dată
+pe grup și poziție (GroupCombos); Frames păstrează grinda, grupul din care face parte și valorile
+dorite în ETABS (secțiune, modificatori, rebar ratio; NULL = se păstrează valoarea din model),
+citite de etabs_api.injector.
+Bazele de date create de versiuni mai vechi sunt aduse la versiunea curentă pe loc, prin
+migrările din MIGRATIONS aplicate în ordine; versiunea aplicată este notată în schema_version.
+
+Interogările frecvente (actualizarea pozițiilor Excel după UniqueName, citirea grupurilor
+ordonate după Scenario / GroupID / OrderID) trebuie să folosească un index, nu o scanare
+completă a tabelei; check_query_plans verifică asta cu EXPLAIN QUERY PLAN.
+"""
+import sqlite3
+from datetime import datetime
+
+# Versiunea schemei creată de create_schema (ultima migrare din MIGRATIONS)
+SCHEMA_VERSION = 5
+
+SCHEMA_VERSION_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    applied_at TEXT
+)
+"""
+
+GROUPS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS Groups (
+    Scenario TEXT NOT NULL,
+    GroupID INTEGER NOT NULL,
+    Rezistente TEXT,
+    DCL TEXT,
+    DCM TEXT,
+    DCH TEXT,
+    Secundare TEXT,
+    DirX TEXT,
+    DirY TEXT,
+    Etaj TEXT,
+    PRIMARY KEY (Scenario, GroupID)
+)
+"""
+
+# Position: "Upper" (CombUpper) sau "Lower" (CombLower); ComboOrder păstrează ordinea din selecție
+GROUP_COMBOS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS GroupCombos (
+    Scenario TEXT NOT NULL,
+    GroupID INTEGER NOT NULL,
+    Position TEXT NOT NULL CHECK (Position IN ('Upper', 'Lower')),
+    ComboOrder INTEGER NOT NULL,
+    Combo TEXT NOT NULL,
+    PRIMARY KEY (Scenario, GroupID, Position, ComboOrder),
+    FOREIGN KEY (Scenario, GroupID) REFERENCES Groups (Scenario, GroupID)
+)
+"""
+
+FRAMES_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS Frames (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    UniqueName TEXT NOT NULL,
+    Label TEXT,
+    GUID TEXT,
+    GroupID INTEGER,
+    OrderID INTEGER,
+    Scenario TEXT,
+    SelectionTime TEXT,
+    ExcelColumn TEXT,
+    ExcelRow INTEGER,
+    SheetName TEXT,
+    Section TEXT,
+    ModArea REAL,
+    ModAs2 REAL,
+    ModAs3 REAL,
+    ModTorsion REAL,
+    ModI22 REAL,
+    ModI33 REAL,
+    ModMass REAL,
+    ModWeight REAL,
+    RebarRatio REAL,
+    FOREIGN KEY (Scenario, GroupID) REFERENCES Groups (Scenario, GroupID)
+)
+"""
+
+# Coloanele Frames cu valorile de injectat în ETABS (adăugate de migrarea 5)
+FRAME_TARGET_COLUMNS = (("Section", "TEXT"), ("ModArea", "REAL"), ("ModAs2", "REAL"), ("ModAs3", "REAL"),
+                        ("ModTorsion", "REAL"), ("ModI22", "REAL"), ("ModI33", "REAL"), ("ModMass", "REAL"),
+                        ("ModWeight", "REAL"), ("RebarRatio", "REAL"))
+
+# Tabela Frames a versiunilor 1-3 (setările și combinațiile repetate pe fiecare rând)
+LEGACY_FRAMES_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS Frames (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    UniqueName TEXT NOT NULL,
+    Label TEXT,
+    GUID TEXT,
+    GroupID INTEGER,
+    OrderID INTEGER,
+    Scenario TEXT,
+    Rezistente TEXT,
+    DCL TEXT,
+    DCM TEXT,
+    DCH TEXT,
+    Secundare TEXT,
+    DirX TEXT,
+    DirY TEXT,
+    CombUpper TEXT,
+    CombLower TEXT,
+    Etaj TEXT,
+    SelectionTime TEXT
+)
+"""
+
+GROUP_COLUMNS = ("Scenario", "GroupID", "Rezistente", "DCL", "DCM", "DCH", "Secundare", "DirX", "DirY", "Etaj")
+
+INSERT_GROUP_SQL = (f"INSERT OR REPLACE INTO Groups ({', '.join(GROUP_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(GROUP_COLUMNS))})")
+
+INSERT_GROUP_COMBO_SQL = ("INSERT OR REPLACE INTO GroupCombos (Scenario, GroupID, Position, ComboOrder, Combo) "
+                          "VALUES (?, ?, ?, ?, ?)")
+
+# Indexurile tabelei Frames: nume -> coloane
+FRAME_INDEXES = {
+    "idx_frames_unique_name": ("UniqueName",),
+    "idx_frames_guid": ("GUID",),
+    "idx_frames_group_order": ("Scenario", "GroupID", "OrderID"),
+    "idx_frames_sheet": ("SheetName",),
+}
+
+# Interogările frecvente și indexul pe care trebuie să îl folosească
+HOT_QUERIES = {
+    "update_position": (
+        "UPDATE Frames SET ExcelColumn = ?, ExcelRow = ?, SheetName = ? WHERE UniqueName = ?",
+        (None, None, None, ""), "idx_frames_unique_name"),
+    "frame_by_guid": (
+        "SELECT UniqueName FROM Frames WHERE GUID = ?",
+        ("",), "idx_frames_guid"),
+    "frame_group": (
+        "SELECT id, UniqueName, Label, GroupID, OrderID, Scenario FROM Frames ORDER BY Scenario, GroupID, OrderID",
+        (), "idx_frames_group_order"),
+    "frames_on_sheet": (
+        "SELECT UniqueName, ExcelColumn, ExcelRow FROM Frames WHERE SheetName = ?",
+        ("",), "idx_frames_sheet"),
+}
+
+
+def create_schema(cursor):
+    """Creează tabelele versiunii curente într-o bază de date nouă și notează versiunea.
+
+    Indexurile nu sunt create aici; create_frame_indexes se apelează după inserarea în bloc.
+    """
+    cursor.execute(SCHEMA_VERSION_TABLE_SQL)
+    cursor.execute(GROUPS_TABLE_SQL)
+    cursor.execute(GROUP_COMBOS_TABLE_SQL)
+    cursor.execute(FRAMES_TABLE_SQL)
+    _record_version(cursor, SCHEMA_VERSION)
+
+
+def create_frame_indexes(cursor):
+    """Creează indexurile tabelei Frames (idempotent)"""
+    for name, columns in FRAME_INDEXES.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON Frames ({', '.join(columns)})")
+
+
+def group_rows(scenario, group_id, design_data, comb_upper, comb_lower):
+    """Rândul din Groups și rândurile din GroupCombos pentru un grup"""
+    group = (scenario, group_id, design_data["rezistente"], design_data["dcl"], design_data["dcm"],
+             design_data["dch"], design_data["secundare"], design_data["dir_x"], design_data["dir_y"],
+             design_data["etaj"])
+    combos = [(scenario, group_id, position, order, combo)
+              for position, names in (("Upper", comb_upper), ("Lower", comb_lower))
+              for order, combo in enumerate(names, 1)]
+    return group, combos
+
+
+def load_group_combos(conn):
+    """Combinațiile fiecărui grup: {(scenariu, grup): {"Upper": [..], "Lower": [..]}}"""
+    combos = {}
+    for scenario, group_id, position, combo in conn.execute(
+            "SELECT Scenario, GroupID, Position, Combo FROM GroupCombos "
+            "ORDER BY Scenario, GroupID, Position, ComboOrder"):
+        combos.setdefault((scenario, group_id), {"Upper": [], "Lower": []})[position].append(combo)
+    return combos
+
+
+def load_groups(conn):
+    """Setările fiecărui grup, citite o singură dată: {(scenariu, grup): setări}.
+
+    Setările au aceleași chei ca înainte de normalizare (comb_upper / comb_lower ca text "C1, C2"),
+    plus listele combo_upper / combo_lower.
+    """
+    combos = load_group_combos(conn)
+    groups = {}
+    for row in conn.execute(f"SELECT {', '.join(GROUP_COLUMNS)} FROM Groups"):
+        scenario, group_id, rezistente, dcl, dcm, dch, secundare, dir_x, dir_y, etaj = row
+        group_combos = combos.get((scenario, group_id), {"Upper": [], "Lower": []})
+        groups[(scenario, group_id)] = {
+            "rezistente": rezistente, "dcl": dcl, "dcm": dcm, "dch": dch, "secundare": secundare,
+            "dir_x": dir_x, "dir_y": dir_y, "etaj": etaj,
+            "comb_upper": ", ".join(group_combos["Upper"]) or "N/A",
+            "comb_lower": ", ".join(group_combos["Lower"]) or "N/A",
+            "combo_upper": group_combos["Upper"],
+            "combo_lower": group_combos["Lower"],
+        }
+    return groups
+
+
+def _table_columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _record_version(cursor, version):
+    cursor.execute("INSERT OR REPLACE INTO schema_version (version, applied_at) VALUES (?, ?)",
+                   (version, datetime.now().isoformat()))
+
+
+def get_schema_version(conn):
+    """Versiunea schemei unei baze de date existente (0 dacă este goală).
+
+    Bazele de date create înainte de schema_version sunt recunoscute după coloanele din Frames.
+    """
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if "schema_version" in tables:
+        return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+    if "Frames" not in tables:
+        return 0
+    return 2 if "ExcelColumn" in _table_columns(conn, "Frames") else 1
+
+
+def _migrate_1_frames(conn):
+    """Tabela Frames inițială"""
+    conn.execute(LEGACY_FRAMES_TABLE_SQL)
+
+
+def _migrate_2_excel_columns(conn):
+    """Coloanele pentru poziția grinzii în Excel"""
+    columns = _table_columns(conn, "Frames")
+    for column, column_type in (("ExcelColumn", "TEXT"), ("ExcelRow", "INTEGER"), ("SheetName", "TEXT")):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE Frames ADD COLUMN {column} {column_type}")
+
+
+def _migrate_3_frame_indexes(conn):
+    """Indexurile tabelei Frames"""
+    create_frame_indexes(conn)
+
+
+def _migrate_4_normalize_groups(conn):
+    """Setările și combinațiile mutate din Frames în Groups / GroupCombos"""
+    from etabs_api.results import split_combos
+
+    conn.execute(GROUPS_TABLE_SQL)
+    conn.execute(GROUP_COMBOS_TABLE_SQL)
+
+    # Setările unui grup sunt identice pe toate rândurile lui: se păstrează primul rând
+    legacy_groups = conn.execute(
+        "SELECT Scenario, GroupID, Rezistente, DCL, DCM, DCH, Secundare, DirX, DirY, Etaj, CombUpper, CombLower "
+        "FROM Frames WHERE id IN (SELECT MIN(id) FROM Frames GROUP BY Scenario, GroupID)").fetchall()
+    for row in legacy_groups:
+        conn.execute(INSERT_GROUP_SQL, row[:10])
+        conn.executemany(INSERT_GROUP_COMBO_SQL,
+                         [(row[0], row[1], position, order, combo)
+                          for position, text in (("Upper", row[10]), ("Lower", row[11]))
+                          for order, combo in enumerate(split_combos(text), 1)])
+
+    # SQLite nu poate elimina coloane pe versiunile vechi: tabela se reconstruiește
+    kept = "id, UniqueName, Label, GUID, GroupID, OrderID, Scenario, SelectionTime, ExcelColumn, ExcelRow, SheetName"
+    conn.execute(FRAMES_TABLE_SQL.replace("Frames (", "Frames_new (", 1))
+    conn.execute(f"INSERT INTO Frames_new ({kept}) SELECT {kept} FROM Frames")
+    conn.execute("DROP TABLE Frames")
+    conn.execute("ALTER TABLE Frames_new RENAME TO Frames")
+    create_frame_indexes(conn)
+    print(f"-- {len(legacy_groups)} grupuri mutate din Frames în Groups / GroupCombos")
+
+
+def _migrate_5_frame_targets(conn):
+    """Coloanele Frames cu valorile de injectat în ETABS"""
+    columns = _table_columns(conn, "Frames")
+    for column, column_type in FRAME_TARGET_COLUMNS:
+        if column not in columns:
+            conn.execute(f"ALTER TABLE Frames ADD COLUMN {column} {column_type}")
+
+
+# Migrările în ordine: (versiunea la care aduc baza de date, funcția)
+MIGRATIONS = (
+    (1, _migrate_1_frames),
+    (2, _migrate_2_excel_columns),
+    (3, _migrate_3_frame_indexes),
+    (4, _migrate_4_normalize_groups),
+    (5, _migrate_5_frame_targets),
+)
+
+
+def migrate(conn):
+    """Aduce baza de date la SCHEMA_VERSION pe loc; fiecare migrare rulează în tranzacția ei.
+
+    Returnează versiunea finală.
+    """
+    version = get_schema_version(conn)
+    if version == 0:
+        # Bază de date goală: schema curentă direct, fără pașii intermediari
+        conn.execute("BEGIN")
+        create_schema(conn)
+        create_frame_indexes(conn)
+        conn.commit()
+        return SCHEMA_VERSION
+
+    for target, migration in MIGRATIONS:
+        if target <= version:
+            continue
+        print(f"-- Migrare bază de date: versiunea {version} -> {target} ({migration.__doc__})")
+        try:
+            conn.execute("BEGIN")
+            conn.execute(SCHEMA_VERSION_TABLE_SQL)
+            migration(conn)
+            _record_version(conn, target)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        version = target
+    return version
+
+
+def explain_query_plan(conn, query, params=()):
+    """Detaliile planului de interogare (coloana "detail" din EXPLAIN QUERY PLAN)"""
+    return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+
+
+def check_query_plans(conn):
+    """Verifică că fiecare interogare frecventă folosește indexul ei.
+
+    Returnează {interogare: (ok, detalii plan)}.
+    """
+    report = {}
+    for name, (query, params, index) in HOT_QUERIES.items():
+        plan = explain_query_plan(conn, query, params)
+        uses_index = any(index in detail for detail in plan)
+        full_sort = any("TEMP B-TREE" in detail for detail in plan)
+        report[name] = (uses_index and not full_sort, plan)
+    return report
+
+
+def _verify_query_plans(n_beams=10_000):
+    """Construiește o tabelă Frames în memorie și afișează planurile interogărilor frecvente"""
+    conn = sqlite3.connect(":memory:")
+    cursor = conn.cursor()
+    create_schema(cursor)
+    cursor.executemany(
+        "INSERT INTO Frames (UniqueName, GUID, GroupID, OrderID, Scenario, SheetName) VALUES (?, ?, ?, ?, ?, ?)",
+        ((str(i), f"guid-{i}", i // 50, i % 50, "AB"[i % 2], f"Sheet{i // 500}") for i in range(n_beams)))
+    create_frame_indexes(cursor)
+    conn.commit()
+
+    report = check_query_plans(conn)
+    conn.close()
+    for name, (ok, plan) in report.items():
+        print(f"{'✓✓' if ok else '⮽⮽'} {name}: {' | '.join(plan)}")
+    return all(ok for ok, _ in report.values())
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(0 if _verify_query_plans() else 1)
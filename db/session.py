@@ -0,0 +1,141 @@
+"""Conexiunile SQLite comune pentru straturile db, excel și gui.
+
+Fiecare fir de execuție are propria conexiune pe fișier (sqlite3 nu permite folosirea unei
+conexiuni din alt fir), păstrată deschisă între operații: schema este verificată și migrată
+o singură dată, la deschiderea conexiunii, iar instrucțiunile pregătite rămân în cache-ul
+conexiunii și sunt refolosite de apelurile următoare cu același SQL.
+
+Cititorii folosesc conexiuni readonly=True (URI "mode=ro"): fișierul nu este creat dacă lipsește
+și nu este migrat, deci doar căile care scriu aduc baza de date la schema curentă.
+"""
+import contextlib
+import os
+import pathlib
+import sqlite3
+import threading
+
+from db.schema import migrate
+
+DEFAULT_DB_PATH = "frames.db"
+
+# Numărul de instrucțiuni pregătite păstrate pe conexiune (implicit sqlite3: 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Setările aplicate fiecărei conexiuni
+SESSION_PRAGMAS = (
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16384",
+)
+
+# Setările conexiunii la crearea bazei de date: baza se reconstruiește oricum la eroare,
+# deci jurnalul stă în memorie și scrierea nu așteaptă sincronizarea pe disc
+BULK_PRAGMAS = (
+    "PRAGMA journal_mode = MEMORY",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA temp_store = MEMORY",
+)
+
+# (fir, cale absolută, doar citire) -> conexiune; accesibil din orice fir pentru close_connections
+_connections = {}
+_connections_lock = threading.Lock()
+# Adâncimea sesiunilor imbricate pe firul curent: doar sesiunea exterioară face commit
+_local = threading.local()
+
+
+def _open(path, pragmas, readonly=False):
+    # check_same_thread=False doar pentru ca close_connections să poată închide conexiunea din alt fir;
+    # conexiunea este folosită numai de firul care a deschis-o
+    if readonly:
+        # mode=ro nu creează fișierul; eroarea explicită în loc de "unable to open database file"
+        if not os.path.exists(path):
+            raise sqlite3.OperationalError(f"Baza de date {path} nu există")
+        conn = sqlite3.connect(f"{pathlib.Path(path).as_uri()}?mode=ro", uri=True,
+                               cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False)
+    else:
+        conn = sqlite3.connect(path, cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False)
+    for pragma in pragmas:
+        conn.execute(pragma)
+    return conn
+
+
+def get_connection(db_path=DEFAULT_DB_PATH, readonly=False):
+    """Conexiunea firului curent la baza de date.
+
+    Pentru scriere, fișierul este creat și migrat la prima cerere; cu readonly=True baza de date
+    trebuie să existe (altfel sqlite3.OperationalError) și este citită așa cum este, fără migrare.
+    """
+    key = (threading.get_ident(), os.path.abspath(db_path), readonly)
+    with _connections_lock:
+        conn = _connections.get(key)
+    if conn is not None:
+        return conn
+
+    conn = _open(key[1], SESSION_PRAGMAS, readonly)
+    if not readonly:
+        try:
+            migrate(conn)
+        except Exception:
+            conn.close()
+            raise
+    with _connections_lock:
+        _connections[key] = conn
+    return conn
+
+
+@contextlib.contextmanager
+def session(db_path=DEFAULT_DB_PATH, readonly=False):
+    """Sesiune pe conexiunea firului curent: commit la ieșire, rollback la eroare.
+
+    Sesiunile imbricate pe aceeași bază de date fac parte din tranzacția sesiunii exterioare.
+    readonly=True pentru cititori (vezi get_connection).
+    """
+    conn = get_connection(db_path, readonly)
+    depths = getattr(_local, "depths", None)
+    if depths is None:
+        depths = _local.depths = {}
+    key = (os.path.abspath(db_path), readonly)
+    depth = depths.get(key, 0)
+    depths[key] = depth + 1
+    try:
+        yield conn
+        if depth == 0:
+            conn.commit()
+    except BaseException:
+        if depth == 0:
+            conn.rollback()
+        raise
+    finally:
+        depths[key] = depth
+
+
+@contextlib.contextmanager
+def bulk_session(db_path=DEFAULT_DB_PATH):
+    """Conexiune dedicată pentru crearea bazei de date (BULK_PRAGMAS, fără migrare), închisă la ieșire"""
+    close_connections(db_path)
+    conn = _open(os.path.abspath(db_path), BULK_PRAGMAS)
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def close_connections(db_path=None):
+    """Închide conexiunile păstrate (ale tuturor firelor) la o bază de date, sau la toate.
+
+    Necesar înainte ca fișierul să fie înlocuit sau șters (pe Windows un fișier deschis nu poate fi șters).
+    """
+    path = os.path.abspath(db_path) if db_path is not None else None
+    with _connections_lock:
+        keys = [key for key in _connections if path is None or key[1] == path]
+        closing = [_connections.pop(key) for key in keys]
+    for conn in closing:
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"⮽⮽ Conexiunea la baza de date nu a putut fi închisă: {e}")
+    return len(closing)
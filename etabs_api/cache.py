@@ -0,0 +1,43 @@
+import threading
+import time
+
+
+class ModelCache:
+    """Cache pentru date extrase din modelul ETABS, reîncărcat doar când semnătura modelului se schimbă.
+
+    loader    - funcția care extrage datele din ETABS (apel costisitor)
+    signature - funcția care returnează o semnătură ieftină a modelului (ex: numărul de obiecte)
+    interval  - secunde în care semnătura nu mai este verificată după ultima verificare (0 = la fiecare acces)
+
+    Accesul este serializat cu un lock: firul Tk și firul ETABS nu reîncarcă aceleași date în paralel.
+    """
+
+    def __init__(self, loader, signature, interval=0.0):
+        self.loader = loader
+        self.signature = signature
+        self.interval = interval
+        self._value = None
+        self._signature = None
+        self._checked_at = None
+        self._lock = threading.RLock()
+
+    def get(self):
+        """Returnează datele din cache, reîncărcându-le dacă semnătura modelului s-a schimbat"""
+        with self._lock:
+            now = time.monotonic()
+            if self._checked_at is not None and now - self._checked_at < self.interval:
+                return self._value
+
+            current_signature = self.signature()
+            if self._checked_at is None or current_signature != self._signature:
+                self._value = self.loader()
+                self._signature = current_signature
+            self._checked_at = now
+            return self._value
+
+    def invalidate(self):
+        """Forțează reîncărcarea la următorul acces"""
+        with self._lock:
+            self._value = None
+            self._signature = None
+            self._checked_at = None
@@ -0,0 +1,219 @@
+"""Catalogul combinațiilor de încărcări, încărcat o singură dată pe model.
+
+Numele combinațiilor vin dintr-un singur apel RespCombo.GetNameList. Definițiile sunt citite
+abia la prima expandare, dintr-un singur tabel "Load Combination Definitions" (sau, dacă tabelul
+nu poate fi citit, din RespCombo.GetCaseList pe combinație); combinațiile imbricate sunt
+expandate recursiv în factori pe cazuri de încărcare, iar expandarea este memorată.
+"""
+import threading
+
+from etabs_api.connection import get_sap_model
+from etabs_api.cache import ModelCache
+
+# Intervalul (secunde) în care numărul de combinații din model nu mai este reverificat
+COMBO_CHECK_INTERVAL = 5.0
+
+# eCNameType din GetCaseList
+ITEM_LOAD_CASE = 0
+ITEM_LOAD_COMBO = 1
+
+# Tipul combinației (GetTypeOfCombo): doar Linear Add adună factorii
+COMBO_LINEAR_ADD = 0
+COMBO_TYPES = {0: "Linear Add", 1: "Envelope", 2: "Absolute Add", 3: "SRSS", 4: "Range Add"}
+
+# Tabelul cu definițiile tuturor combinațiilor (un rând pe element al combinației)
+COMBO_DEFINITIONS_TABLE = "Load Combination Definitions"
+
+
+class ComboCatalogue:
+    """Definițiile tuturor combinațiilor și expandarea lor în cazuri de încărcare.
+
+    loader - funcția care citește (definiții, tipuri) pentru lista de nume, apelată o singură dată,
+             la primul acces la definiții; numele sunt disponibile fără niciun apel în plus.
+    """
+
+    def __init__(self, names, definitions=None, combo_types=None, loader=None):
+        self.names = list(names)
+        self._names = set(self.names)
+        self._definitions = dict(definitions) if definitions is not None else None
+        self._combo_types = dict(combo_types or {})
+        self._loader = loader
+        self._load_lock = threading.Lock()
+        self._expanded = {}
+        self._case_index = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def _ensure_definitions(self):
+        with self._load_lock:
+            if self._definitions is None:
+                definitions, combo_types = self._loader(self.names) if self._loader else ({}, {})
+                self._definitions, self._combo_types = dict(definitions), dict(combo_types)
+
+    @property
+    def definitions(self):
+        """nume -> [(tip element, nume element, factor)]"""
+        self._ensure_definitions()
+        return self._definitions
+
+    @property
+    def combo_types(self):
+        """nume -> cod GetTypeOfCombo"""
+        self._ensure_definitions()
+        return self._combo_types
+
+    def combo_type(self, name):
+        return COMBO_TYPES.get(self.combo_types.get(name, COMBO_LINEAR_ADD), "Unknown")
+
+    def expand(self, name):
+        """Factorii pe cazuri de încărcare ai unei combinații, cu sub-combinațiile expandate recursiv.
+
+        Pentru Linear Add factorii se adună; pentru celelalte tipuri (Envelope, SRSS...) fiecare caz
+        păstrează factorul cu valoarea absolută maximă, adică rămâne doar informația de apartenență.
+        """
+        return dict(self._expand(name, ()))
+
+    def _expand(self, name, stack):
+        cached = self._expanded.get(name)
+        if cached is not None:
+            return cached
+        if name in stack:
+            print(f"⮽⮽ Combinație circulară: {' -> '.join(stack + (name,))}")
+            return {}
+
+        linear = self.combo_types.get(name, COMBO_LINEAR_ADD) == COMBO_LINEAR_ADD
+        factors = {}
+        for item_type, item_name, factor in self.definitions.get(name, ()):
+            if item_type == ITEM_LOAD_COMBO:
+                parts = self._expand(item_name, stack + (name,)).items()
+            else:
+                parts = [(item_name, 1.0)]
+            for case, case_factor in parts:
+                value = factor * case_factor
+                if linear:
+                    factors[case] = factors.get(case, 0.0) + value
+                elif abs(value) > abs(factors.get(case, 0.0)):
+                    factors[case] = value
+
+        self._expanded[name] = factors
+        return factors
+
+    def cases(self, name):
+        """Cazurile de încărcare dintr-o combinație (după expandare)"""
+        return frozenset(self._expand(name, ()))
+
+    def _build_case_index(self):
+        self._case_index = {}
+        for name in self.names:
+            for case in self._expand(name, ()):
+                self._case_index.setdefault(case, set()).add(name)
+
+    def combos_containing(self, case):
+        """Combinațiile care conțin cazul de încărcare dat (direct sau prin sub-combinații)"""
+        if self._case_index is None:
+            self._build_case_index()
+        found = self._case_index.get(case, ())
+        return [name for name in self.names if name in found]
+
+    def combos_containing_any(self, cases):
+        """Combinațiile care conțin cel puțin unul din cazurile date (ex: toate cazurile seismice)"""
+        if self._case_index is None:
+            self._build_case_index()
+        found = set().union(*(self._case_index.get(case, ()) for case in cases))
+        return [name for name in self.names if name in found]
+
+    def combos_of_type(self, combo_type):
+        """Combinațiile de un anumit tip, ex: "Envelope" """
+        return [name for name in self.names if self.combo_type(name) == combo_type]
+
+
+def _read_definitions_from_table(names):
+    """Definițiile și tipurile tuturor combinațiilor dintr-un singur apel DatabaseTables"""
+    from etabs_api.tables import read_table
+
+    fields, rows = read_table(COMBO_DEFINITIONS_TABLE)
+    name_position, type_position = fields.index("Name"), fields.index("Type")
+    item_position, factor_position = fields.index("Load Name"), fields.index("SF")
+    type_codes = {text: code for code, text in COMBO_TYPES.items()}
+    known = set(names)
+
+    definitions = {name: [] for name in names}
+    combo_types = {}
+    name = None
+    for row in rows:
+        # Numele și tipul pot apărea doar pe primul rând al combinației
+        name = row[name_position] or name
+        if row[type_position]:
+            combo_types[name] = type_codes.get(row[type_position], COMBO_LINEAR_ADD)
+        item_name = row[item_position]
+        item_type = ITEM_LOAD_COMBO if item_name in known else ITEM_LOAD_CASE
+        definitions.setdefault(name, []).append((item_type, item_name, float(row[factor_position])))
+    return definitions, combo_types
+
+
+def _read_definitions_per_combo(names):
+    """Definițiile cu GetCaseList / GetTypeOfCombo pe combinație (2 apeluri pe combinație)"""
+    sap_model = get_sap_model()
+    definitions, combo_types = {}, {}
+    for name in names:
+        try:
+            case_list = sap_model.RespCombo.GetCaseList(name)
+            if case_list[-1] != 0:
+                raise RuntimeError(f"eroare {case_list[-1]}")
+            definitions[name] = list(zip(case_list[1], case_list[2], case_list[3]))
+            combo_type = sap_model.RespCombo.GetTypeOfCombo(name)
+            if combo_type[-1] == 0:
+                combo_types[name] = combo_type[0]
+        except Exception as e:
+            print(f"⮽⮽ Definiția combinației {name} nu a putut fi citită: {e}")
+            definitions[name] = []
+    return definitions, combo_types
+
+
+def _read_combo_definitions(names):
+    """Definițiile combinațiilor: tabelul de definiții, apoi varianta pe combinație dacă tabelul lipsește"""
+    try:
+        definitions, combo_types = _read_definitions_from_table(names)
+        print(f"-- Definiții combinații citite din tabel: {len(definitions)} combinații")
+        return definitions, combo_types
+    except Exception as e:
+        print(f"⮽⮽ Tabelul {COMBO_DEFINITIONS_TABLE} nu a putut fi citit ({e}), citesc fiecare combinație")
+        return _read_definitions_per_combo(names)
+
+
+def _load_combo_catalogue():
+    """Citește numele combinațiilor cu un singur GetNameList; definițiile se citesc la prima expandare"""
+    result = get_sap_model().RespCombo.GetNameList()
+    if result[-1] != 0:
+        raise RuntimeError(f"RespCombo.GetNameList a returnat eroare: {result[-1]}")
+
+    catalogue = ComboCatalogue(result[1], loader=_read_combo_definitions)
+    print(f"-- Catalog combinații încărcat: {len(catalogue)} combinații")
+    return catalogue
+
+
+def _combo_count():
+    return get_sap_model().RespCombo.Count()
+
+
+# Catalogul se reîncarcă doar când numărul de combinații din model se schimbă
+_combo_catalogue = ModelCache(_load_combo_catalogue, _combo_count, COMBO_CHECK_INTERVAL)
+
+
+def get_combo_catalogue():
+    """Returnează catalogul combinațiilor (din cache), sau None dacă extragerea eșuează"""
+    try:
+        return _combo_catalogue.get()
+    except Exception as e:
+        print(f"⮽⮽ Eroare la încărcarea catalogului de combinații: {e}")
+        _combo_catalogue.invalidate()
+        return None
+
+
+def invalidate_combo_catalogue():
+    """Forțează reîncărcarea catalogului (ex: după editarea unei combinații)"""
+    _combo_catalogue.invalidate()
@@ -1,8 +1,13 @@
-import comtypes.client
+import threading
+import time
+from datetime import datetime
+
 
 def connect_to_etabs():
     """Conexiune simplă directă la ETABS"""
     try:
+        import comtypes.client
+
         # Creează obiect helper
         helper = comtypes.client.CreateObject('ETABSv1.Helper')
         helper = helper.QueryInterface(comtypes.gen.ETABSv1.cHelper)
@@ -23,17 +28,137 @@ def connect_to_etabs():
         print(f"⮽⮽ Conexiune ETABS eșuată: {e}")
         raise
 
+def start_etabs_instance(model_path=None, visible=False):
+    """Pornește o instanță ETABS nouă (proprie procesului curent) și deschide modelul dat.
+
+    Returnează (ETABSObject, SapModel); instanța se închide cu close_etabs_instance.
+    """
+    import comtypes.client
+
+    helper = comtypes.client.CreateObject('ETABSv1.Helper')
+    helper = helper.QueryInterface(comtypes.gen.ETABSv1.cHelper)
+    etabs_object = helper.CreateObjectProgID("CSI.ETABS.API.ETABSObject")
+    ret = etabs_object.ApplicationStart()
+    if ret != 0:
+        raise Exception(f"⮽⮽ ApplicationStart a returnat eroare: {ret}")
+    if not visible:
+        etabs_object.Hide()
+
+    sap_model = etabs_object.SapModel
+    if model_path:
+        ret = sap_model.File.OpenFile(model_path)
+        if ret != 0:
+            etabs_object.ApplicationExit(False)
+            raise Exception(f"⮽⮽ Modelul {model_path} nu a putut fi deschis: {ret}")
+    print(f"✓✓ Instanță ETABS nouă pornită{f' cu modelul {model_path}' if model_path else ''}")
+    return etabs_object, sap_model
+
+
+def close_etabs_instance(etabs_object, save=False):
+    """Închide o instanță ETABS pornită cu start_etabs_instance"""
+    try:
+        etabs_object.ApplicationExit(save)
+    except Exception as e:
+        print(f"⮽⮽ Instanța ETABS nu a putut fi închisă: {e}")
+
+
 # Variabilă globală pentru a stoca conexiunea
 _sap_model = None
 
+# Funcția care creează SapModel la prima utilizare (implicit conexiunea COM la ETABS)
+_backend_factory = connect_to_etabs
+_backend_name = "ETABS COM"
+
+# SapModel propriu pentru firele de lucru (obiectele COM nu se partajează între fire)
+_thread_state = threading.local()
+
+# Informații despre conexiunea curentă
+connection_info = {
+    "backend": None,
+    "connected_at": None,
+    "connect_seconds": None,
+}
+
+
 def get_sap_model():
     """Obține SapModel - se conectează dacă nu este deja conectat"""
     global _sap_model
+    thread_model = getattr(_thread_state, "sap_model", None)
+    if thread_model is not None:
+        return thread_model
     if _sap_model is None:
-        _sap_model = connect_to_etabs()
+        start = time.perf_counter()
+        _sap_model = create_sap_model()
+        connection_info["backend"] = _backend_name
+        connection_info["connected_at"] = datetime.now().isoformat()
+        connection_info["connect_seconds"] = time.perf_counter() - start
+        print(f"-- SapModel disponibil după {connection_info['connect_seconds']:.3f} s "
+              f"({connection_info['backend']})")
     return _sap_model
 
+
+def create_sap_model():
+    """Creează un SapModel nou din sursa curentă.
+
+    ETABS_REPLAY / ETABS_RECORD înlocuiesc sau înregistrează sursa (vezi etabs_api.recorder),
+    iar ETABS_INSTRUMENT adaugă contorizarea apelurilor.
+    """
+    from etabs_api.instrumentation import instrument_if_enabled
+    from etabs_api.recorder import session_backend
+    return instrument_if_enabled(session_backend(_backend_factory))
+
+
+def bind_thread_sap_model(model):
+    """Leagă un SapModel de firul curent; get_sap_model() îl va returna doar în acest fir"""
+    _thread_state.sap_model = model
+
+
+def set_backend(factory, name=None):
+    """Înlocuiește sursa SapModel (ex: model de test); conexiunea se face la următorul apel"""
+    global _backend_factory, _backend_name
+    _backend_factory = factory
+    _backend_name = name or getattr(factory, "__name__", repr(factory))
+    reset_connection()
+
+
+def set_sap_model(model):
+    """Folosește direct obiectul dat ca SapModel, fără conexiune la ETABS"""
+    set_backend(lambda: model, type(model).__name__)
+
+
+def reset_connection():
+    """Uită conexiunea curentă; următorul apel se va reconecta"""
+    global _sap_model
+    _sap_model = None
+    connection_info["backend"] = None
+    connection_info["connected_at"] = None
+    connection_info["connect_seconds"] = None
+
+
+def is_connected():
+    """Verifică dacă SapModel a fost deja creat"""
+    return _sap_model is not None
+
+
+class LazySapModel:
+    """Proxy pentru SapModel care se conectează la ETABS doar la primul apel real.
+
+    Poate fi folosit la nivel de modul fără să blocheze importul; fiecare acces
+    la un atribut este delegat către SapModel-ul curent din get_sap_model().
+    """
+
+    def __getattr__(self, name):
+        return getattr(get_sap_model(), name)
+
+    def __repr__(self):
+        state = "conectat" if is_connected() else "neconectat"
+        return f"<LazySapModel {state}>"
+
+
+# Proxy comun pentru modulele care folosesc SapModel la nivel de modul
+lazy_sap_model = LazySapModel()
+
+
 if __name__ == "__main__":
     sap_model = connect_to_etabs()
     sap_model.SetModelIsLocked(False)
-
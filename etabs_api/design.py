@@ -0,0 +1,105 @@
+"""Extragerea rezultatelor proiectării la beton (armătura necesară) pentru grinzile selectate.
+
+Grinzile sunt puse într-un grup ETABS temporar (de obicei cel construit o dată pentru eforturi),
+iar DesignConcrete.GetSummaryResultsBeam este apelat o singură dată pentru întregul grup.
+"""
+import contextlib
+
+import numpy as np
+
+from etabs_api.connection import get_sap_model
+from etabs_api.results import temporary_frame_group
+
+# Grupul ETABS temporar, dacă nu se primește unul deja construit
+DESIGN_GROUP_NAME = "BEAM_DESIGN_CONCRETE"
+
+# eItemType pentru GetSummaryResultsBeam
+ITEM_TYPE_GROUP = 1
+
+# Ariile păstrate pentru fiecare stație: armătura sus, jos, etrieri (Vmajor), torsiune longitudinală / transversală
+AREA_FIELDS = ("TopArea", "BotArea", "VmajorArea", "TLArea", "TTrnArea")
+COMBO_FIELDS = ("TopCombo", "BotCombo", "VmajorCombo", "TLCombo", "TTrnCombo")
+
+
+class DesignSummaryResults:
+    """Rezultatele pe stații pentru fiecare grindă: array-uri Location / arii și liste de combinații"""
+
+    def __init__(self):
+        self.data = {}
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, frame_name):
+        return frame_name in self.data
+
+    def get(self, frame_name):
+        return self.data.get(frame_name)
+
+    def items(self):
+        return self.data.items()
+
+
+def _group_summary(result, wanted):
+    """Împarte rezultatul plat GetSummaryResultsBeam pe grinzi (rândurile unei grinzi sunt consecutive)"""
+    frames = np.asarray(result[1], dtype=object)
+    columns = {
+        "Location": np.asarray(result[2], dtype=float),
+        "TopCombo": result[3], "TopArea": np.asarray(result[4], dtype=float),
+        "BotCombo": result[5], "BotArea": np.asarray(result[6], dtype=float),
+        "VmajorCombo": result[7], "VmajorArea": np.asarray(result[8], dtype=float),
+        "TLCombo": result[9], "TLArea": np.asarray(result[10], dtype=float),
+        "TTrnCombo": result[11], "TTrnArea": np.asarray(result[12], dtype=float),
+        "ErrorSummary": result[13], "WarningSummary": result[14],
+    }
+
+    results = DesignSummaryResults()
+    if len(frames) == 0:
+        return results
+    boundaries = np.flatnonzero(frames[1:] != frames[:-1]) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(frames)]))
+    for start, end in zip(starts, ends):
+        frame_name = frames[start]
+        if frame_name not in wanted:
+            continue
+        entry = {}
+        for field, values in columns.items():
+            entry[field] = values[start:end] if isinstance(values, np.ndarray) else list(values[start:end])
+        results.data[frame_name] = entry
+    return results
+
+
+def extract_beam_design(frame_names, group_name=None):
+    """Extrage armătura necesară pe stații pentru grinzile date cu un singur apel GetSummaryResultsBeam.
+
+    group_name - un grup temporar existent care conține grinzile (vezi temporary_frame_group);
+                 dacă lipsește, grupul este creat și șters aici.
+    Returnează un DesignSummaryResults (gol dacă proiectarea la beton nu a fost rulată).
+    """
+    sap_model = get_sap_model()
+    wanted = set(frame_names)
+    if not wanted:
+        print("-- Nu sunt grinzi pentru extragerea rezultatelor de proiectare")
+        return DesignSummaryResults()
+
+    if not sap_model.DesignConcrete.GetResultsAvailable():
+        print("⮽⮽ Rezultatele proiectării la beton nu sunt disponibile (rulați Design > Concrete Frame Design)")
+        return DesignSummaryResults()
+
+    print(f"-- Extrag rezultatele proiectării la beton pentru {len(wanted)} grinzi")
+    with contextlib.ExitStack() as stack:
+        if group_name is None:
+            group_name = stack.enter_context(temporary_frame_group(sorted(wanted), DESIGN_GROUP_NAME))
+            if group_name is None:
+                return DesignSummaryResults()
+
+        # Parametrii de ieșire sunt dați ca valori goale; ItemType este ultimul parametru
+        empty = [[] for _ in range(14)]
+        result = sap_model.DesignConcrete.GetSummaryResultsBeam(group_name, 0, *empty, ITEM_TYPE_GROUP)
+        if result[-1] != 0:
+            raise RuntimeError(f"DesignConcrete.GetSummaryResultsBeam a returnat eroare: {result[-1]}")
+
+        results = _group_summary(result, wanted)
+        print(f"✓✓ Rezultate de proiectare extrase: {result[0]} stații, {len(results)} grinzi")
+        return results
@@ -0,0 +1,248 @@
+"""Înfășurătoarele eforturilor (max / min pe stații) calculate vectorizat cu NumPy.
+
+Eforturile sunt așezate într-un array (grinzi x combinații x stații), completat cu NaN
+pentru grinzile cu mai puține stații, și reduse pe axa combinațiilor într-o singură trecere.
+Pentru fiecare extrem se păstrează și combinația care îl guvernează.
+"""
+
+import numpy as np
+
+from etabs_api.results import base_combo_name
+
+ENVELOPE_COMPONENTS = ("M3", "V2", "T")
+
+# Numărul maxim de valori (grinzi x combinații x stații) procesate într-un singur bloc
+CHUNK_VALUES = 20_000_000
+
+
+def run_station_index(beam_index, combo_index):
+    """Poziția fiecărei valori în stațiile (grindă, combinație) ei; rândurile unei perechi sunt consecutive"""
+    count = len(beam_index)
+    if count == 0:
+        return np.zeros(0, dtype=np.int64)
+    new_run = np.ones(count, dtype=bool)
+    new_run[1:] = (beam_index[1:] != beam_index[:-1]) | (combo_index[1:] != combo_index[:-1])
+    run_starts = np.flatnonzero(new_run)
+    run_lengths = np.diff(np.append(run_starts, count))
+    return np.arange(count) - np.repeat(run_starts, run_lengths)
+
+
+def reduce_envelope(values, combo_mask=None):
+    """Reduce (grinzi x combinații x stații) la max / min pe stații și combinația care le guvernează.
+
+    combo_mask (grinzi x combinații) exclude combinațiile care nu aparțin setului grinzii.
+    Returnează (max, combinație max, min, combinație min), fiecare (grinzi x stații);
+    stațiile fără nicio valoare au NaN și combinația -1.
+    """
+    if combo_mask is not None:
+        values = np.where(combo_mask[:, :, None], values, np.nan)
+    valid = ~np.isnan(values)
+    has_value = valid.any(axis=1)
+
+    high = np.where(valid, values, -np.inf)
+    max_combo = high.argmax(axis=1)
+    max_values = np.take_along_axis(high, max_combo[:, None, :], axis=1)[:, 0, :]
+
+    low = np.where(valid, values, np.inf)
+    min_combo = low.argmin(axis=1)
+    min_values = np.take_along_axis(low, min_combo[:, None, :], axis=1)[:, 0, :]
+
+    max_values[~has_value] = np.nan
+    min_values[~has_value] = np.nan
+    max_combo[~has_value] = -1
+    min_combo[~has_value] = -1
+    return max_values, max_combo, min_values, min_combo
+
+
+class Envelope:
+    """Înfășurătoarea unei componente pentru un set de rânduri (grinzi): array-uri (rânduri x stații)"""
+
+    def __init__(self, rows, combos, stations, max_values, max_combo, min_values, min_combo):
+        self.rows = list(rows)
+        self.index = {row: i for i, row in enumerate(self.rows)}
+        self.combos = list(combos)
+        self.stations = stations
+        self.max = max_values
+        self.max_combo = max_combo
+        self.min = min_values
+        self.min_combo = min_combo
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _combo_names(self, codes):
+        return [self.combos[code] if code >= 0 else None for code in codes]
+
+    def row(self, row):
+        """Înfășurătoarea unui rând: stații, max, min și combinațiile guvernante (fără completarea NaN)"""
+        i = self.index[row]
+        used = ~np.isnan(self.stations[i])
+        return {
+            "Station": self.stations[i][used],
+            "Max": self.max[i][used],
+            "MaxCombo": self._combo_names(self.max_combo[i][used]),
+            "Min": self.min[i][used],
+            "MinCombo": self._combo_names(self.min_combo[i][used]),
+        }
+
+    def extremes(self):
+        """Extremele pe toată lungimea fiecărui rând: (max, stația max, min, stația min)"""
+        high = np.where(np.isnan(self.max), -np.inf, self.max)
+        low = np.where(np.isnan(self.min), np.inf, self.min)
+        max_station = high.argmax(axis=1)
+        min_station = low.argmin(axis=1)
+        rows = np.arange(len(self.rows))
+        return high[rows, max_station], max_station, low[rows, min_station], min_station
+
+
+def compute_envelopes(row_beams, row_combo_sets, forces, components=ENVELOPE_COMPONENTS,
+                      chunk_values=CHUNK_VALUES):
+    """Calculează înfășurătorile pentru fiecare rând (grindă + setul ei de combinații).
+
+    row_beams      - grinda fiecărui rând
+    row_combo_sets - combinațiile permise pentru fiecare rând (ex: CombUpper al grupului)
+    forces         - {(grindă, combinație): {"Station", "P", "V2", "T", "M3": array}}
+    Returnează {componentă: Envelope}; rândurile sunt numerotate 0..n-1 în ordinea primită.
+    """
+    beams = sorted({beam for beam, _ in forces})
+    combos = sorted({combo for _, combo in forces})
+    beam_position = {beam: i for i, beam in enumerate(beams)}
+    combo_position = {combo: i for i, combo in enumerate(combos)}
+
+    # Valorile plate pentru toate perechile, sortate după grindă: (grindă, combinație, stație)
+    keys = sorted(forces, key=lambda key: beam_position[key[0]])
+    lengths = np.array([len(forces[key]["Station"]) for key in keys], dtype=np.int64)
+    beam_index = np.repeat(np.array([beam_position[beam] for beam, _ in keys], dtype=np.int64), lengths)
+    combo_index = np.repeat(np.array([combo_position[combo] for _, combo in keys], dtype=np.int64), lengths)
+    station_index = run_station_index(beam_index, combo_index)
+    n_stations = int(station_index.max()) + 1 if len(station_index) else 0
+    beam_offsets = np.searchsorted(beam_index, np.arange(len(beams) + 1))
+
+    def flat(field):
+        return np.concatenate([forces[key][field] for key in keys]) if keys else np.zeros(0)
+
+    # Stațiile fiecărei grinzi (aceleași pentru toate combinațiile)
+    beam_stations = np.full((len(beams), n_stations), np.nan)
+    beam_stations[beam_index, station_index] = flat("Station")
+    component_values = {component: flat(component) for component in components}
+
+    # Combinațiile permise pe rând; o combinație înfășurătoare "C (Max)" aparține setului care conține "C"
+    base_names = [base_combo_name(combo) for combo in combos]
+    combo_mask = np.array([[base in allowed for base in base_names] for allowed in map(set, row_combo_sets)],
+                          dtype=bool).reshape(len(row_combo_sets), len(combos))
+    row_beam_index = np.array([beam_position.get(beam, -1) for beam in row_beams], dtype=np.int64)
+
+    rows = len(row_beams)
+    results = {component: [np.full((rows, n_stations), np.nan), np.full((rows, n_stations), -1, dtype=np.int64),
+                           np.full((rows, n_stations), np.nan), np.full((rows, n_stations), -1, dtype=np.int64)]
+               for component in components}
+
+    # Rândurile sunt procesate în ordinea grinzilor, în blocuri care acoperă un interval continuu de grinzi
+    known_rows = np.flatnonzero(row_beam_index >= 0)
+    known_rows = known_rows[np.argsort(row_beam_index[known_rows], kind="stable")]
+    chunk_rows = max(1, chunk_values // max(1, len(combos) * n_stations))
+    for start in range(0, len(known_rows), chunk_rows):
+        chunk = known_rows[start:start + chunk_rows]
+        chunk_beams = row_beam_index[chunk]
+        first_beam, last_beam = int(chunk_beams[0]), int(chunk_beams[-1]) + 1
+        values_slice = slice(beam_offsets[first_beam], beam_offsets[last_beam])
+        local_index = (beam_index[values_slice] - first_beam, combo_index[values_slice], station_index[values_slice])
+
+        for component in components:
+            padded = np.full((last_beam - first_beam, len(combos), n_stations), np.nan)
+            padded[local_index] = component_values[component][values_slice]
+            reduced = reduce_envelope(padded[chunk_beams - first_beam], combo_mask[chunk])
+            for target, values in zip(results[component], reduced):
+                target[chunk] = values
+
+    row_stations = np.full((rows, n_stations), np.nan)
+    row_stations[known_rows] = beam_stations[row_beam_index[known_rows]]
+    return {component: Envelope(range(rows), combos, row_stations, *results[component])
+            for component in components}
+
+
+def compute_group_envelopes(db_path="frames.db", components=ENVELOPE_COMPONENTS):
+    """Înfășurătorile pentru toate grinzile din Frames, separat pentru CombUpper și CombLower.
+
+    Returnează (rânduri, {"upper": {componentă: Envelope}, "lower": {...}}), unde rânduri este
+    lista (Scenario, GroupID, OrderID, UniqueName) în ordinea rândurilor din înfășurători.
+    """
+    from db.operations import load_frame_forces
+    from db.schema import load_group_combos
+    from db.session import session
+
+    with session(db_path, readonly=True) as conn:
+        group_combos = load_group_combos(conn)
+        frames = conn.execute(
+            "SELECT Scenario, GroupID, OrderID, UniqueName FROM Frames "
+            "ORDER BY Scenario, GroupID, OrderID").fetchall()
+
+    forces = load_frame_forces(db_path)
+    if not frames or not forces:
+        print("-- Nu există eforturi salvate pentru calculul înfășurătorilor")
+        return [], {}
+
+    rows = [tuple(frame) for frame in frames]
+    row_beams = [frame[3] for frame in frames]
+    no_combos = {"Upper": [], "Lower": []}
+    row_combos = [group_combos.get((frame[0], frame[1]), no_combos) for frame in frames]
+    envelopes = {
+        "upper": compute_envelopes(row_beams, [combos["Upper"] for combos in row_combos], forces, components),
+        "lower": compute_envelopes(row_beams, [combos["Lower"] for combos in row_combos], forces, components),
+    }
+    print(f"-- Înfășurători calculate pentru {len(rows)} grinzi și {len(components)} componente")
+    return rows, envelopes
+
+
+def _benchmark(n_beams=50_000, n_combos=200, max_stations=11, chunk_beams=2_000, seed=0):
+    """Măsoară reducerea pe un array sintetic (grinzi x combinații x stații) cu stații inegale"""
+    import time
+
+    rng = np.random.default_rng(seed)
+    station_counts = rng.integers(3, max_stations + 1, size=n_beams)
+    combo_mask = rng.random((n_beams, n_combos)) < 0.5
+
+    start = time.perf_counter()
+    reduce_time = 0.0
+    governing = np.zeros(n_combos, dtype=np.int64)
+    for first in range(0, n_beams, chunk_beams):
+        last = min(first + chunk_beams, n_beams)
+        values = rng.standard_normal((last - first, n_combos, max_stations))
+        padding = np.arange(max_stations)[None, :] >= station_counts[first:last, None]
+        values[np.broadcast_to(padding[:, None, :], values.shape)] = np.nan
+        tick = time.perf_counter()
+        _, max_combo, _, _ = reduce_envelope(values, combo_mask[first:last])
+        reduce_time += time.perf_counter() - tick
+        governing += np.bincount(max_combo[max_combo >= 0], minlength=n_combos)
+    total = time.perf_counter() - start
+
+    values_count = int(station_counts.sum()) * n_combos
+    print(f"-- {n_beams} grinzi x {n_combos} combinații x max {max_stations} stații "
+          f"({values_count / 1e6:.0f} M valori)")
+    print(f"   reducere vectorizată: {reduce_time:.2f} s ({values_count / reduce_time / 1e6:.0f} M valori/s), "
+          f"total cu generarea datelor: {total:.2f} s")
+
+    # Referință: bucla Python pe un eșantion, extrapolată
+    sample = min(200, n_beams)
+    values = rng.standard_normal((sample, n_combos, max_stations))
+    tick = time.perf_counter()
+    for b in range(sample):
+        for s in range(int(station_counts[b])):
+            best = None
+            for c in range(n_combos):
+                if combo_mask[b, c] and (best is None or values[b, c, s] > best):
+                    best = values[b, c, s]
+    loop_time = (time.perf_counter() - tick) * n_beams / sample
+    print(f"   buclă Python (extrapolat, doar max): {loop_time:.1f} s")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark motor de înfășurători")
+    parser.add_argument("--beams", type=int, default=50_000)
+    parser.add_argument("--combos", type=int, default=200)
+    parser.add_argument("--stations", type=int, default=11)
+    args = parser.parse_args()
+
+    _benchmark(args.beams, args.combos, args.stations)
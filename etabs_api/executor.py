@@ -0,0 +1,195 @@
+import queue
+import threading
+import traceback
+from concurrent.futures import Future
+
+from etabs_api.connection import create_sap_model, bind_thread_sap_model
+
+
+def _co_initialize():
+    """Inițializează COM pentru firul curent (dacă comtypes este disponibil)"""
+    try:
+        import comtypes
+        comtypes.CoInitialize()
+        return True
+    except ImportError:
+        return False
+    except Exception as e:
+        print(f"⮽⮽ CoInitialize a eșuat pe firul ETABS: {e}")
+        return False
+
+
+def _co_uninitialize():
+    try:
+        import comtypes
+        comtypes.CoUninitialize()
+    except Exception:
+        pass
+
+
+def _default_errback(error):
+    print(f"⮽⮽ Eroare în apelul ETABS din fundal: {error}")
+
+
+class EtabsExecutor:
+    """Fir de lucru dedicat care deține SapModel și execută apelurile ETABS dintr-o coadă.
+
+    Fiecare cerere returnează un Future. Dacă executorul are o fereastră Tk, callback-urile
+    sunt rulate pe firul principal prin root.after; altfel sunt rulate direct pe firul de lucru.
+    """
+
+    def __init__(self, tk_root=None, poll_ms=50):
+        self.tk_root = tk_root
+        self.poll_ms = poll_ms
+        self._requests = queue.Queue()
+        self._callbacks = queue.Queue()
+        self._thread = None
+        self._pump_id = None
+        self._model_bound = False
+
+    def start(self):
+        """Pornește firul de lucru (și pomparea callback-urilor în Tk)"""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._thread = threading.Thread(target=self._run, name="etabs-executor", daemon=True)
+        self._thread.start()
+        if self.tk_root is not None:
+            self._pump_id = self.tk_root.after(self.poll_ms, self._pump_callbacks)
+        print("-- Fir ETABS dedicat pornit")
+        return self
+
+    def submit(self, func, *args, callback=None, errback=None, **kwargs):
+        """Programează un apel pe firul ETABS; callback(rezultat) / errback(eroare) pe firul Tk"""
+        future = Future()
+        self._attach_callbacks(future, callback, errback)
+        self._requests.put(([(func, args, kwargs)], future, False))
+        return future
+
+    def submit_batch(self, calls, callback=None, errback=None):
+        """Programează o listă de apeluri (func, args) executate împreună; rezultatul este lista rezultatelor"""
+        future = Future()
+        self._attach_callbacks(future, callback, errback)
+        batch = [(call[0], tuple(call[1]) if len(call) > 1 else (), call[2] if len(call) > 2 else {})
+                 for call in calls]
+        self._requests.put((batch, future, True))
+        return future
+
+    def cancel_pending(self):
+        """Anulează cererile programate care nu au început încă; returnează numărul lor"""
+        cancelled = 0
+        kept = []
+        while True:
+            try:
+                request = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                kept.append(request)
+            elif request[1].cancel():
+                cancelled += 1
+        for request in kept:
+            self._requests.put(request)
+        if cancelled:
+            print(f"-- {cancelled} cereri ETABS anulate")
+        return cancelled
+
+    def shutdown(self, wait=True):
+        """Oprește firul de lucru după terminarea cererilor deja programate"""
+        if self._pump_id is not None and self.tk_root is not None:
+            try:
+                self.tk_root.after_cancel(self._pump_id)
+            except Exception:
+                pass
+            self._pump_id = None
+        if self._thread is not None:
+            self._requests.put(None)
+            if wait:
+                self._thread.join()
+            self._thread = None
+        print("-- Fir ETABS dedicat oprit")
+
+    def _attach_callbacks(self, future, callback, errback):
+        if callback is None and errback is None:
+            return
+        errback = errback or _default_errback
+
+        def done(completed):
+            if self.tk_root is not None:
+                self._callbacks.put((completed, callback, errback))
+            else:
+                self._run_callback(completed, callback, errback)
+
+        future.add_done_callback(done)
+
+    @staticmethod
+    def _run_callback(future, callback, errback):
+        if future.cancelled():
+            return
+        try:
+            error = future.exception()
+            if error is not None:
+                errback(error)
+            elif callback is not None:
+                callback(future.result())
+        except Exception as e:
+            print(f"⮽⮽ Eroare în callback-ul apelului ETABS: {e}")
+            traceback.print_exc()
+
+    def _pump_callbacks(self):
+        """Rulează pe firul Tk callback-urile apelurilor terminate"""
+        while True:
+            try:
+                future, callback, errback = self._callbacks.get_nowait()
+            except queue.Empty:
+                break
+            self._run_callback(future, callback, errback)
+        self._pump_id = self.tk_root.after(self.poll_ms, self._pump_callbacks)
+
+    def _ensure_model(self):
+        """Creează SapModel-ul propriu al firului de lucru la prima cerere"""
+        if not self._model_bound:
+            bind_thread_sap_model(create_sap_model())
+            self._model_bound = True
+
+    def _run(self):
+        com_initialized = _co_initialize()
+        try:
+            while True:
+                request = self._requests.get()
+                if request is None:
+                    break
+                batch, future, is_batch = request
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    self._ensure_model()
+                    results = [func(*args, **kwargs) for func, args, kwargs in batch]
+                    future.set_result(results if is_batch else results[0])
+                except BaseException as e:
+                    future.set_exception(e)
+        finally:
+            bind_thread_sap_model(None)
+            if com_initialized:
+                _co_uninitialize()
+
+
+# Executorul comun al aplicației
+_executor = None
+
+
+def get_executor(tk_root=None):
+    """Returnează executorul comun, pornindu-l la prima utilizare"""
+    global _executor
+    if _executor is None:
+        _executor = EtabsExecutor(tk_root).start()
+    return _executor
+
+
+def shutdown_executor(wait=True, cancel_pending=False):
+    """Oprește executorul comun (dacă a fost pornit); cu cancel_pending cererile neîncepute sunt anulate"""
+    global _executor
+    if _executor is not None:
+        if cancel_pending:
+            _executor.cancel_pending()
+        _executor.shutdown(wait)
+        _executor = None
@@ -0,0 +1,910 @@
+"""Model ETABS simulat în Python (fără licență ETABS / COM).
+
+Implementează subsetul din API-ul ETABS folosit de aplicație, cu aceeași formă a
+rezultatelor ca apelurile comtypes (parametrii de ieșire în ordine, codul de retur la final)
+și cu o latență configurabilă pe apel care imită costul unui round-trip COM.
+"""
+import math
+import random
+import time
+import uuid
+from collections import Counter
+
+
+class FakeModelData:
+    """Datele unui model sintetic: etaje, puncte, frame-uri, secțiuni, combinații, grupuri"""
+
+    def __init__(self):
+        self.filename = "C:\\Models\\Synthetic.edb"
+        self.stories = []           # [(nume, cotă, înălțime)]
+        self.points = {}            # nume punct -> (x, y, z)
+        self.frames = {}            # unique name -> dict cu atributele frame-ului
+        self.sections = {}          # nume secțiune -> dict (tip, material, t3, t2)
+        self.load_cases = []
+        self.combos = {}            # nume combinație -> [(tip 0=caz / 1=combinație, nume, factor)]
+        self.combo_types = {}       # nume combinație -> 0 = liniară, 1 = înfășurătoare
+        self.output_cases = set()   # cazurile selectate pentru Results
+        self.output_combos = set()  # combinațiile selectate pentru Results
+        self.groups = {"All": set()}
+        self.selected = []
+        self.locked = True
+        self.design_available = True  # rezultatele proiectării la beton sunt disponibile
+        self.pending_edits = {}     # tabele editate prin DatabaseTables, aplicate la ApplyEditedTables
+
+
+def _add_section(data, name, section_type, material, t3, t2=0.0):
+    data.sections[name] = {"type": section_type, "material": material, "t3": t3, "t2": t2}
+
+
+def generate_model(n_frames=1000, n_stories=10, seed=0):
+    """Generează un model sintetic cu aproximativ n_frames frame-uri (grinzi și stâlpi pe o rețea)"""
+    rng = random.Random(seed)
+    data = FakeModelData()
+
+    _add_section(data, "B25x50", "Rectangular", "C25/30", 0.50, 0.25)
+    _add_section(data, "B30x60", "Rectangular", "C25/30", 0.60, 0.30)
+    _add_section(data, "B40x80", "Rectangular", "C30/37", 0.80, 0.40)
+    _add_section(data, "C50x50", "Rectangular", "C30/37", 0.50, 0.50)
+    _add_section(data, "C60x60", "Rectangular", "C30/37", 0.60, 0.60)
+    _add_section(data, "IPE300", "I", "S355", 0.30, 0.15)
+    _add_section(data, "D40", "Circle", "C30/37", 0.40)
+    beam_sections = ["B25x50", "B30x60", "B40x80", "IPE300"]
+    column_sections = ["C50x50", "C60x60", "D40"]
+
+    frames_per_story = max(1, math.ceil(n_frames / n_stories))
+    # Rețea g x g pe etaj: (g-1)*g grinzi pe fiecare direcție + g*g stâlpi
+    grid = 2
+    while 3 * grid * grid - 2 * grid < frames_per_story:
+        grid += 1
+    spacing = 6.0
+
+    def point_name(level, i, j):
+        name = f"{level * grid * grid + i * grid + j + 1}"
+        if name not in data.points:
+            data.points[name] = (i * spacing, j * spacing, level * 3.0)
+        return name
+
+    frame_id = 0
+    for level in range(1, n_stories + 1):
+        story_name = f"Story{level}"
+        data.stories.append((story_name, level * 3.0, 3.0))
+        story_frames = []
+        for i in range(grid):
+            for j in range(grid):
+                story_frames.append(("C", point_name(level - 1, i, j), point_name(level, i, j)))
+                if i + 1 < grid:
+                    story_frames.append(("B", point_name(level, i, j), point_name(level, i + 1, j)))
+                if j + 1 < grid:
+                    story_frames.append(("B", point_name(level, i, j), point_name(level, i, j + 1)))
+
+        label_counter = Counter()
+        for kind, point_i, point_j in story_frames[:frames_per_story]:
+            if frame_id >= n_frames:
+                break
+            frame_id += 1
+            label_counter[kind] += 1
+            name = str(frame_id)
+            sections = beam_sections if kind == "B" else column_sections
+            data.frames[name] = {
+                "label": f"{kind}{label_counter[kind]}",
+                "story": story_name,
+                "section": rng.choice(sections),
+                "guid": str(uuid.UUID(int=rng.getrandbits(128))),
+                "points": (point_i, point_j),
+                "modifiers": [1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0],
+                "releases_i": [False] * 6,
+                "releases_j": [False] * 6,
+                "cardinal_point": 10 if kind == "B" else 8,
+                "rebar_ratio": 0.0,
+            }
+            data.groups["All"].add(name)
+
+    data.load_cases = ["DEAD", "SDEAD", "LIVE", "EX", "EY"]
+    data.combos["ULS1"] = [(0, "DEAD", 1.35), (0, "SDEAD", 1.35), (0, "LIVE", 1.5)]
+    data.combos["SLS1"] = [(0, "DEAD", 1.0), (0, "SDEAD", 1.0), (0, "LIVE", 1.0)]
+    data.combos["GS"] = [(0, "DEAD", 1.0), (0, "SDEAD", 1.0), (0, "LIVE", 0.3)]
+    for direction in ["EX", "EY"]:
+        for sign, factor in [("+", 1.0), ("-", -1.0)]:
+            data.combos[f"SEISM {direction}{sign}"] = [(1, "GS", 1.0), (0, direction, factor)]
+    data.combos["ENV SEISM"] = [(1, name, 1.0) for name in list(data.combos) if name.startswith("SEISM")]
+    data.combo_types = {name: 0 for name in data.combos}
+    data.combo_types["ENV SEISM"] = 1
+
+    return data
+
+
+class _FakeInterface:
+    """Bază pentru interfețele simulate; fiecare apel trece prin model.record_call"""
+
+    def __init__(self, model):
+        self._model = model
+        self._data = model.data
+
+
+def _com(method):
+    """Marchează o metodă ca apel COM simulat (contorizat și cu latență)"""
+    def wrapper(self, *args, **kwargs):
+        self._model.record_call(f"{type(self).__name__}.{method.__name__}")
+        return method(self, *args, **kwargs)
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    wrapper.__wrapped__ = method
+    return wrapper
+
+
+class FrameObj(_FakeInterface):
+    @_com
+    def Count(self, MyType=0):
+        return len(self._data.frames)
+
+    @_com
+    def GetNameList(self, NumberNames=0, MyName=None):
+        names = list(self._data.frames)
+        return [len(names), names, 0]
+
+    @_com
+    def GetLabelFromName(self, Name):
+        frame = self._data.frames.get(Name)
+        if frame is None:
+            return ["", "", 1]
+        return [frame["label"], frame["story"], 0]
+
+    @_com
+    def GetLabelNameList(self, NumberNames=0, MyName=None, MyLabel=None, MyStory=None):
+        names = list(self._data.frames)
+        labels = [self._data.frames[name]["label"] for name in names]
+        stories = [self._data.frames[name]["story"] for name in names]
+        return [len(names), names, labels, stories, 0]
+
+    @_com
+    def GetGUID(self, Name):
+        frame = self._data.frames.get(Name)
+        return [frame["guid"], 0] if frame else ["", 1]
+
+    @_com
+    def GetSection(self, Name):
+        frame = self._data.frames.get(Name)
+        return [frame["section"], "", 0] if frame else ["", "", 1]
+
+    @_com
+    def GetSelected(self, Name):
+        return [Name in self._data.selected, 0]
+
+    @_com
+    def SetSelected(self, Name, Selected, ItemType=0):
+        if Name not in self._data.frames:
+            return 1
+        if Selected and Name not in self._data.selected:
+            self._data.selected.append(Name)
+        elif not Selected and Name in self._data.selected:
+            self._data.selected.remove(Name)
+        return 0
+
+    @_com
+    def GetAllFrames(self, NumberNames=0, MyName=None, PropName=None, StoryName=None, PointName1=None,
+                     PointName2=None, Point1X=None, Point1Y=None, Point1Z=None, Point2X=None, Point2Y=None,
+                     Point2Z=None, Angle=None, Offset1X=None, Offset2X=None, Offset1Y=None, Offset2Y=None,
+                     Offset1Z=None, Offset2Z=None, CardinalPoint=None, csys="Global"):
+        names = list(self._data.frames)
+        frames = [self._data.frames[name] for name in names]
+        points_i = [self._data.points[f["points"][0]] for f in frames]
+        points_j = [self._data.points[f["points"][1]] for f in frames]
+        zeros = [0.0] * len(names)
+        return [len(names), names, [f["section"] for f in frames], [f["story"] for f in frames],
+                [f["points"][0] for f in frames], [f["points"][1] for f in frames],
+                [p[0] for p in points_i], [p[1] for p in points_i], [p[2] for p in points_i],
+                [p[0] for p in points_j], [p[1] for p in points_j], [p[2] for p in points_j],
+                list(zeros), list(zeros), list(zeros), list(zeros), list(zeros), list(zeros), list(zeros),
+                [f["cardinal_point"] for f in frames], 0]
+
+    @_com
+    def SetSection(self, Name, PropName, ItemType=0, SVarRelStartLoc=0, SVarTotalLength=0):
+        frame = self._data.frames.get(Name)
+        if frame is None or PropName not in self._data.sections or self._data.locked:
+            return 1
+        frame["section"] = PropName
+        return 0
+
+    @_com
+    def SetModifiers(self, Name, Value, ItemType=0):
+        frame = self._data.frames.get(Name)
+        if frame is None or len(Value) != 8 or self._data.locked:
+            return 1
+        frame["modifiers"] = [float(value) for value in Value]
+        return 0
+
+    @_com
+    def GetPoints(self, Name):
+        frame = self._data.frames.get(Name)
+        return [frame["points"][0], frame["points"][1], 0] if frame else ["", "", 1]
+
+    @_com
+    def GetModifiers(self, Name):
+        frame = self._data.frames.get(Name)
+        return [list(frame["modifiers"]), 0] if frame else [[], 1]
+
+    @_com
+    def GetReleases(self, Name):
+        frame = self._data.frames.get(Name)
+        if frame is None:
+            return [[], [], [], [], 1]
+        return [list(frame["releases_i"]), list(frame["releases_j"]), [0.0] * 6, [0.0] * 6, 0]
+
+    @_com
+    def GetInsertionPoint(self, Name):
+        frame = self._data.frames.get(Name)
+        if frame is None:
+            return [0, False, False, [], [], "", 1]
+        return [frame["cardinal_point"], False, True, [0.0] * 3, [0.0] * 3, "Local", 0]
+
+    @_com
+    def GetGroupAssign(self, Name):
+        groups = [group for group, members in self._data.groups.items() if Name in members]
+        return [len(groups), groups, 0]
+
+    @_com
+    def SetGroupAssign(self, Name, GroupName, Remove=False, ItemType=0):
+        members = self._data.groups.get(GroupName)
+        if members is None:
+            return 1
+        if ItemType == 2:
+            names = list(self._data.selected)
+        elif ItemType == 1:
+            names = list(self._data.groups.get(Name, ()))
+        elif Name in self._data.frames:
+            names = [Name]
+        else:
+            return 1
+        if Remove:
+            members.difference_update(names)
+        else:
+            members.update(names)
+        return 0
+
+
+class PropFrame(_FakeInterface):
+    @_com
+    def GetNameList(self, NumberNames=0, MyName=None, PropType=0):
+        names = list(self._data.sections)
+        return [len(names), names, 0]
+
+    def _section(self, Name, section_type):
+        section = self._data.sections.get(Name)
+        return section if section and section["type"] == section_type else None
+
+    @_com
+    def GetRectangle(self, Name):
+        s = self._section(Name, "Rectangular")
+        return ["", s["material"], s["t3"], s["t2"], -1, "", "", 0] if s else ["", "", 0.0, 0.0, 0, "", "", 1]
+
+    @_com
+    def GetISection(self, Name):
+        s = self._section(Name, "I")
+        if s is None:
+            return ["", "", 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0, "", "", 1]
+        return ["", s["material"], s["t3"], s["t2"], 0.0107, 0.0071, s["t2"], 0.0107, -1, "", "", 0]
+
+    @_com
+    def GetTube(self, Name):
+        s = self._section(Name, "Tube")
+        if s is None:
+            return ["", "", 0.0, 0.0, 0.0, 0.0, 0, "", "", 1]
+        return ["", s["material"], s["t3"], s["t2"], 0.01, 0.01, -1, "", "", 0]
+
+    @_com
+    def GetCircle(self, Name):
+        s = self._section(Name, "Circle")
+        return ["", s["material"], s["t3"], -1, "", "", 0] if s else ["", "", 0.0, 0, "", "", 1]
+
+    @_com
+    def GetMaterial(self, Name):
+        section = self._data.sections.get(Name)
+        return [section["material"], 0] if section else ["", 1]
+
+
+class Story(_FakeInterface):
+    @_com
+    def GetStories(self):
+        names = [story[0] for story in self._data.stories]
+        elevations = [story[1] for story in self._data.stories]
+        heights = [story[2] for story in self._data.stories]
+        count = len(names)
+        return [count, names, elevations, heights, [False] * count, ["None"] * count, [False] * count,
+                [0.0] * count, 0]
+
+    @_com
+    def GetNameList(self, NumberNames=0, MyName=None):
+        names = [story[0] for story in self._data.stories]
+        return [len(names), names, 0]
+
+
+class RespCombo(_FakeInterface):
+    @_com
+    def Count(self):
+        return len(self._data.combos)
+
+    @_com
+    def GetNameList(self, NumberNames=0, MyName=None):
+        names = list(self._data.combos)
+        return [len(names), names, 0]
+
+    @_com
+    def GetCaseList(self, Name):
+        items = self._data.combos.get(Name)
+        if items is None:
+            return [0, [], [], [], 1]
+        return [len(items), [item[0] for item in items], [item[1] for item in items],
+                [item[2] for item in items], 0]
+
+
+    @_com
+    def GetTypeOfCombo(self, Name):
+        if Name not in self._data.combos:
+            return [0, 1]
+        return [self._data.combo_types.get(Name, 0), 0]
+
+
+# Factorii cazurilor de încărcare: gravitaționale (DEAD, SDEAD, LIVE) și seismice (EX, EY)
+_GRAVITY_CASES = {"DEAD": 1.0, "SDEAD": 0.3, "LIVE": 0.5}
+_SEISMIC_CASES = {"EX", "EY"}
+
+
+def _combo_factors(data, combo, scale=1.0):
+    """Factorii (gravitațional, seismic) ai unei combinații liniare, expandată recursiv"""
+    gravity, seismic = 0.0, 0.0
+    for item_type, name, factor in data.combos.get(combo, []):
+        if item_type == 1:
+            g, e = _combo_factors(data, name, scale * factor)
+            gravity, seismic = gravity + g, seismic + e
+        elif name in _SEISMIC_CASES:
+            seismic += scale * factor
+        else:
+            gravity += scale * factor * _GRAVITY_CASES.get(name, 0.0)
+    return gravity, seismic
+
+
+def _frame_forces(data, frame_name, combo):
+    """Eforturi sintetice pe stații: [(step type, stații, P, V2, T, M3)]"""
+    frame = data.frames[frame_name]
+    point_i, point_j = (data.points[p] for p in frame["points"])
+    length = math.dist(point_i, point_j)
+    x = [length * k / (2 + int(length // 1.5)) for k in range(3 + int(length // 1.5))]
+    load = 10.0 + int(frame_name) % 7
+
+    def linear(name):
+        gravity, seismic = _combo_factors(data, name)
+        m3 = [gravity * load * (xi * (length - xi) / 2 - length ** 2 / 12) + seismic * 20.0 * (1 - 2 * xi / length)
+              for xi in x]
+        v2 = [gravity * load * (length / 2 - xi) - seismic * 40.0 / length for xi in x]
+        t = [0.01 * gravity * load] * len(x)
+        p = [0.1 * seismic * load] * len(x)
+        return p, v2, t, m3
+
+    if data.combo_types.get(combo, 0) != 1:
+        return [("", x) + linear(combo)]
+    children = [linear(name) for item_type, name, factor in data.combos[combo] if item_type == 1]
+    envelope_max = tuple([max(values) for values in zip(*component)] for component in zip(*children))
+    envelope_min = tuple([min(values) for values in zip(*component)] for component in zip(*children))
+    return [("Max", x) + envelope_max, ("Min", x) + envelope_min]
+
+
+class LoadCases(_FakeInterface):
+    @_com
+    def GetNameList(self, NumberNames=0, MyName=None):
+        names = list(self._data.load_cases)
+        return [len(names), names, 0]
+
+
+class ResultsSetup(_FakeInterface):
+    @_com
+    def DeselectAllCasesAndCombosForOutput(self):
+        self._data.output_cases.clear()
+        self._data.output_combos.clear()
+        return 0
+
+    @_com
+    def GetCaseSelectedForOutput(self, Name, Selected=False):
+        if Name not in self._data.load_cases:
+            return [False, 1]
+        return [Name in self._data.output_cases, 0]
+
+    @_com
+    def SetCaseSelectedForOutput(self, Name, Selected=True):
+        if Name not in self._data.load_cases:
+            return 1
+        if Selected:
+            self._data.output_cases.add(Name)
+        else:
+            self._data.output_cases.discard(Name)
+        return 0
+
+    @_com
+    def GetComboSelectedForOutput(self, Name, Selected=False):
+        if Name not in self._data.combos:
+            return [False, 1]
+        return [Name in self._data.output_combos, 0]
+
+    @_com
+    def SetComboSelectedForOutput(self, Name, Selected=True):
+        if Name not in self._data.combos:
+            return 1
+        if Selected:
+            self._data.output_combos.add(Name)
+        else:
+            self._data.output_combos.discard(Name)
+        return 0
+
+
+class Results(_FakeInterface):
+    def __init__(self, model):
+        super().__init__(model)
+        self.Setup = ResultsSetup(model)
+
+    @_com
+    def FrameForce(self, Name, ItemTypeElm=0, NumberResults=0, Obj=None, ObjSta=None, Elm=None, ElmSta=None,
+                   LoadCase=None, StepType=None, StepNum=None, P=None, V2=None, V3=None, T=None, M2=None, M3=None):
+        if ItemTypeElm == 2:
+            if Name not in self._data.groups:
+                return [0] + [[] for _ in range(13)] + [1]
+            frames = sorted(self._data.groups[Name], key=int)
+        elif Name in self._data.frames:
+            frames = [Name]
+        else:
+            return [0] + [[] for _ in range(13)] + [1]
+
+        columns = [[] for _ in range(13)]
+        for frame_name in frames:
+            for combo in sorted(self._data.output_combos):
+                for step_type, x, p, v2, t, m3 in _frame_forces(self._data, frame_name, combo):
+                    count = len(x)
+                    for column, values in zip(columns, [[frame_name] * count, x, [frame_name] * count, x,
+                                                        [combo] * count, [step_type] * count, [0.0] * count,
+                                                        p, v2, [0.0] * count, t, [0.0] * count, m3]):
+                        column.extend(values)
+        return [len(columns[0])] + columns + [0]
+
+
+class DesignConcrete(_FakeInterface):
+    # Combinația de proiectare folosită pentru ariile sintetice și rezistența de calcul a armăturii (kPa)
+    DESIGN_COMBO = "ULS1"
+    FYD = 435000.0
+
+    @_com
+    def GetResultsAvailable(self):
+        return self._data.design_available
+
+    @_com
+    def GetSummaryResultsBeam(self, Name, NumberItems=0, FrameName=None, Location=None, TopCombo=None,
+                              TopArea=None, BotCombo=None, BotArea=None, VmajorCombo=None, VmajorArea=None,
+                              TLCombo=None, TLArea=None, TTrnCombo=None, TTrnArea=None, ErrorSummary=None,
+                              WarningSummary=None, ItemType=0):
+        if not self._data.design_available:
+            return [0] + [[] for _ in range(14)] + [1]
+        if ItemType == 1:
+            if Name not in self._data.groups:
+                return [0] + [[] for _ in range(14)] + [1]
+            frames = sorted(self._data.groups[Name], key=int)
+        elif Name in self._data.frames:
+            frames = [Name]
+        else:
+            return [0] + [[] for _ in range(14)] + [1]
+
+        columns = [[] for _ in range(14)]
+        for frame_name in frames:
+            frame = self._data.frames[frame_name]
+            section = self._data.sections[frame["section"]]
+            # Doar grinzile de beton au rezultate de proiectare la beton
+            if not frame["label"].startswith("B") or section["material"].startswith("S"):
+                continue
+            lever_arm = 0.9 * 0.9 * section["t3"]
+            _, x, _, v2, _, m3 = _frame_forces(self._data, frame_name, self.DESIGN_COMBO)[0]
+            for station, moment, shear in zip(x, m3, v2):
+                top = max(0.0, -moment) / (lever_arm * self.FYD)
+                bottom = max(0.0, moment) / (lever_arm * self.FYD)
+                stirrups = abs(shear) / (lever_arm * self.FYD)
+                for column, value in zip(columns, [frame_name, station, self.DESIGN_COMBO, top, self.DESIGN_COMBO,
+                                                   bottom, self.DESIGN_COMBO, stirrups, self.DESIGN_COMBO, 0.0,
+                                                   self.DESIGN_COMBO, 0.0, "No Message", "No Message"]):
+                    column.append(value)
+        return [len(columns[0])] + columns + [0]
+
+
+class SelectObj(_FakeInterface):
+    @_com
+    def GetSelected(self, NumberItems=0, ObjectType=None, ObjectName=None):
+        names = list(self._data.selected)
+        return [len(names), [2] * len(names), names, 0]
+
+    @_com
+    def ClearSelection(self):
+        self._data.selected.clear()
+        return 0
+
+    @_com
+    def Group(self, Name, DeSelect=False):
+        members = self._data.groups.get(Name)
+        if members is None:
+            return 1
+        for name in sorted(members, key=int):
+            if DeSelect and name in self._data.selected:
+                self._data.selected.remove(name)
+            elif not DeSelect and name not in self._data.selected:
+                self._data.selected.append(name)
+        return 0
+
+
+class GroupDef(_FakeInterface):
+    @_com
+    def SetGroup(self, Name, Color=-1, SpecifiedForSelection=True, SpecifiedForSectionCutDefinition=True,
+                 SpecifiedForSteelDesign=True, SpecifiedForConcreteDesign=True,
+                 SpecifiedForAluminumDesign=True, SpecifiedForStaticNLActiveStage=True,
+                 SpecifiedForAutoSeismicOutput=False, SpecifiedForAutoWindOutput=False,
+                 SpecifiedForMassAndWeight=True):
+        self._data.groups.setdefault(Name, set())
+        return 0
+
+    @_com
+    def Delete(self, Name):
+        if Name == "All" or Name not in self._data.groups:
+            return 1
+        del self._data.groups[Name]
+        return 0
+
+    @_com
+    def GetNameList(self, NumberNames=0, MyName=None):
+        names = list(self._data.groups)
+        return [len(names), names, 0]
+
+
+class PointObj(_FakeInterface):
+    @_com
+    def Count(self):
+        return len(self._data.points)
+
+    @_com
+    def GetNameList(self, NumberNames=0, MyName=None):
+        names = list(self._data.points)
+        return [len(names), names, 0]
+
+    @_com
+    def GetAllPoints(self, NumberNames=0, MyName=None, X=None, Y=None, Z=None, csys="Global"):
+        names = list(self._data.points)
+        coordinates = [self._data.points[name] for name in names]
+        return [len(names), names, [c[0] for c in coordinates], [c[1] for c in coordinates],
+                [c[2] for c in coordinates], 0]
+
+    @_com
+    def GetCoordCartesian(self, Name, X=0.0, Y=0.0, Z=0.0, CSys="Global"):
+        point = self._data.points.get(Name)
+        return [point[0], point[1], point[2], 0] if point else [0.0, 0.0, 0.0, 1]
+
+
+class Display(_FakeInterface):
+    @_com
+    def SetObjectSelected(self, Selected):
+        return 0
+
+
+class Analyze(_FakeInterface):
+    @_com
+    def GetCaseStatus(self, NumberItems=0, CaseName=None, Status=None):
+        # 4 = analiză terminată (modelul blocat are rezultate), 1 = nerulat
+        status = 4 if self._data.locked else 1
+        return [len(self._data.load_cases), list(self._data.load_cases), [status] * len(self._data.load_cases), 0]
+
+
+class View(_FakeInterface):
+    @_com
+    def RefreshView(self, Window=0, Zoom=True):
+        return 0
+
+
+class DatabaseTables(_FakeInterface):
+    def _frame_rows(self, table_key, frame):
+        name, f = frame
+        if table_key == "Frame Assignments - Summary":
+            point_i, point_j = (self._data.points[p] for p in f["points"])
+            length = math.dist(point_i, point_j)
+            design_type = "Beam" if f["label"].startswith("B") else "Column"
+            return [f["story"], f["label"], name, design_type, f"{length:.4f}", f["section"], f["section"]]
+        if table_key == "Frame Assignments - Property Modifiers":
+            return [f["story"], f["label"], name] + [f"{value:g}" for value in f["modifiers"]]
+        if table_key == "Frame Assignments - Releases and Partial Fixity":
+            flags = ["Yes" if value else "No" for value in f["releases_i"] + f["releases_j"]]
+            return [f["story"], f["label"], name] + flags
+        if table_key == "Frame Assignments - Insertion Point":
+            return [f["story"], f["label"], name, str(f["cardinal_point"]), "No", "Yes"]
+        if table_key == "Frame Assignments - End Length Offsets":
+            return [f["story"], f["label"], name, "Automatic", "0", "0", "0"]
+        if table_key == "Frame Assignments - Output Stations":
+            return [f["story"], f["label"], name, "Min Stations", "3", ""]
+        if table_key == "Frame Assignments - Local Axes":
+            return [f["story"], f["label"], name, "0"]
+        if table_key == "Frame Assignments - Rebar Ratio":
+            # Frame-urile fără rebar ratio atribuit (None) nu au rând în tabel
+            if f["rebar_ratio"] is None:
+                return None
+            return [f["story"], f["label"], name, f"{f['rebar_ratio']:g}"]
+        if table_key.endswith("Object Connectivity"):
+            kind = {"Beam": "B", "Column": "C", "Brace": "D"}[table_key.split()[0]]
+            if not f["label"].startswith(kind):
+                return None
+            return [name, f["story"], f["label"], f["points"][0], f["points"][1], f["guid"]]
+        return None
+
+    TABLE_FIELDS = {
+        "Frame Assignments - Summary": ["Story", "Label", "UniqueName", "Design Type", "Length",
+                                        "Analysis Section", "Design Section"],
+        "Frame Assignments - Property Modifiers": ["Story", "Label", "UniqueName", "Area Modifier",
+                                                   "As2 Modifier", "As3 Modifier", "Torsion Modifier",
+                                                   "I22 Modifier", "I33 Modifier", "Mass Modifier",
+                                                   "Weight Modifier"],
+        "Frame Assignments - Releases and Partial Fixity": ["Story", "Label", "UniqueName", "PI", "V2I", "V3I",
+                                                            "TI", "M2I", "M3I", "PJ", "V2J", "V3J", "TJ",
+                                                            "M2J", "M3J"],
+        "Frame Assignments - Insertion Point": ["Story", "Label", "UniqueName", "Cardinal Point", "Mirror2",
+                                                "No Transform Stiffness"],
+        "Frame Assignments - End Length Offsets": ["Story", "Label", "UniqueName", "Offset Option", "Offset I",
+                                                   "Offset J", "Rigid Factor"],
+        "Frame Assignments - Output Stations": ["Story", "Label", "UniqueName", "Station Option", "Min Stations",
+                                                "Max Spacing"],
+        "Frame Assignments - Local Axes": ["Story", "Label", "UniqueName", "Angle"],
+        "Frame Assignments - Rebar Ratio": ["Story", "Label", "UniqueName", "Rebar Ratio"],
+        "Beam Object Connectivity": ["Unique Name", "Story", "Beam", "UniquePtI", "UniquePtJ", "GUID"],
+        "Column Object Connectivity": ["Unique Name", "Story", "Column", "UniquePtI", "UniquePtJ", "GUID"],
+        "Brace Object Connectivity": ["Unique Name", "Story", "Brace", "UniquePtI", "UniquePtJ", "GUID"],
+        "Group Assignments": ["Group Name", "Object Type", "Object Unique Name"],
+        "Load Pattern Definitions": ["Name", "Is Auto Load", "Type", "Self Weight Multiplier"],
+        "Load Combination Definitions": ["Name", "Type", "Is Auto", "Load Name", "SF"],
+    }
+
+    # Tabelele care nu sunt pe frame-uri (definițiile încărcărilor)
+    MODEL_TABLES = ("Load Pattern Definitions", "Load Combination Definitions")
+
+    def _model_rows(self, table_key):
+        if table_key == "Load Pattern Definitions":
+            return [[name, "No", "Dead" if name in _GRAVITY_CASES else "Seismic", "1" if name == "DEAD" else "0"]
+                    for name in self._data.load_cases]
+        combo_type = {0: "Linear Add", 1: "Envelope"}
+        return [[name, combo_type[self._data.combo_types.get(name, 0)], "No", item_name, f"{factor:g}"]
+                for name, items in self._data.combos.items() for _, item_name, factor in items]
+
+    @_com
+    def GetAvailableTables(self):
+        keys = list(self.TABLE_FIELDS)
+        return [len(keys), keys, keys, [1] * len(keys), 0]
+
+    @_com
+    def GetTableForDisplayArray(self, TableKey, FieldKeyList=None, GroupName="All", TableVersion=0,
+                                FieldsKeysIncluded=None, NumberRecords=0, TableData=None):
+        fields = self.TABLE_FIELDS.get(TableKey)
+        members = self._data.groups.get(GroupName)
+        if fields is None or members is None:
+            return [[], 0, [], 0, [], 1]
+
+        data = []
+        records = 0
+        if TableKey in self.MODEL_TABLES:
+            for row in self._model_rows(TableKey):
+                data.extend(row)
+                records += 1
+        elif TableKey == "Group Assignments":
+            for group_name, group_members in self._data.groups.items():
+                if group_name == "All":
+                    continue
+                for name in group_members:
+                    if name in members:
+                        data.extend([group_name, "Frame", name])
+                        records += 1
+        else:
+            for frame in self._data.frames.items():
+                if frame[0] not in members:
+                    continue
+                row = self._frame_rows(TableKey, frame)
+                if row is not None:
+                    data.extend(row)
+                    records += 1
+        if FieldKeyList:
+            # Doar câmpurile cerute, în ordinea din tabel (ca ETABS)
+            positions = [i for i, field in enumerate(fields) if field in FieldKeyList]
+            width = len(fields)
+            data = [data[row * width + i] for row in range(records) for i in positions]
+            fields = [fields[i] for i in positions]
+        return [[], 1, list(fields), records, data, 0]
+
+    # Tabelele care pot fi editate: rebar ratio (valori pe frame) și atribuirile în grupuri (tabel înlocuit integral)
+    EDITABLE_TABLES = {"Frame Assignments - Rebar Ratio": ("UniqueName", "Rebar Ratio", "rebar_ratio"),
+                       "Group Assignments": ("Object Unique Name", "Group Name", None)}
+
+    @_com
+    def GetTableForEditingArray(self, TableKey, GroupName="All", TableVersion=0, FieldsKeysIncluded=None,
+                                NumberRecords=0, TableData=None):
+        if TableKey not in self.EDITABLE_TABLES:
+            return [0, [], 0, [], 1]
+        result = self.GetTableForDisplayArray.__wrapped__(self, TableKey, [], GroupName)
+        return [result[1], result[2], result[3], result[4], 0]
+
+    @_com
+    def SetTableForEditingArray(self, TableKey, TableVersion, FieldsKeysIncluded, NumberRecords, TableData):
+        if TableKey not in self.EDITABLE_TABLES:
+            return [TableVersion, 1]
+        self._data.pending_edits[TableKey] = (list(FieldsKeysIncluded), NumberRecords, list(TableData))
+        return [TableVersion, 0]
+
+    @_com
+    def ApplyEditedTables(self, FillImportLog=True, NumFatalErrors=0, NumErrorMsgs=0, NumWarnMsgs=0,
+                          NumInfoMsgs=0, ImportLog=""):
+        # Atribuirile în grupuri nu afectează rezultatele analizei, deci sunt permise pe modelul blocat
+        if self._data.locked and any(key != "Group Assignments" for key in self._data.pending_edits):
+            return [1, 0, 0, 0, "Model is locked", 1]
+        errors = 0
+        for table_key, (fields, number_records, table_data) in self._data.pending_edits.items():
+            name_field, value_field, key = self.EDITABLE_TABLES[table_key]
+            if key is None:
+                errors += self._apply_group_assignments(fields, number_records, table_data)
+                continue
+            name_position, value_position = fields.index(name_field), fields.index(value_field)
+            for i in range(number_records):
+                row = table_data[i * len(fields):(i + 1) * len(fields)]
+                frame = self._data.frames.get(row[name_position])
+                if frame is None:
+                    errors += 1
+                    continue
+                frame[key] = float(row[value_position])
+        self._data.pending_edits.clear()
+        return [0, errors, 0, 0, "", 0]
+
+    def _apply_group_assignments(self, fields, number_records, table_data):
+        """Tabelul editat înlocuiește toate atribuirile (ca în ETABS); grupurile trebuie să existe deja"""
+        name_position, group_position = fields.index("Object Unique Name"), fields.index("Group Name")
+        for group_name, members in self._data.groups.items():
+            if group_name != "All":
+                members.clear()
+        errors = 0
+        for i in range(number_records):
+            row = table_data[i * len(fields):(i + 1) * len(fields)]
+            members = self._data.groups.get(row[group_position])
+            if members is None or row[name_position] not in self._data.frames:
+                errors += 1
+                continue
+            members.add(row[name_position])
+        return errors
+
+
+class FakeSapModel:
+    """SapModel simulat, construit peste un FakeModelData.
+
+    latency            - secunde adăugate la fiecare apel (imită round-trip-ul COM)
+    latency_per_method - latențe specifice, ex: {"DatabaseTables.GetTableForDisplayArray": 0.05}
+    """
+
+    def __init__(self, data=None, latency=0.0, latency_per_method=None):
+        self.data = data if data is not None else generate_model()
+        self.latency = latency
+        self.latency_per_method = dict(latency_per_method or {})
+        self.call_counts = Counter()
+
+        self.FrameObj = FrameObj(self)
+        self.PropFrame = PropFrame(self)
+        self.Story = Story(self)
+        self.RespCombo = RespCombo(self)
+        self.LoadCases = LoadCases(self)
+        self.SelectObj = SelectObj(self)
+        self.GroupDef = GroupDef(self)
+        self.PointObj = PointObj(self)
+        self.Display = Display(self)
+        self.View = View(self)
+        self.DatabaseTables = DatabaseTables(self)
+        self.Analyze = Analyze(self)
+        self.Results = Results(self)
+        self.DesignConcrete = DesignConcrete(self)
+
+    def record_call(self, method_name):
+        """Contorizează un apel și aplică latența configurată"""
+        self.call_counts[method_name] += 1
+        delay = self.latency_per_method.get(method_name, self.latency)
+        if delay > 0:
+            time.sleep(delay)
+
+    @property
+    def total_calls(self):
+        return sum(self.call_counts.values())
+
+    def reset_counts(self):
+        self.call_counts.clear()
+
+    def select_frames(self, names):
+        """Simulează selecția făcută de utilizator în interfața ETABS"""
+        self.data.selected = list(names)
+
+    def GetModelFilename(self, IncludePath=True):
+        self.record_call("SapModel.GetModelFilename")
+        return self.data.filename
+
+    def GetModelIsLocked(self):
+        self.record_call("SapModel.GetModelIsLocked")
+        return self.data.locked
+
+    def SetModelIsLocked(self, Locked):
+        self.record_call("SapModel.SetModelIsLocked")
+        self.data.locked = bool(Locked)
+        return 0
+
+
+def _write_selection_json(path, frame_names, group_size=50):
+    """Scrie un fișier beam_selection_temp.json cu grinzile date, împărțite în grupuri"""
+    import json
+
+    groups = []
+    for number, start in enumerate(range(0, len(frame_names), group_size), 1):
+        groups.append({
+            "beams": frame_names[start:start + group_size],
+            "settings": {
+                "rezistente_type": "Normale",
+                "etaj": "Story1",
+                "selected_combinations_upper": ["ULS1"],
+                "selected_combinations_lower": ["SEISM EX+", "SEISM EX-"],
+                "button_states": {"DCL": False, "DCM": True, "DCH": False, "Secundare": False,
+                                  "Dir X": True, "Dir Y": False},
+            },
+            "group_number": number,
+        })
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"scenario_a": {"beam_groups": groups}, "scenario_b": {"beam_groups": []}}, f)
+
+
+def run_benchmark(frame_counts=(1000, 10000, 100000), selected=1000, latency=0.0002):
+    """Măsoară numărul de apeluri și timpul pipeline-urilor reale pe modele sintetice"""
+    import contextlib
+    import io
+    import os
+    import tempfile
+
+    from etabs_api.connection import set_sap_model
+    import etabs_api.operations as operations
+    from db.operations import create_database
+
+    def measure(label, model, func):
+        model.reset_counts()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        elapsed = time.perf_counter() - start
+        print(f"   {label:<28} {model.total_calls:>9} apeluri  {elapsed:>9.3f} s")
+
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        try:
+            for n_frames in frame_counts:
+                model = FakeSapModel(generate_model(n_frames), latency=latency)
+                set_sap_model(model)
+                operations.invalidate_caches()
+
+                beams = [name for name, frame in model.data.frames.items() if frame["label"].startswith("B")]
+                chosen = beams[:selected]
+                model.select_frames(chosen)
+                _write_selection_json("beam_selection_temp.json", chosen)
+
+                print(f"-- {n_frames} frame-uri, {len(chosen)} grinzi selectate, latență {latency * 1000:.2f} ms/apel")
+                measure("selecție live", model, operations.get_selected_frames_live)
+                measure("create_database", model, lambda: create_database(chosen))
+                measure("sumar grinzi (popup)", model, lambda: [
+                    (operations.get_label_and_story(name), operations.get_section_name(name),
+                     operations.get_section_material(name), operations.get_frame_length(name))
+                    for name in chosen
+                ])
+        finally:
+            os.chdir(original_dir)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark pipeline-uri pe model ETABS simulat")
+    parser.add_argument("--frames", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--selected", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=0.2)
+    args = parser.parse_args()
+
+    run_benchmark(args.frames, args.selected, args.latency_ms / 1000.0)
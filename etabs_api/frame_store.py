@@ -0,0 +1,304 @@
+"""Depozit compact pentru atribuirile tuturor frame-urilor (array NumPy structurat).
+
+Un singur rând de lungime fixă per frame, indexat după UniqueName, umplut în bloc din
+tabelele "Frame Assignments" și salvat în SQLite ca un singur BLOB.
+"""
+import json
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+
+from etabs_api.connection import get_sap_model
+from etabs_api.cache import ModelCache
+from etabs_api.tables import read_table_data, table_column
+
+MODIFIER_KEYS = ("Area", "As2", "As3", "Torsion", "I22", "I33", "Mass", "Weight")
+RELEASE_KEYS = ("Axial", "Shear2", "Shear3", "Torsion", "Moment22", "Moment33")
+
+# Tipul stației de ieșire (eOutputStationType ETABS)
+STATION_MAX_SPACING = 1
+STATION_MIN_NUMBER = 2
+
+FRAME_RECORD_DTYPE = np.dtype([
+    ("modifiers", np.float64, len(MODIFIER_KEYS)),
+    ("releases", np.uint16),            # biții 0-5 capătul I, biții 6-11 capătul J
+    ("offset_i", np.float64),
+    ("offset_j", np.float64),
+    ("rigid_zone", np.float64),
+    ("cardinal_point", np.int8),
+    ("station_type", np.int8),
+    ("station_value", np.float64),
+    ("local_angle", np.float64),
+    ("spring", np.int16),               # poziția în lista de texte (-1 = fără)
+    ("tension_limit", np.float64),
+    ("compression_limit", np.float64),
+    ("rebar_ratio", np.float64),
+    ("auto_mesh", np.int8),             # -1 = necunoscut
+])
+
+# Tabelele citite în bloc: cheia tabelului -> (câmpul cu UniqueName, {câmp ETABS: câmp din record})
+FRAME_STORE_TABLES = {
+    "Frame Assignments - Property Modifiers": ("UniqueName", {
+        "Area Modifier": ("modifiers", 0), "As2 Modifier": ("modifiers", 1), "As3 Modifier": ("modifiers", 2),
+        "Torsion Modifier": ("modifiers", 3), "I22 Modifier": ("modifiers", 4), "I33 Modifier": ("modifiers", 5),
+        "Mass Modifier": ("modifiers", 6), "Weight Modifier": ("modifiers", 7),
+    }),
+    "Frame Assignments - Releases and Partial Fixity": ("UniqueName", {
+        "PI": ("releases", 0), "V2I": ("releases", 1), "V3I": ("releases", 2),
+        "TI": ("releases", 3), "M2I": ("releases", 4), "M3I": ("releases", 5),
+        "PJ": ("releases", 6), "V2J": ("releases", 7), "V3J": ("releases", 8),
+        "TJ": ("releases", 9), "M2J": ("releases", 10), "M3J": ("releases", 11),
+    }),
+    "Frame Assignments - Insertion Point": ("UniqueName", {
+        "Cardinal Point": ("cardinal_point", None),
+    }),
+    "Frame Assignments - End Length Offsets": ("UniqueName", {
+        "Offset I": ("offset_i", None), "Offset J": ("offset_j", None), "Rigid Factor": ("rigid_zone", None),
+    }),
+    "Frame Assignments - Output Stations": ("UniqueName", {
+        "Station Option": ("station_type", None), "Min Stations": ("station_value", None),
+        "Max Spacing": ("station_value", None),
+    }),
+    "Frame Assignments - Local Axes": ("UniqueName", {
+        "Angle": ("local_angle", None),
+    }),
+    "Frame Assignments - Springs": ("UniqueName", {
+        "Spring Property": ("spring", None),
+    }),
+    "Frame Assignments - Tension Compression Limits": ("UniqueName", {
+        "Tension Limit": ("tension_limit", None), "Compression Limit": ("compression_limit", None),
+    }),
+    "Frame Assignments - Rebar Ratio": ("UniqueName", {
+        "Rebar Ratio": ("rebar_ratio", None),
+    }),
+    "Frame Assignments - Auto Mesh": ("UniqueName", {
+        "Auto Mesh": ("auto_mesh", None),
+    }),
+}
+
+
+def _empty_records(count):
+    """Rânduri cu valorile implicite ETABS (modificatori 1, fără eliberări) și NaN pentru necitit"""
+    records = np.zeros(count, dtype=FRAME_RECORD_DTYPE)
+    records["modifiers"] = 1.0
+    for field in ("offset_i", "offset_j", "rigid_zone", "station_value", "local_angle",
+                  "tension_limit", "compression_limit", "rebar_ratio"):
+        records[field] = np.nan
+    records["spring"] = -1
+    records["auto_mesh"] = -1
+    return records
+
+
+def _to_floats(values):
+    """Convertește o coloană text în float (NaN pentru valorile goale sau nenumerice)"""
+    text = np.asarray(values, dtype=str)
+    numbers = np.full(len(text), np.nan)
+    filled = text != ""
+    try:
+        numbers[filled] = text[filled].astype(float)
+    except ValueError:
+        for position in np.flatnonzero(filled):
+            try:
+                numbers[position] = float(text[position])
+            except ValueError:
+                pass
+    return numbers
+
+
+def _to_flags(values):
+    """Convertește o coloană text Yes/No în bool"""
+    return np.isin(np.char.lower(np.asarray(values, dtype=str)), ("yes", "true", "1"))
+
+
+class FrameStore:
+    """Atribuirile tuturor frame-urilor: acces O(1) după UniqueName, memorie fixă per frame"""
+
+    def __init__(self, names, records=None, strings=None):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.records = records if records is not None else _empty_records(len(self.names))
+        self.strings = list(strings or [])
+        self._string_index = {text: i for i, text in enumerate(self.strings)}
+        # Tabelele ETABS citite cu succes (câmpurile celorlalte au valorile implicite)
+        self.loaded_tables = set()
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __getitem__(self, name):
+        """Rândul (numpy.void) pentru un frame"""
+        return self.records[self.index[name]]
+
+    @property
+    def nbytes(self):
+        return self.records.nbytes
+
+    def column(self, field):
+        """Coloana unui câmp pentru toate frame-urile (view, fără copiere)"""
+        return self.records[field]
+
+    def _string_code(self, text):
+        if text in (None, "", "None"):
+            return -1
+        code = self._string_index.get(text)
+        if code is None:
+            code = len(self.strings)
+            self.strings.append(text)
+            self._string_index[text] = code
+        return code
+
+    def _string(self, code):
+        return self.strings[code] if code >= 0 else None
+
+    def set_column(self, positions, field, element, values):
+        """Scrie o coloană de valori text din tabelele ETABS pentru frame-urile de la pozițiile date"""
+        if field == "releases":
+            flags = _to_flags(values).astype(np.uint16)
+            self.records["releases"][positions] |= flags << np.uint16(element)
+        elif field == "spring":
+            self.records["spring"][positions] = [self._string_code(value) for value in values]
+        elif field == "station_type":
+            is_min = np.char.find(np.char.lower(np.asarray(values, dtype=str)), "min") >= 0
+            self.records["station_type"][positions] = np.where(is_min, STATION_MIN_NUMBER, STATION_MAX_SPACING)
+        elif field == "auto_mesh":
+            self.records["auto_mesh"][positions] = _to_flags(values)
+        else:
+            numbers = _to_floats(values)
+            found = ~np.isnan(numbers)
+            if field == "modifiers":
+                self.records["modifiers"][positions[found], element] = numbers[found]
+            else:
+                self.records[field][positions[found]] = numbers[found]
+
+    # Aceleași forme de date ca funcțiile per frame din etabs_api.operations
+    def prop_modifiers(self, name):
+        return dict(zip(MODIFIER_KEYS, (float(v) for v in self[name]["modifiers"])))
+
+    def end_releases(self, name):
+        bits = int(self[name]["releases"])
+        return {
+            "i": {key: bool(bits >> k & 1) for k, key in enumerate(RELEASE_KEYS)},
+            "j": {key: bool(bits >> (k + 6) & 1) for k, key in enumerate(RELEASE_KEYS)},
+        }
+
+    def end_length_offsets(self, name):
+        record = self[name]
+        return {"i": float(record["offset_i"]), "j": float(record["offset_j"]),
+                "RigidZoneFactor": float(record["rigid_zone"])}
+
+    def output_stations(self, name):
+        record = self[name]
+        return {"OutputStationsBy": int(record["station_type"]), "Number": float(record["station_value"])}
+
+    def springs(self, name):
+        return self._string(int(self[name]["spring"]))
+
+    def tc_limits(self, name):
+        record = self[name]
+        return {"Tension": float(record["tension_limit"]), "Compression": float(record["compression_limit"])}
+
+    def rebar_ratio(self, name):
+        return float(self[name]["rebar_ratio"])
+
+    def auto_mesh(self, name):
+        value = int(self[name]["auto_mesh"])
+        return None if value < 0 else bool(value)
+
+    def to_sqlite(self, conn, table="FrameStore"):
+        """Salvează depozitul ca un singur rând (BLOB cu array-ul structurat)"""
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                DType TEXT,
+                Names TEXT,
+                Strings TEXT,
+                Records BLOB,
+                SavedAt TEXT
+            )
+        ''')
+        conn.execute(
+            f"INSERT OR REPLACE INTO {table} (id, DType, Names, Strings, Records, SavedAt) VALUES (1, ?, ?, ?, ?, ?)",
+            (json.dumps(FRAME_RECORD_DTYPE.descr), json.dumps(self.names), json.dumps(self.strings),
+             sqlite3.Binary(self.records.tobytes()), datetime.now().isoformat()))
+
+    @classmethod
+    def from_sqlite(cls, conn, table="FrameStore"):
+        """Încarcă depozitul salvat cu to_sqlite (sau None dacă nu există)"""
+        try:
+            row = conn.execute(f"SELECT DType, Names, Strings, Records FROM {table} WHERE id = 1").fetchone()
+        except sqlite3.OperationalError:
+            return None
+        if row is None:
+            return None
+        dtype = np.dtype([tuple(field) for field in json.loads(row[0])])
+        if dtype != FRAME_RECORD_DTYPE:
+            print(f"⮽⮽ Structura salvată în {table} diferă de cea curentă - reîncărcați din ETABS")
+            return None
+        records = np.frombuffer(row[3], dtype=FRAME_RECORD_DTYPE).copy()
+        return cls(json.loads(row[1]), records, json.loads(row[2]))
+
+
+def load_frame_store(frame_names=None, group_name="All", tables=None):
+    """Umple un FrameStore din tabelele ETABS (un apel DatabaseTables per tabel).
+
+    tables restrânge citirea la o parte din FRAME_STORE_TABLES (aceeași formă).
+    """
+    if frame_names is None:
+        from etabs_api.operations import get_frame_names
+        frame_names = get_frame_names()
+    store = FrameStore(frame_names)
+    calls = 0
+
+    for table_key, (name_field, field_map) in (tables or FRAME_STORE_TABLES).items():
+        try:
+            # Doar câmpurile mapate în FrameStore, nu tot tabelul
+            fields, number_records, table_data = read_table_data(table_key, group_name, [name_field, *field_map])
+            calls += 1
+        except Exception as e:
+            print(f"⮽⮽ Tabelul '{table_key}' nu a putut fi citit: {e}")
+            continue
+        store.loaded_tables.add(table_key)
+        if name_field not in fields or number_records == 0:
+            continue
+
+        row_positions = np.array([store.index.get(name, -1) for name in table_column(fields, table_data, name_field)],
+                                 dtype=np.int64)
+        known = row_positions >= 0
+        for source, (field, element) in field_map.items():
+            if source not in fields:
+                continue
+            values = np.asarray(table_column(fields, table_data, source), dtype=str)
+            selected = known & (values != "")
+            if selected.any():
+                store.set_column(row_positions[selected], field, element, values[selected])
+
+    print(f"-- FrameStore: {len(store)} frame-uri, {store.nbytes / 1024:.0f} KB, {calls} apeluri DatabaseTables")
+    return store
+
+
+def _frame_count():
+    return get_sap_model().FrameObj.Count()
+
+
+# Depozitul se reîncarcă doar când numărul de frame-uri din model se schimbă
+_frame_store_cache = ModelCache(load_frame_store, _frame_count)
+
+
+def get_frame_store():
+    """Returnează FrameStore pentru tot modelul (din cache), sau None dacă extragerea eșuează"""
+    try:
+        return _frame_store_cache.get()
+    except Exception as e:
+        print(f"⮽⮽ Eroare la încărcarea FrameStore: {e}")
+        _frame_store_cache.invalidate()
+        return None
+
+
+def invalidate_frame_store():
+    """Forțează reîncărcarea depozitului la următorul acces (ex: după modificarea atribuirilor)"""
+    _frame_store_cache.invalidate()
+
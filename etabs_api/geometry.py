@@ -0,0 +1,110 @@
+"""Geometria frame-urilor calculată vectorizat (NumPy) din extrageri în bloc.
+
+Capetele tuturor frame-urilor vin dintr-un singur apel FrameObj.GetAllFrames, care returnează
+deja coordonatele punctelor I și J, deci punctele nu mai sunt citite separat.
+"""
+import numpy as np
+
+from etabs_api.connection import get_sap_model
+from etabs_api.cache import ModelCache
+
+# Intervalul (secunde) în care numărul de obiecte din model nu mai este reverificat
+GEOMETRY_CHECK_INTERVAL = 5.0
+
+
+class FrameGeometry:
+    """Lungimi, unghiuri în plan și puncte de mijloc pentru toate frame-urile, ca array-uri NumPy"""
+
+    def __init__(self, names, point_i, point_j):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.point_i = np.asarray(point_i, dtype=float).reshape(-1, 3)
+        self.point_j = np.asarray(point_j, dtype=float).reshape(-1, 3)
+
+        delta = self.point_j - self.point_i
+        self.lengths = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+        self.plan_lengths = np.hypot(delta[:, 0], delta[:, 1])
+        # Unghiul în plan față de axa X globală, în grade (0..180, direcția nu contează)
+        self.plan_angles = np.degrees(np.arctan2(delta[:, 1], delta[:, 0])) % 180.0
+        self.midpoints = (self.point_i + self.point_j) / 2.0
+        self.vertical = self.plan_lengths < 1e-6 * np.maximum(self.lengths, 1.0)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def indices(self, names):
+        """Pozițiile frame-urilor în array-uri (-1 pentru frame-urile necunoscute)"""
+        return np.array([self.index.get(name, -1) for name in names], dtype=np.int64)
+
+    def _take(self, values, names, default):
+        positions = self.indices(names)
+        result = np.full((len(positions),) + values.shape[1:], default, dtype=float)
+        found = positions >= 0
+        result[found] = values[positions[found]]
+        return result
+
+    def lengths_for(self, names):
+        return self._take(self.lengths, names, 0.0)
+
+    def plan_angles_for(self, names):
+        return self._take(self.plan_angles, names, np.nan)
+
+    def midpoints_for(self, names):
+        return self._take(self.midpoints, names, np.nan)
+
+    def length(self, name, default=0.0):
+        position = self.index.get(name)
+        return float(self.lengths[position]) if position is not None else default
+
+    def plan_angle(self, name, default=None):
+        position = self.index.get(name)
+        return float(self.plan_angles[position]) if position is not None else default
+
+    def midpoint(self, name, default=None):
+        position = self.index.get(name)
+        return tuple(float(v) for v in self.midpoints[position]) if position is not None else default
+
+
+def _read_frame_ends(sap_model):
+    """Toate frame-urile din model: (nume, array N x 3 capete I, array N x 3 capete J) dintr-un singur apel"""
+    result = sap_model.FrameObj.GetAllFrames()
+    if result[-1] != 0:
+        raise RuntimeError(f"FrameObj.GetAllFrames a returnat eroare: {result[-1]}")
+    point_i = np.column_stack([np.asarray(result[i], float) for i in (6, 7, 8)])
+    point_j = np.column_stack([np.asarray(result[i], float) for i in (9, 10, 11)])
+    return list(result[1]), point_i, point_j
+
+
+def _load_frame_geometry():
+    frame_names, points_i, points_j = _read_frame_ends(get_sap_model())
+    geometry = FrameGeometry(frame_names, points_i, points_j)
+    print(f"-- Geometrie calculată pentru {len(geometry)} frame-uri")
+    return geometry
+
+
+def _object_counts():
+    """Numărul de frame-uri și de puncte - semnătura geometriei"""
+    sap_model = get_sap_model()
+    return sap_model.FrameObj.Count(), sap_model.PointObj.Count()
+
+
+# Geometria se recalculează doar când numărul de frame-uri sau de puncte se schimbă
+_geometry_cache = ModelCache(_load_frame_geometry, _object_counts, GEOMETRY_CHECK_INTERVAL)
+
+
+def get_frame_geometry():
+    """Returnează geometria tuturor frame-urilor (din cache), sau None dacă extragerea eșuează"""
+    try:
+        return _geometry_cache.get()
+    except Exception as e:
+        print(f"⮽⮽ Eroare la extragerea geometriei frame-urilor: {e}")
+        _geometry_cache.invalidate()
+        return None
+
+
+def invalidate_frame_geometry():
+    """Forțează recalcularea geometriei (ex: după mutarea punctelor fără schimbarea numărului lor)"""
+    _geometry_cache.invalidate()
@@ -0,0 +1,265 @@
+"""Injectarea valorilor din baza de date în modelul ETABS, pe baza unui plan de diferențe.
+
+Starea dorită (secțiune, modificatori, rebar ratio) se citește din coloanele țintă ale tabelei
+Frames din frames.db, starea curentă din model prin apeluri bulk, iar planul conține doar valorile
+care diferă. create_database lasă coloanele țintă NULL (se păstrează valoarea din model); doar
+valorile completate ulterior în baza de date ajung în plan.
+La aplicare modelul este deblocat o singură dată și vederea este reîmprospătată o singură dată.
+"""
+import math
+
+from etabs_api.connection import get_sap_model
+from etabs_api.frame_store import FRAME_STORE_TABLES, MODIFIER_KEYS, load_frame_store
+
+# Tabelele din frames.db care descriu starea dorită: UniqueName + oricare din coloanele de mai jos.
+# Valorile NULL înseamnă "se păstrează valoarea din model"; pentru același frame, ultimul rând câștigă
+# (o grindă din ambele scenarii are câte un rând în Frames pentru fiecare).
+TARGET_TABLES = ("Frames",)
+
+SECTION_COLUMN = "Section"
+MODIFIER_COLUMNS = tuple(f"Mod{key}" for key in MODIFIER_KEYS)
+REBAR_RATIO_COLUMN = "RebarRatio"
+
+REBAR_RATIO_TABLE = "Frame Assignments - Rebar Ratio"
+REBAR_RATIO_FIELD = "Rebar Ratio"
+MODIFIERS_TABLE = "Frame Assignments - Property Modifiers"
+
+# Starea curentă se citește doar din tabelele care pot fi modificate prin injectare
+LIVE_STATE_TABLES = {key: FRAME_STORE_TABLES[key]
+                     for key in (MODIFIERS_TABLE, REBAR_RATIO_TABLE)}
+
+# Toleranța sub care două valori numerice sunt considerate egale
+TOLERANCE = 1e-9
+
+
+class FrameChange:
+    """O modificare planificată pentru un frame: câmpul, valoarea curentă și valoarea dorită"""
+
+    __slots__ = ("frame_name", "field", "current", "desired")
+
+    def __init__(self, frame_name, field, current, desired):
+        self.frame_name = frame_name
+        self.field = field
+        self.current = current
+        self.desired = desired
+
+    def __repr__(self):
+        return f"{self.frame_name}.{self.field}: {self.current} -> {self.desired}"
+
+
+class InjectionPlan:
+    """Lista minimă de modificări, grupată pe tipul apelului ETABS care le aplică"""
+
+    def __init__(self):
+        self.sections = []      # FrameChange cu desired = numele secțiunii
+        self.modifiers = []     # FrameChange cu desired = lista celor 8 modificatori
+        self.rebar_ratios = []  # FrameChange cu desired = float
+        self.missing = []       # frame-uri din baza de date care nu există în model
+
+    def __len__(self):
+        return len(self.sections) + len(self.modifiers) + len(self.rebar_ratios)
+
+    def changes(self):
+        return self.sections + self.modifiers + self.rebar_ratios
+
+    def frame_names(self):
+        return sorted({change.frame_name for change in self.changes()})
+
+    def summary(self):
+        lines = [f"-- Plan injectare: {len(self)} modificări pe {len(self.frame_names())} frame-uri",
+                 f"   secțiuni: {len(self.sections)}, modificatori: {len(self.modifiers)}, "
+                 f"rebar ratio: {len(self.rebar_ratios)}"]
+        if self.missing:
+            lines.append(f"⮽⮽ {len(self.missing)} frame-uri din baza de date nu există în model")
+        return "\n".join(lines)
+
+    def report(self, limit=50):
+        """Textul diferențelor pentru dry run (primele limit modificări)"""
+        changes = self.changes()
+        lines = [self.summary()]
+        lines.extend(f"   {change!r}" for change in changes[:limit])
+        if len(changes) > limit:
+            lines.append(f"   ... încă {len(changes) - limit} modificări")
+        return "\n".join(lines)
+
+
+def _table_columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def load_desired_state(db_path="frames.db", tables=TARGET_TABLES):
+    """Citește starea dorită: {frame: {"Section": ..., "Modifiers": {index: valoare}, "RebarRatio": ...}}"""
+    from db.session import session
+
+    desired = {}
+    with session(db_path, readonly=True) as conn:
+        for table in tables:
+            columns = _table_columns(conn, table)
+            if "UniqueName" not in columns:
+                continue
+            wanted = [column for column in (SECTION_COLUMN, *MODIFIER_COLUMNS, REBAR_RATIO_COLUMN)
+                      if column in columns]
+            if not wanted:
+                continue
+            query = f"SELECT UniqueName, {', '.join(wanted)} FROM {table}"
+            for name, *values in conn.execute(query):
+                state = desired.setdefault(name, {"Modifiers": {}})
+                for column, value in zip(wanted, values):
+                    if value is None:
+                        continue
+                    if column in MODIFIER_COLUMNS:
+                        state["Modifiers"][MODIFIER_COLUMNS.index(column)] = float(value)
+                    elif column == REBAR_RATIO_COLUMN:
+                        state["RebarRatio"] = float(value)
+                    else:
+                        state["Section"] = str(value)
+    return desired
+
+
+def _live_sections(sap_model):
+    """Secțiunea curentă a tuturor frame-urilor dintr-un singur apel GetAllFrames"""
+    result = sap_model.FrameObj.GetAllFrames()
+    if result[-1] != 0:
+        raise RuntimeError(f"FrameObj.GetAllFrames a returnat eroare: {result[-1]}")
+    return dict(zip(result[1], result[2]))
+
+
+def plan_injection(db_path="frames.db", tables=TARGET_TABLES):
+    """Compară starea dorită din baza de date cu modelul și construiește planul minim de modificări"""
+    desired = load_desired_state(db_path, tables)
+    plan = InjectionPlan()
+    if not desired:
+        print("-- Nu există valori de injectat în baza de date")
+        return plan
+
+    sap_model = get_sap_model()
+    sections = _live_sections(sap_model)
+    names = [name for name in desired if name in sections]
+    plan.missing = [name for name in desired if name not in sections]
+
+    needs_store = any(desired[name]["Modifiers"] or "RebarRatio" in desired[name] for name in names)
+    store = load_frame_store(names, tables=LIVE_STATE_TABLES) if needs_store else None
+
+    for name in names:
+        state = desired[name]
+        section = state.get("Section")
+        if section is not None and section != sections[name]:
+            plan.sections.append(FrameChange(name, SECTION_COLUMN, sections[name], section))
+
+        if state["Modifiers"]:
+            current = [float(value) for value in store[name]["modifiers"]]
+            target = list(current)
+            for index, value in state["Modifiers"].items():
+                target[index] = value
+            if any(abs(a - b) > TOLERANCE for a, b in zip(current, target)):
+                plan.modifiers.append(FrameChange(name, "Modifiers", current, target))
+
+        rebar_ratio = state.get("RebarRatio")
+        if rebar_ratio is not None:
+            # NaN = valoarea curentă nu a putut fi citită; se planifică modificarea, nu se presupune egalitate
+            current = store.rebar_ratio(name)
+            if math.isnan(current) or abs(current - rebar_ratio) > TOLERANCE:
+                plan.rebar_ratios.append(FrameChange(name, REBAR_RATIO_COLUMN, current, rebar_ratio))
+
+    return plan
+
+
+def _apply_rebar_ratios(sap_model, changes):
+    """Rebar ratio nu are setter în FrameObj: se editează tabelul de atribuiri (3 apeluri în total).
+
+    Se modifică doar rândurile existente în tabel; returnează (numărul rândurilor aplicate,
+    modificările frame-urilor care nu au rând în tabel și deci nu au ajuns în ETABS).
+    """
+    result = sap_model.DatabaseTables.GetTableForEditingArray(REBAR_RATIO_TABLE, "All")
+    if result[-1] != 0:
+        raise RuntimeError(f"GetTableForEditingArray({REBAR_RATIO_TABLE}) a returnat eroare: {result[-1]}")
+    table_version, fields, number_records, table_data = result[0], list(result[1]), result[2], list(result[3])
+    name_position, value_position = fields.index("UniqueName"), fields.index(REBAR_RATIO_FIELD)
+
+    desired = {change.frame_name: change.desired for change in changes}
+    field_count = len(fields)
+    rewritten = set()
+    for i in range(number_records):
+        name = table_data[i * field_count + name_position]
+        if name in desired:
+            table_data[i * field_count + value_position] = f"{desired[name]:g}"
+            rewritten.add(name)
+    missing = [change for change in changes if change.frame_name not in rewritten]
+    if not rewritten:
+        return 0, missing
+
+    ret = sap_model.DatabaseTables.SetTableForEditingArray(REBAR_RATIO_TABLE, table_version, fields,
+                                                          number_records, table_data)
+    if ret[-1] != 0:
+        raise RuntimeError(f"SetTableForEditingArray({REBAR_RATIO_TABLE}) a returnat eroare: {ret[-1]}")
+    result = sap_model.DatabaseTables.ApplyEditedTables(True)
+    if result[-1] != 0 or result[0] > 0:
+        raise RuntimeError(f"ApplyEditedTables a eșuat: {result[4]}")
+    return max(len(rewritten) - result[1], 0), missing
+
+
+def apply_plan(plan):
+    """Aplică planul în ETABS: deblocare o singură dată, apoi apelurile de setare, apoi un singur refresh"""
+    if not len(plan):
+        print("-- Modelul este deja la zi, nimic de aplicat")
+        return 0
+
+    sap_model = get_sap_model()
+    if sap_model.GetModelIsLocked():
+        # Deblocarea șterge rezultatele analizei; se face o singură dată pentru tot planul
+        ret = sap_model.SetModelIsLocked(False)
+        if ret != 0:
+            raise RuntimeError(f"SetModelIsLocked(False) a returnat eroare: {ret}")
+        print("-- Model deblocat pentru injectare (rezultatele analizei trebuie regenerate)")
+
+    applied = 0
+    failed = []
+    try:
+        for change in plan.sections:
+            if sap_model.FrameObj.SetSection(change.frame_name, change.desired, 0) == 0:
+                applied += 1
+            else:
+                failed.append(change)
+        for change in plan.modifiers:
+            if sap_model.FrameObj.SetModifiers(change.frame_name, change.desired, 0) == 0:
+                applied += 1
+            else:
+                failed.append(change)
+        if plan.rebar_ratios:
+            try:
+                count, missing = _apply_rebar_ratios(sap_model, plan.rebar_ratios)
+                applied += count
+                if missing:
+                    print(f"⮽⮽ {len(missing)} frame-uri nu au rând în {REBAR_RATIO_TABLE}, rebar ratio neaplicat")
+                    failed.extend(missing)
+            except Exception as e:
+                print(f"⮽⮽ Rebar ratio nu a putut fi aplicat: {e}")
+                failed.extend(plan.rebar_ratios)
+    finally:
+        # Un singur refresh la final, indiferent de numărul de modificări
+        try:
+            sap_model.View.RefreshView(0, False)
+        except Exception as e:
+            print(f"⮽⮽ Eroare la reîmprospătarea vederii: {e}")
+
+        from etabs_api.operations import invalidate_caches
+        invalidate_caches()
+
+    if failed:
+        print(f"⮽⮽ {len(failed)} modificări nu au putut fi aplicate, ex: {failed[:5]}")
+    print(f"✓✓ Injectare finalizată: {applied} / {len(plan)} modificări aplicate")
+    return applied
+
+
+def inject_to_etabs(db_path="frames.db", dry_run=True, tables=TARGET_TABLES):
+    """Construiește planul și îl aplică; cu dry_run=True doar afișează diferențele.
+
+    Returnează planul (InjectionPlan), pentru ca interfața să poată afișa / confirma diferențele.
+    """
+    plan = plan_injection(db_path, tables)
+    if dry_run:
+        print(plan.report())
+        return plan
+    print(plan.summary())
+    apply_plan(plan)
+    return plan
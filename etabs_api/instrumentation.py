@@ -0,0 +1,264 @@
+"""Instrumentare pentru apelurile API ETABS.
+
+Activare prin variabile de mediu:
+    ETABS_INSTRUMENT=1             - contorizează apelurile SapModel per metodă
+    ETABS_INSTRUMENT_LOG=calea.jsonl - adaugă sumarul fiecărei etape într-un fișier JSON lines
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Limitele superioare (ms) ale intervalelor histogramei de latență
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, float("inf"))
+
+# Prefixele metodelor care returnează direct codul de retur (fără parametri de ieșire)
+_RETURN_CODE_PREFIXES = ("Set", "Add", "Delete", "Change", "Refresh")
+
+# Tipuri returnate ca valori simple (nu sunt sub-interfețe SapModel)
+_PLAIN_TYPES = (str, int, float, bool, bytes, list, tuple, dict, type(None))
+
+
+def instrumentation_enabled():
+    """Verifică dacă instrumentarea este activată prin ETABS_INSTRUMENT"""
+    return os.environ.get("ETABS_INSTRUMENT", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _bucket_label(limit):
+    return f"<={limit:g}ms" if limit != float("inf") else f">{LATENCY_BUCKETS_MS[-2]:g}ms"
+
+
+def return_code(method_name, result):
+    """Extrage codul de retur ETABS dintr-un rezultat comtypes (None dacă nu se poate determina)"""
+    if isinstance(result, (list, tuple)) and result and isinstance(result[-1], int) \
+            and not isinstance(result[-1], bool):
+        return result[-1]
+    if isinstance(result, int) and not isinstance(result, bool) and method_name.startswith(_RETURN_CODE_PREFIXES):
+        return result
+    return None
+
+
+class MethodStats:
+    """Statistici pentru o singură metodă API: număr de apeluri, timp, histogramă, coduri de eroare"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * len(LATENCY_BUCKETS_MS)
+        self.errors = {}
+
+    def record(self, seconds, error=None):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        milliseconds = seconds * 1000.0
+        for index, limit in enumerate(LATENCY_BUCKETS_MS):
+            if milliseconds <= limit:
+                self.histogram[index] += 1
+                break
+        if error is not None:
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    def copy(self):
+        stats = MethodStats()
+        stats.count = self.count
+        stats.total = self.total
+        stats.max = self.max
+        stats.histogram = list(self.histogram)
+        stats.errors = dict(self.errors)
+        return stats
+
+    def minus(self, earlier):
+        """Diferența față de o copie anterioară (apelurile făcute între timp)"""
+        stats = self.copy()
+        if earlier is not None:
+            stats.count -= earlier.count
+            stats.total -= earlier.total
+            stats.histogram = [now - before for now, before in zip(self.histogram, earlier.histogram)]
+            stats.errors = {code: n - earlier.errors.get(code, 0) for code, n in self.errors.items()
+                            if n - earlier.errors.get(code, 0) > 0}
+        return stats
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000.0, 3),
+            "mean_ms": round(self.total * 1000.0 / self.count, 4) if self.count else 0.0,
+            "max_ms": round(self.max * 1000.0, 3),
+            "histogram": {_bucket_label(limit): n for limit, n in zip(LATENCY_BUCKETS_MS, self.histogram) if n},
+            "errors": {str(code): n for code, n in self.errors.items()},
+        }
+
+
+class CallStatistics:
+    """Registrul statisticilor pe metode (sigur pentru apeluri din mai multe fire)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._methods = {}
+
+    def record(self, method_name, seconds, error=None):
+        with self._lock:
+            stats = self._methods.get(method_name)
+            if stats is None:
+                stats = self._methods[method_name] = MethodStats()
+            stats.record(seconds, error)
+
+    def snapshot(self):
+        with self._lock:
+            return {name: stats.copy() for name, stats in self._methods.items()}
+
+    def since(self, snapshot):
+        """Statisticile apelurilor făcute după snapshot"""
+        current = self.snapshot()
+        delta = {}
+        for name, stats in current.items():
+            diff = stats.minus(snapshot.get(name))
+            if diff.count:
+                delta[name] = diff
+        return delta
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+
+
+# Statisticile comune ale procesului
+call_statistics = CallStatistics()
+
+
+class InstrumentedProxy:
+    """Proxy care măsoară fiecare apel către SapModel și sub-interfețele lui (FrameObj, PropFrame...)"""
+
+    def __init__(self, target, path="SapModel", statistics=None):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_path", path)
+        object.__setattr__(self, "_statistics", statistics or call_statistics)
+        object.__setattr__(self, "_children", {})
+
+    def __getattr__(self, name):
+        children = object.__getattribute__(self, "_children")
+        if name in children:
+            return children[name]
+
+        target = object.__getattribute__(self, "_target")
+        path = object.__getattribute__(self, "_path")
+        statistics = object.__getattribute__(self, "_statistics")
+        value = getattr(target, name)
+
+        if isinstance(value, _PLAIN_TYPES):
+            return value
+        if callable(value):
+            return _timed_method(value, f"{path}.{name}", statistics)
+
+        # Sub-interfață (ex: SapModel.FrameObj) - se instrumentează recursiv
+        child_path = name if path == "SapModel" else f"{path}.{name}"
+        child = InstrumentedProxy(value, child_path, statistics)
+        children[name] = child
+        return child
+
+    def __setattr__(self, name, value):
+        setattr(object.__getattribute__(self, "_target"), name, value)
+
+    def __repr__(self):
+        return f"<InstrumentedProxy {object.__getattribute__(self, '_path')}>"
+
+
+def _timed_method(method, method_name, statistics):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        except Exception as e:
+            statistics.record(method_name, time.perf_counter() - start, f"exception:{type(e).__name__}")
+            raise
+        code = return_code(method_name.rsplit(".", 1)[-1], result)
+        statistics.record(method_name, time.perf_counter() - start, code if code not in (None, 0) else None)
+        return result
+    return wrapper
+
+
+def instrument(sap_model):
+    """Învelește SapModel în proxy-ul de instrumentare"""
+    if isinstance(sap_model, InstrumentedProxy):
+        return sap_model
+    return InstrumentedProxy(sap_model)
+
+
+def instrument_if_enabled(sap_model):
+    """Învelește SapModel doar dacă ETABS_INSTRUMENT este activ"""
+    if sap_model is not None and instrumentation_enabled():
+        print("-- Instrumentare apeluri ETABS activă")
+        return instrument(sap_model)
+    return sap_model
+
+
+def format_summary(title, method_stats, elapsed=None):
+    """Formatează un tabel cu statisticile per metodă, sortat după timpul total"""
+    total_calls = sum(stats.count for stats in method_stats.values())
+    total_time = sum(stats.total for stats in method_stats.values())
+    header = f"-- Apeluri ETABS [{title}]: {total_calls} apeluri, {total_time * 1000.0:.1f} ms în API"
+    if elapsed is not None:
+        header += f" din {elapsed:.3f} s"
+    lines = [header]
+    ordered = sorted(method_stats.items(), key=lambda item: item[1].total, reverse=True)
+    for name, stats in ordered:
+        summary = stats.to_dict()
+        line = (f"   {name:<48} {stats.count:>8}  total {summary['total_ms']:>10.1f} ms  "
+                f"medie {summary['mean_ms']:>8.3f} ms  max {summary['max_ms']:>8.1f} ms")
+        if stats.errors:
+            line += f"  erori {summary['errors']}"
+        lines.append(line)
+        histogram = "  ".join(f"{label}:{n}" for label, n in summary["histogram"].items())
+        lines.append(f"      {histogram}")
+    return "\n".join(lines)
+
+
+def _append_log(title, method_stats, elapsed):
+    log_path = os.environ.get("ETABS_INSTRUMENT_LOG")
+    if not log_path:
+        return
+    entry = {
+        "stage": title,
+        "finished_at": datetime.now().isoformat(),
+        "elapsed_s": round(elapsed, 4),
+        "calls": {name: stats.to_dict() for name, stats in method_stats.items()},
+    }
+    try:
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"⮽⮽ Nu s-a putut scrie jurnalul de instrumentare {log_path}: {e}")
+
+
+@contextmanager
+def stage(title):
+    """Etapă de pipeline: la final afișează (și jurnalizează) apelurile ETABS făcute în etapă"""
+    if not instrumentation_enabled():
+        yield
+        return
+    snapshot = call_statistics.snapshot()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        method_stats = call_statistics.since(snapshot)
+        print(format_summary(title, method_stats, elapsed))
+        _append_log(title, method_stats, elapsed)
+
+
+def instrumented_stage(title):
+    """Decorator: rulează funcția ca etapă instrumentată"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(title):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,106 @@
+"""Indexul frame -> (label, etaj) al modelului, construit din două apeluri bulk.
+
+FrameObj.GetLabelNameList returnează numele, label-ul și etajul tuturor frame-urilor,
+iar Story.GetStories cotele etajelor; căutările ulterioare nu mai ating ETABS.
+"""
+from bisect import bisect_left
+
+from etabs_api.connection import get_sap_model
+from etabs_api.cache import ModelCache
+
+# Intervalul (secunde) în care numărul de frame-uri din model nu mai este reverificat
+INDEX_CHECK_INTERVAL = 5.0
+
+# Toleranța pe cotă la căutarea etajului (m)
+ELEVATION_TOLERANCE = 1e-3
+
+
+class ModelIndex:
+    """Label și etaj pentru fiecare frame (O(1) după UniqueName) și etajele ordonate după cotă"""
+
+    def __init__(self, names, labels, stories, story_names=(), story_elevations=()):
+        self.labels = dict(zip(names, labels))
+        self.stories = dict(zip(names, stories))
+        levels = sorted(zip(story_elevations, story_names))
+        self.story_elevations = [elevation for elevation, _ in levels]
+        self.story_names = [name for _, name in levels]
+        self._story_frames = None
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __contains__(self, name):
+        return name in self.labels
+
+    def label_and_story(self, name):
+        """[label, etaj] pentru un frame, sau None dacă frame-ul nu este în index"""
+        label = self.labels.get(name)
+        if label is None:
+            return None
+        return [label, self.stories[name]]
+
+    def story_elevation(self, story):
+        """Cota etajului, sau None dacă etajul nu există"""
+        try:
+            return self.story_elevations[self.story_names.index(story)]
+        except ValueError:
+            return None
+
+    def story_at_elevation(self, elevation, tolerance=ELEVATION_TOLERANCE):
+        """Etajul căruia îi aparține cota dată: primul etaj cu cota >= elevation (ca în ETABS)"""
+        position = bisect_left(self.story_elevations, elevation - tolerance)
+        if position == len(self.story_elevations):
+            return None
+        return self.story_names[position]
+
+    def frames_on_story(self, story):
+        """Frame-urile de pe un etaj (indexul invers se construiește la prima cerere)"""
+        if self._story_frames is None:
+            self._story_frames = {}
+            for name, frame_story in self.stories.items():
+                self._story_frames.setdefault(frame_story, []).append(name)
+        return list(self._story_frames.get(story, []))
+
+
+def _load_model_index():
+    """Construiește indexul din GetLabelNameList și GetStories (două apeluri COM)"""
+    sap_model = get_sap_model()
+    result = sap_model.FrameObj.GetLabelNameList()
+    if result[-1] != 0:
+        raise RuntimeError(f"FrameObj.GetLabelNameList a returnat eroare: {result[-1]}")
+    names, labels, stories = result[1], result[2], result[3]
+
+    story_names, story_elevations = [], []
+    try:
+        story_result = sap_model.Story.GetStories()
+        if story_result[-1] == 0:
+            story_names, story_elevations = list(story_result[1]), list(story_result[2])
+    except Exception as e:
+        print(f"⮽⮽ Cotele etajelor nu au putut fi citite: {e}")
+
+    index = ModelIndex(names, labels, stories, story_names, story_elevations)
+    print(f"-- Index model: {len(index)} frame-uri, {len(index.story_names)} etaje")
+    return index
+
+
+def _frame_count():
+    return get_sap_model().FrameObj.Count()
+
+
+# Indexul se reconstruiește doar când numărul de frame-uri din model se schimbă
+_index_cache = ModelCache(_load_model_index, _frame_count, INDEX_CHECK_INTERVAL)
+
+
+def get_model_index():
+    """Returnează indexul modelului (din cache), sau None dacă extragerea eșuează"""
+    try:
+        return _index_cache.get()
+    except Exception as e:
+        print(f"⮽⮽ Eroare la construirea indexului modelului: {e}")
+        _index_cache.invalidate()
+        return None
+
+
+def invalidate_model_index():
+    """Forțează reconstruirea indexului (ex: după redenumirea frame-urilor)"""
+    _index_cache.invalidate()
@@ -1,42 +1,64 @@
 # Importă funcția de conexiune
-from etabs_api.connection import get_sap_model
-# Get sap_model at module level for all functions to use
-sap_model = get_sap_model()
+from etabs_api.connection import get_sap_model, lazy_sap_model
+from etabs_api.cache import ModelCache
+from etabs_api.sections import get_section_info
+from etabs_api.model_index import get_model_index, invalidate_model_index
+from etabs_api.combos import get_combo_catalogue, invalidate_combo_catalogue
+# Proxy la nivel de modul - conexiunea la ETABS se face abia la primul apel real
+sap_model = lazy_sap_model
+
+# Tipul obiectului returnat de SelectObj.GetSelected pentru frame-uri (eObjType)
+FRAME_OBJECT_TYPE = 2
+
+# Grupul ETABS temporar în care sunt puse grinzile confirmate (ascunse)
+HIDDEN_GROUP_NAME = "BEAM_DESIGN_HIDDEN"
+
+_hidden_group_created = False
+
+
+def _ensure_hidden_group(sap_model):
+    """Creează (o singură dată) grupul temporar pentru frame-urile ascunse"""
+    global _hidden_group_created
+    if not _hidden_group_created:
+        ret = sap_model.GroupDef.SetGroup(HIDDEN_GROUP_NAME)
+        if ret != 0:
+            raise RuntimeError(f"GroupDef.SetGroup a returnat eroare: {ret}")
+        _hidden_group_created = True
+
+
+def _assign_to_hidden_group(sap_model, frame_list):
+    """Adaugă frame-urile în grupul temporar (o singură editare a tabelului de atribuiri în grupuri)"""
+    from etabs_api.results import assign_frames_to_group
+
+    failed = assign_frames_to_group(sap_model, HIDDEN_GROUP_NAME, frame_list, replace=False)
+    if failed:
+        print(f"Avertisment:⮽⮽ {failed} frame-uri nu au putut fi adăugate în grupul {HIDDEN_GROUP_NAME}")
+    return len(frame_list) - failed
+
 
 def hide_specific_frames(frame_list):
-    """Ascunde frame-urile specificate folosind funcția Make Objects Invisible din ETABS"""
+    """Ascunde frame-urile specificate: le adaugă în grupul temporar și ascunde grupul"""
     sap_model = get_sap_model()
     if not frame_list:
         print("-- Nu sunt frame-uri de ascuns")
         return True
 
-    print(f"-- Încerc să ascund {len(frame_list)} frame-uri: {frame_list}")
+    print(f"-- Încerc să ascund {len(frame_list)} frame-uri prin grupul {HIDDEN_GROUP_NAME}")
 
     try:
-        # Mai întâi, șterge orice selecție existentă
-        sap_model.SelectObj.ClearSelection()
+        _ensure_hidden_group(sap_model)
+        assigned_count = _assign_to_hidden_group(sap_model, frame_list)
+        print(f"-- Adăugate {assigned_count} frame-uri în grupul {HIDDEN_GROUP_NAME}")
 
-        # Selectează toate frame-urile pe care vrem să le ascundem
-        selected_count = 0
-        for frame_name in frame_list:
-            try:
-                ret = sap_model.FrameObj.SetSelected(frame_name, True)
-                if ret == 0:
-                    selected_count += 1
-                else:
-                    print(f"Avertisment:⮽⮽ Nu sa putut selecta frame-ul {frame_name}, eroare: {ret}")
-            except Exception as e:
-                print(f"⮽⮽ Eroare la selectarea frame-ului {frame_name}: {e}")
-
-        print(f"-- Selectat {selected_count} frame-uri pentru ascundere")
-
-        if selected_count > 0:
-            # Metoda 1: Încearcă să folosească interfața Display pentru a ascunde obiecte
+        if assigned_count > 0:
+            # Selectează tot grupul printr-un singur apel și îl ascunde
+            sap_model.SelectObj.ClearSelection()
+            sap_model.SelectObj.Group(HIDDEN_GROUP_NAME)
             try:
-                # Obține toate obiectele selectate și le ascunde folosind opțiuni de display
-                ret = sap_model.Display.SetObjectSelected(False)  # Deselectează toate
+                ret = sap_model.Display.SetObjectSelected(False)
                 if ret == 0:
-                    print(f"-- Ascuns cu succes {selected_count} frame-uri")
+                    print(f"-- Ascuns cu succes grupul {HIDDEN_GROUP_NAME}")
+                    sap_model.SelectObj.ClearSelection()
                     return True
                 else:
                     print(f"⮽⮽ Display.SetObjectSelected a returnat eroare: {ret}")
@@ -45,7 +67,7 @@ def hide_specific_frames(frame_list):
 
         # Șterge selecția indiferent de rezultat
         sap_model.SelectObj.ClearSelection()
-        return selected_count > 0
+        return assigned_count > 0
 
     except Exception as e:
         print(f"⮽⮽ Eroare în hide_specific_frames: {e}")
@@ -58,10 +80,11 @@ def hide_specific_frames(frame_list):
 
 
 def show_all_frames():
-    """Arată toate frame-urile din model"""
+    """Arată toate frame-urile ascunse (grupul temporar) din model"""
     sap_model = get_sap_model()
     try:
-        # Metoda 1: Încearcă să arate toate obiectele folosind interfața Display
+        if _hidden_group_created:
+            sap_model.SelectObj.Group(HIDDEN_GROUP_NAME)
         ret = sap_model.Display.SetObjectSelected(True)  # Selectează toate pentru a le face vizibile
         if ret == 0:
             print("-- Toate frame-urile ar trebui să fie vizibile acum")
@@ -76,6 +99,25 @@ def show_all_frames():
         return False
 
 
+def cleanup_hidden_frames():
+    """Face vizibile frame-urile ascunse și șterge grupul temporar din model"""
+    global _hidden_group_created
+    if not _hidden_group_created:
+        return True
+    show_all_frames()
+    try:
+        ret = get_sap_model().GroupDef.Delete(HIDDEN_GROUP_NAME)
+        if ret != 0:
+            print(f"⮽⮽ GroupDef.Delete a returnat eroare: {ret}")
+            return False
+        _hidden_group_created = False
+        print(f"-- Grupul temporar {HIDDEN_GROUP_NAME} a fost șters")
+        return True
+    except Exception as e:
+        print(f"⮽⮽ Eroare la ștergerea grupului temporar: {e}")
+        return False
+
+
 def get_story_names():
     """Returnează numele nivelurilor într-o listă"""
     sap_model = get_sap_model()
@@ -88,7 +130,10 @@ def get_story_names():
 
 
 def get_comb_names():
-    """Returnează numele tuturor combinațiilor într-o listă"""
+    """Returnează numele tuturor combinațiilor într-o listă (din catalog: un singur GetNameList, fără definiții)"""
+    catalogue = get_combo_catalogue()
+    if catalogue is not None:
+        return list(catalogue.names)
     sap_model = get_sap_model()
     try:
         number_names = 0
@@ -99,13 +144,67 @@ def get_comb_names():
         return []
 
 
+def _load_frame_names():
+    """Citește lista completă de frame-uri din ETABS"""
+    return list(get_sap_model().FrameObj.GetNameList()[1])
+
+
+def _frame_count():
+    """Numărul de frame-uri din model - semnătură ieftină pentru cache"""
+    return get_sap_model().FrameObj.Count()
+
+
+# Lista de frame-uri se reîncarcă doar când numărul de obiecte din model se schimbă
+_frame_names_cache = ModelCache(_load_frame_names, _frame_count)
+
+
+def get_frame_names():
+    """Returnează numele tuturor frame-urilor din model (din cache)"""
+    try:
+        return list(_frame_names_cache.get())
+    except Exception as e:
+        print(f"⮽⮽ Eroare la obținerea listei de frame-uri: {e}")
+        _frame_names_cache.invalidate()
+        return []
+
+
+def invalidate_caches():
+    """Golește cache-urile de model (ex: după schimbarea modelului deschis)"""
+    from etabs_api.sections import invalidate_section_catalog
+    from etabs_api.geometry import invalidate_frame_geometry
+    from etabs_api.frame_store import invalidate_frame_store
+    _frame_names_cache.invalidate()
+    invalidate_model_index()
+    invalidate_combo_catalogue()
+    invalidate_section_catalog()
+    invalidate_frame_geometry()
+    invalidate_frame_store()
+
+
 def get_selected_frames_live():
-    """Returnează obiectele de tip frame (unique name) care sunt selectate în model în mod live"""
+    """Returnează obiectele de tip frame (unique name) care sunt selectate în model în mod live.
+
+    Folosește un singur apel SelectObj.GetSelected pentru întreaga selecție; dacă apelul
+    eșuează, revine la verificarea fiecărui frame din lista din cache.
+    """
+    sap_model = get_sap_model()
+    try:
+        result = sap_model.SelectObj.GetSelected()
+        object_types, object_names, ret = result[1], result[2], result[-1]
+        if ret != 0:
+            raise RuntimeError(f"SelectObj.GetSelected a returnat eroare: {ret}")
+        return [name for obj_type, name in zip(object_types, object_names) if obj_type == FRAME_OBJECT_TYPE]
+    except Exception as e:
+        print(f"⮽⮽ Selecție bulk indisponibilă, se verifică fiecare frame: {e}")
+        return get_selected_frames_by_scan()
+
+
+def get_selected_frames_by_scan():
+    """Returnează frame-urile selectate verificând fiecare frame în parte (metoda lentă)"""
     sap_model = get_sap_model()
     try:
-        name_list = list(sap_model.FrameObj.GetNameList()[1])
         selected_list = []
-        for frame_name in name_list:
+        for frame_name in get_frame_names():
             if sap_model.FrameObj.GetSelected(frame_name)[0] == True:
                 selected_list.append(frame_name)
         return selected_list
@@ -137,7 +236,16 @@ def get_frame_guid(frame_name):
 
 
 def get_label_and_story(name):
-    """Returnează label și story de la inputul (unique name) ca o listă de stringuri"""
+    """Returnează label și story de la inputul (unique name) ca o listă de stringuri.
+
+    Valorile vin din indexul modelului (un singur GetLabelNameList pentru tot modelul);
+    frame-urile care lipsesc din index sunt cerute individual din ETABS.
+    """
+    index = get_model_index()
+    if index is not None:
+        label_and_story = index.label_and_story(name)
+        if label_and_story is not None:
+            return label_and_story
     try:
         result = sap_model.FrameObj.GetLabelFromName(name)
         if result and len(result) >= 2:
@@ -172,7 +280,21 @@ def get_section_name(frame_name):
         print(f"⮽⮽ Eroare la obținerea numelui secțiunii pentru {frame_name}: {e}")
         return "N/A"
 
+def _stored_frame(name, table_key):
+    """FrameStore-ul modelului dacă frame-ul și tabelul din care vine atributul au fost citite în bloc, altfel None"""
+    from etabs_api.frame_store import get_frame_store
+    store = get_frame_store()
+    if store is None or name not in store or table_key not in store.loaded_tables:
+        return None
+    return store
+
+
+# Atributele de mai jos se citesc din FrameStore (tot modelul, extras o singură dată în bloc);
+# apelul per frame rămâne doar pentru frame-urile sau tabelele care lipsesc din depozit
 def get_prop_modifiers(name):
+    store = _stored_frame(name, "Frame Assignments - Property Modifiers")
+    if store is not None:
+        return store.prop_modifiers(name)
     SapModel = get_sap_model()
     ret, modifiers = SapModel.FrameObj.GetModifiers(name)
     if ret != 0:
@@ -181,6 +303,9 @@ def get_prop_modifiers(name):
     return dict(zip(keys, modifiers))
 
 def get_end_releases(name):
+    store = _stored_frame(name, "Frame Assignments - Releases and Partial Fixity")
+    if store is not None:
+        return store.end_releases(name)
     SapModel = get_sap_model()
     ret, i_releases, j_releases = SapModel.FrameObj.GetReleases(name)
     if ret != 0:
@@ -192,6 +317,9 @@ def get_end_releases(name):
     }
 
 def get_end_length_offsets(name):
+    store = _stored_frame(name, "Frame Assignments - End Length Offsets")
+    if store is not None:
+        return store.end_length_offsets(name)
     SapModel = get_sap_model()
     ret, offset_i, offset_j, rigid_zone = SapModel.FrameObj.GetEndLengthOffset(name)
     if ret != 0:
@@ -206,6 +334,9 @@ def get_insertion_point(name):
     return {"CardinalPoint": card, "Justification": justify, "Rotation": rotation}
 
 def get_output_stations(name):
+    store = _stored_frame(name, "Frame Assignments - Output Stations")
+    if store is not None:
+        return store.output_stations(name)
     SapModel = get_sap_model()
     ret, sta_type, num = SapModel.FrameObj.GetOutputStations(name)
     if ret != 0:
@@ -218,6 +349,9 @@ def get_local_axis_angle(name):
     return angle if ret == 0 else None
 
 def get_springs(name):
+    store = _stored_frame(name, "Frame Assignments - Springs")
+    if store is not None:
+        return store.springs(name)
     SapModel = get_sap_model()
     ret, spring = SapModel.FrameObj.GetSpringAssignment(name)
     return spring if ret == 0 else None
@@ -230,6 +364,9 @@ def get_line_mass(name):
     return mass
 
 def get_tc_limits(name):
+    store = _stored_frame(name, "Frame Assignments - Tension Compression Limits")
+    if store is not None:
+        return store.tc_limits(name)
     SapModel = get_sap_model()
     ret, tension, compression = SapModel.FrameObj.GetTCLimits(name)
     if ret != 0:
@@ -247,11 +384,19 @@ def get_material_overwrite(name):
     return material if ret == 0 else None
 
 def get_rebar_ratio(name):
+    store = _stored_frame(name, "Frame Assignments - Rebar Ratio")
+    if store is not None:
+        # NaN = frame fără rând în tabel (fără rebar ratio atribuit)
+        ratio = store.rebar_ratio(name)
+        return None if ratio != ratio else ratio
     SapModel = get_sap_model()
     ret, ratio = SapModel.FrameObj.GetRebarRatio(name)
     return ratio if ret == 0 else None
 
 def get_auto_mesh(name):
+    store = _stored_frame(name, "Frame Assignments - Auto Mesh")
+    if store is not None:
+        return store.auto_mesh(name)
     SapModel = get_sap_model()
     ret, automesh = SapModel.FrameObj.GetAutoMesh(name)
     return automesh if ret == 0 else None
@@ -265,51 +410,20 @@ def get_groups(name):
 
 
 def get_section_material(frame_name):
-    """Obține numele materialului pentru secțiunea unei grinzi"""
+    """Obține numele materialului pentru secțiunea unei grinzi (din catalogul de secțiuni)"""
     try:
         # Obține numele secțiunii
         section_name = get_section_name(frame_name)
         if section_name == "N/A":
             return "N/A"
 
-        print(f"-- Obținere material pentru secțiunea: {section_name}")
-
-        # Încearcă să obțină materialul direct folosind GetMaterial
-        ret = sap_model.PropFrame.GetMaterial(section_name)
-        print(f"-- GetMaterial pentru {section_name}: ret={ret}")
-
-        if ret[0] == 0:
-            material_name = ret[1]
-            print(f"-- Material obținut direct: {material_name}")
-            return material_name
-
-        # Dacă direct nu funcționează, încearcă pentru diferite tipuri de secțiuni
-        ret = sap_model.PropFrame.GetRectangle(section_name)
-        if ret[0] == 0:
-            material_name = ret[3]
-            print(f"-- Material pentru secțiune rectangulară: {material_name}")
-            return material_name
-
-        ret = sap_model.PropFrame.GetISection(section_name)
-        if ret[0] == 0:
-            material_name = ret[8]
-            print(f"-- Material pentru secțiune I: {material_name}")
-            return material_name
-
-        ret = sap_model.PropFrame.GetTube(section_name)
-        if ret[0] == 0:
-            material_name = ret[6]
-            print(f"-- Material pentru secțiune tub: {material_name}")
-            return material_name
-
-        ret = sap_model.PropFrame.GetCircle(section_name)
-        if ret[0] == 0:
-            material_name = ret[3]
-            print(f"-- Material pentru secțiune circulară: {material_name}")
-            return material_name
+        section = get_section_info(section_name)
+        if section is None:
+            print(f"⮽⮽ Secțiunea {section_name} nu există în catalog")
+            return "N/A"
 
-        print(f"⮽⮽ Nu s-a putut determina materialul pentru secțiunea {section_name}")
-        return "N/A"
+        print(f"-- Material pentru secțiunea {section_name} ({section['type']}): {section['material']}")
+        return section["material"]
 
     except Exception as e:
         print(f"⮽⮽ Eroare la obținerea materialului pentru {frame_name}: {e}")
@@ -317,19 +431,16 @@ def get_section_material(frame_name):
 
 
 def get_frame_length(frame_name):
-    """Obține lungimea unei grinzi"""
+    """Obține lungimea unei grinzi din geometria calculată în bloc pentru tot modelul"""
     try:
-        ret = sap_model.FrameObj.GetLength(frame_name)
-        print(f"-- GetLength pentru {frame_name}: ret={ret}")
-
-        if ret[0] == 0:
-            length = ret[1]
-            print(f"-- Lungime obținută pentru {frame_name}: {length:.3f}")
-            return length
-        else:
-            print(f"⮽⮽ Eroare GetLength pentru {frame_name}: cod {ret[0]}")
-            # Încearcă o metodă alternativă pentru a obține lungimea
-            return get_frame_length_alternative(frame_name)
+        from etabs_api.geometry import get_frame_geometry
+        geometry = get_frame_geometry()
+        if geometry is not None and frame_name in geometry:
+            return geometry.length(frame_name)
+
+        print(f"⮽⮽ {frame_name} nu există în geometria extrasă, calculez individual")
+        # Încearcă o metodă alternativă pentru a obține lungimea
+        return get_frame_length_alternative(frame_name)
     except Exception as e:
         print(f"⮽⮽ Eroare la obținerea lungimii pentru {frame_name}: {e}")
         return 0.0
@@ -338,17 +449,17 @@ def get_frame_length(frame_name):
 def get_frame_length_alternative(frame_name):
     """Metodă alternativă pentru a obține lungimea unei grinzi"""
     try:
-        # Obține coordonatele punctelor de capăt
+        # Obține coordonatele punctelor de capăt (rezultate comtypes: codul de retur la final)
         ret = sap_model.FrameObj.GetPoints(frame_name)
-        if ret[0] == 0:
-            point1, point2 = ret[1], ret[2]
+        if ret[-1] == 0:
+            point1, point2 = ret[0], ret[1]
             # Obține coordonatele punctelor
             ret1 = sap_model.PointObj.GetCoordCartesian(point1)
             ret2 = sap_model.PointObj.GetCoordCartesian(point2)
 
-            if ret1[0] == 0 and ret2[0] == 0:
-                x1, y1, z1 = ret1[1], ret1[2], ret1[3]
-                x2, y2, z2 = ret2[1], ret2[2], ret2[3]
+            if ret1[-1] == 0 and ret2[-1] == 0:
+                x1, y1, z1 = ret1[0], ret1[1], ret1[2]
+                x2, y2, z2 = ret2[0], ret2[1], ret2[2]
                 # Calculează distanța euclidiană
                 length = ((x2 - x1) ** 2 + (y2 - y1) ** 2 + (z2 - z1) ** 2) ** 0.5
                 print(f"-- Lungime calculată pentru {frame_name}: {length:.3f}")
@@ -362,29 +473,30 @@ def get_frame_length_alternative(frame_name):
         return 0.0
 
 def get_section_properties(frame_name):
-    """Obține proprietățile secțiunii unei grinzi (simplificat)"""
+    """Obține proprietățile secțiunii unei grinzi (simplificat, din catalogul de secțiuni)"""
     try:
-        ret = sap_model.FrameObj.GetSection(frame_name)
-        if ret[0] != 0:
+        section_name = get_section_name(frame_name)
+        if section_name == "N/A":
             return "N/A"
 
-        section_name = ret[1]
+        section = get_section_info(section_name)
+        if section is None:
+            return section_name  # Return section name if no specific properties found
 
-        # Încearcă să obții proprietăți pentru diferite tipuri de secțiuni
-        ret = sap_model.PropFrame.GetRectangle(section_name)
-        if ret[0] == 0:
-            return f"Rect: {ret[4]}x{ret[5]}"  # Width x Height
+        return section["description"]
 
-        ret = sap_model.PropFrame.GetISection(section_name)
-        if ret[0] == 0:
-            return f"I-Sec: {ret[4]}x{ret[5]}"  # Depth x Width
+    except Exception as e:
+        print(f"Eroare la obținerea proprietăților secțiunii pentru {frame_name}: {e}")
+        return "N/A"
 
-        ret = sap_model.PropFrame.GetTube(section_name)
-        if ret[0] == 0:
-            return f"Tube: {ret[4]}x{ret[5]}"  # Depth x Width
 
-        return section_name  # Return section name if no specific properties found
+def call_async(func, *args, callback=None, errback=None, **kwargs):
+    """Rulează func pe firul ETABS dedicat; callback(rezultat) este apelat pe firul Tk când e gata"""
+    from etabs_api.executor import get_executor
+    return get_executor().submit(func, *args, callback=callback, errback=errback, **kwargs)
 
-    except Exception as e:
-        print(f"Eroare la obținerea proprietăților secțiunii pentru {frame_name}: {e}")
-        return "N/A"
\ No newline at end of file
+
+def call_batch_async(calls, callback=None, errback=None):
+    """Rulează o listă de apeluri (func, args) pe firul ETABS într-o singură cerere"""
+    from etabs_api.executor import get_executor
+    return get_executor().submit_batch(calls, callback=callback, errback=errback)
@@ -0,0 +1,273 @@
+"""Înregistrarea și redarea sesiunilor ETABS.
+
+    ETABS_RECORD=sesiune.jsonl.gz - salvează fiecare apel SapModel (argumente și rezultat) într-un jurnal comprimat
+    ETABS_REPLAY=sesiune.jsonl.gz - folosește jurnalul în locul ETABS (offline, fără COM)
+
+La redare, apelurile care nu există în jurnal ridică ReplayMiss și sunt raportate la final.
+"""
+import atexit
+import gzip
+import json
+import os
+import threading
+from collections import Counter, defaultdict, deque
+from datetime import datetime
+
+LOG_FORMAT = "etabs-session"
+LOG_VERSION = 1
+
+_PLAIN_TYPES = (str, int, float, bool, bytes, list, tuple, dict, type(None))
+
+
+class ReplayMiss(Exception):
+    """Apelul cerut nu există în jurnalul sesiunii redate"""
+
+
+def _call_key(args, kwargs):
+    return json.dumps([list(args), kwargs or {}], default=str, ensure_ascii=False)
+
+
+def _plain(value):
+    """Convertește rezultatele comtypes (tuple, array-uri) în valori JSON"""
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+    return str(value)
+
+
+class SessionWriter:
+    """Scrie apelurile înregistrate într-un fișier JSON lines comprimat gzip"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._file.write(json.dumps({
+            "format": LOG_FORMAT,
+            "version": LOG_VERSION,
+            "recorded_at": datetime.now().isoformat(),
+        }) + "\n")
+        self.calls = 0
+
+    def write(self, method_name, args, kwargs, result=None, error=None):
+        entry = {"m": method_name, "k": _call_key(args, kwargs)}
+        if error is not None:
+            entry["e"] = error
+        else:
+            entry["r"] = _plain(result)
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line)
+                self.calls += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                print(f"✓✓ Sesiune ETABS înregistrată: {self.calls} apeluri în {self.path}")
+
+
+class RecordingProxy:
+    """Proxy care transmite apelurile către SapModel real și le scrie în jurnal"""
+
+    def __init__(self, target, writer, path="SapModel"):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_writer", writer)
+        object.__setattr__(self, "_path", path)
+        object.__setattr__(self, "_children", {})
+
+    def __getattr__(self, name):
+        children = object.__getattribute__(self, "_children")
+        if name in children:
+            return children[name]
+
+        target = object.__getattribute__(self, "_target")
+        writer = object.__getattribute__(self, "_writer")
+        path = object.__getattribute__(self, "_path")
+        value = getattr(target, name)
+
+        if isinstance(value, _PLAIN_TYPES):
+            return value
+        if callable(value):
+            method_name = f"{path}.{name}"
+
+            def recorded(*args, **kwargs):
+                try:
+                    result = value(*args, **kwargs)
+                except Exception as e:
+                    writer.write(method_name, args, kwargs, error=str(e))
+                    raise
+                writer.write(method_name, args, kwargs, result=result)
+                return result
+            return recorded
+
+        child = RecordingProxy(value, writer, name if path == "SapModel" else f"{path}.{name}")
+        children[name] = child
+        return child
+
+    def __setattr__(self, name, value):
+        setattr(object.__getattribute__(self, "_target"), name, value)
+
+
+class ReplaySession:
+    """Jurnalul încărcat în memorie: pentru fiecare (metodă, argumente) rezultatele în ordinea înregistrării"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._results = defaultdict(deque)
+        self.missing = Counter()
+        self.replayed = 0
+        self._load()
+
+    def _load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("format") != LOG_FORMAT:
+                raise ValueError(f"{self.path} nu este un jurnal de sesiune ETABS")
+            calls = 0
+            for line in f:
+                entry = json.loads(line)
+                self._results[(entry["m"], entry["k"])].append(entry)
+                calls += 1
+        print(f"-- Sesiune ETABS încărcată pentru redare: {calls} apeluri din {self.path}")
+
+    def call(self, method_name, args, kwargs):
+        key = (method_name, _call_key(args, kwargs))
+        with self._lock:
+            entries = self._results.get(key)
+            if not entries:
+                self.missing[key] += 1
+                raise ReplayMiss(f"Apel neînregistrat: {method_name}{key[1]}")
+            # Ultimul rezultat rămâne disponibil pentru apelurile repetate
+            entry = entries.popleft() if len(entries) > 1 else entries[0]
+            self.replayed += 1
+        if "e" in entry:
+            raise RuntimeError(entry["e"])
+        return entry["r"]
+
+    def report(self):
+        """Afișează apelurile cerute la redare care lipsesc din jurnal"""
+        if not self.missing:
+            print(f"✓✓ Redare completă: {self.replayed} apeluri, toate găsite în jurnal")
+            return
+        print(f"⮽⮽ Redare: {sum(self.missing.values())} apeluri lipsă din jurnal "
+              f"({len(self.missing)} apeluri distincte):")
+        for (method_name, arguments), count in self.missing.most_common():
+            print(f"   {count:>6} x {method_name} {arguments}")
+
+
+class ReplaySapModel:
+    """SapModel care răspunde din jurnalul unei sesiuni înregistrate.
+
+    Fiecare atribut este atât sub-interfață (SapModel.FrameObj), cât și metodă apelabilă
+    (SapModel.FrameObj.GetSection(...)), astfel încât și apelurile neînregistrate să fie raportate.
+    """
+
+    def __init__(self, session, path="SapModel", method_name=None):
+        self._session = session
+        self._path = path
+        self._method_name = method_name or path
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._path == "SapModel":
+            child = ReplaySapModel(self._session, name, f"SapModel.{name}")
+        else:
+            child = ReplaySapModel(self._session, f"{self._path}.{name}")
+        setattr(self, name, child)
+        return child
+
+    def __call__(self, *args, **kwargs):
+        return self._session.call(self._method_name, args, kwargs)
+
+    def __repr__(self):
+        return f"<ReplaySapModel {self._path} din {self._session.path}>"
+
+
+# Sesiunea comună a procesului (jurnalul se scrie / se încarcă o singură dată)
+_writer = None
+_replay_session = None
+_lock = threading.Lock()
+
+
+def _close_writer():
+    if _writer is not None:
+        _writer.close()
+
+
+def _report_replay():
+    if _replay_session is not None:
+        _replay_session.report()
+
+
+def get_replay_session(path):
+    """Încarcă (o singură dată) sesiunea de redat"""
+    global _replay_session
+    with _lock:
+        if _replay_session is None or _replay_session.path != path:
+            _replay_session = ReplaySession(path)
+            atexit.register(_report_replay)
+        return _replay_session
+
+
+def replay_backend(path):
+    """Funcție pentru connection.set_backend care creează SapModel-uri din jurnal"""
+    def factory():
+        return ReplaySapModel(get_replay_session(path))
+    factory.__name__ = f"replay {os.path.basename(path)}"
+    return factory
+
+
+def record(sap_model, path):
+    """Învelește SapModel astfel încât toate apelurile să fie scrise în jurnalul dat"""
+    global _writer
+    with _lock:
+        if _writer is None or _writer.path != path:
+            _close_writer()
+            _writer = SessionWriter(path)
+            atexit.register(_close_writer)
+    print(f"-- Înregistrare sesiune ETABS în {path}")
+    return RecordingProxy(sap_model, _writer)
+
+
+def session_backend(factory):
+    """Aplică ETABS_REPLAY / ETABS_RECORD peste sursa SapModel dată"""
+    replay_path = os.environ.get("ETABS_REPLAY")
+    if replay_path:
+        return replay_backend(replay_path)()
+    sap_model = factory()
+    record_path = os.environ.get("ETABS_RECORD")
+    if record_path and sap_model is not None:
+        return record(sap_model, record_path)
+    return sap_model
+
+
+def summarize_log(path):
+    """Afișează metodele din jurnal și numărul de apeluri pentru fiecare"""
+    counts = Counter()
+    errors = Counter()
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        for line in f:
+            entry = json.loads(line)
+            counts[entry["m"]] += 1
+            if "e" in entry:
+                errors[entry["m"]] += 1
+    print(f"-- {path}: înregistrat la {header.get('recorded_at')}, {sum(counts.values())} apeluri")
+    for method_name, count in counts.most_common():
+        suffix = f"  ({errors[method_name]} excepții)" if errors[method_name] else ""
+        print(f"   {method_name:<48} {count:>8}{suffix}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 2:
+        print("Utilizare: python -m etabs_api.recorder sesiune.jsonl.gz")
+        sys.exit(1)
+    summarize_log(sys.argv[1])
@@ -0,0 +1,296 @@
+"""Extragerea eforturilor din frame-uri pentru combinațiile selectate (CombUpper / CombLower).
+
+Grinzile sunt puse într-un grup ETABS temporar, combinațiile sunt selectate pentru output,
+iar Results.FrameForce este apelat o singură dată pentru întregul grup. Selecția de output
+a utilizatorului din ETABS este restaurată după extragere (preserved_output_selection). Grupul se construiește
+printr-o singură editare a tabelului "Group Assignments" și poate fi partajat cu extragerea
+rezultatelor de proiectare (temporary_frame_group).
+"""
+import contextlib
+
+import numpy as np
+
+from etabs_api.connection import get_sap_model
+
+# Grupul ETABS temporar pentru grinzile ale căror eforturi se extrag
+RESULTS_GROUP_NAME = "BEAM_DESIGN_RESULTS"
+
+# Tabelul editat pentru atribuirea în bloc a frame-urilor în grup
+GROUP_ASSIGNMENTS_TABLE = "Group Assignments"
+GROUP_NAME_FIELD = "Group Name"
+GROUP_OBJECT_TYPE_FIELD = "Object Type"
+GROUP_OBJECT_NAME_FIELDS = ("Object Unique Name", "UniqueName")
+
+# eItemTypeElm pentru Results.FrameForce
+ITEM_TYPE_ELM_OBJECT = 0
+ITEM_TYPE_ELM_GROUP = 2
+
+# Eforturile păstrate pentru fiecare stație
+FORCE_COMPONENTS = ("P", "V2", "T", "M3")
+
+
+def split_combos(text):
+    """Lista combinațiilor dintr-o valoare CombUpper / CombLower ("C1, C2")"""
+    if not text or text == "N/A":
+        return []
+    return [combo.strip() for combo in str(text).split(",") if combo.strip()]
+
+
+def combo_label(combo, step_type):
+    """Numele rezultatului: combinațiile înfășurătoare au pași Max / Min separați"""
+    step_type = (step_type or "").strip()
+    if step_type in ("Max", "Min"):
+        return f"{combo} ({step_type})"
+    return combo
+
+
+def base_combo_name(label):
+    """Numele combinației dintr-o etichetă de rezultat ("C (Max)" -> "C")"""
+    if label.endswith((" (Max)", " (Min)")):
+        return label[:-len(" (Max)")]
+    return label
+
+
+class FrameForceResults:
+    """Eforturile pe stații pentru fiecare (grindă, combinație): array-uri Station, P, V2, T, M3"""
+
+    def __init__(self):
+        self.data = {}
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def get(self, frame_name, combo):
+        return self.data.get((frame_name, combo))
+
+    def items(self):
+        return self.data.items()
+
+    def combos_for(self, frame_name):
+        return [combo for name, combo in self.data if name == frame_name]
+
+
+def _assign_group_by_table(sap_model, group_name, frame_names, replace=True):
+    """Atribuie frame-urile grupului printr-un singur tabel editat (3 apeluri în total).
+
+    replace=True înlocuiește membrii grupului, replace=False îi păstrează și adaugă frame-urile noi.
+    """
+    tables = sap_model.DatabaseTables
+    result = tables.GetTableForEditingArray(GROUP_ASSIGNMENTS_TABLE, "All")
+    if result[-1] != 0:
+        raise RuntimeError(f"GetTableForEditingArray({GROUP_ASSIGNMENTS_TABLE}) a returnat eroare: {result[-1]}")
+    table_version, fields, number_records, table_data = result[0], list(result[1]), result[2], list(result[3])
+    name_field = next((field for field in GROUP_OBJECT_NAME_FIELDS if field in fields), None)
+    if name_field is None or GROUP_NAME_FIELD not in fields:
+        raise RuntimeError(f"Tabelul {GROUP_ASSIGNMENTS_TABLE} nu are câmpurile așteptate: {fields}")
+    group_position, name_position = fields.index(GROUP_NAME_FIELD), fields.index(name_field)
+    type_position = fields.index(GROUP_OBJECT_TYPE_FIELD) if GROUP_OBJECT_TYPE_FIELD in fields else None
+
+    # Atribuirile celorlalte grupuri rămân neschimbate; cele ale grupului temporar (de la o rulare
+    # întreruptă) sunt înlocuite, dacă nu se cere adăugarea la membrii existenți
+    field_count = len(fields)
+    rows = [table_data[i * field_count:(i + 1) * field_count] for i in range(number_records)]
+    if replace:
+        rows = [row for row in rows if row[group_position] != group_name]
+    members = {row[name_position] for row in rows if row[group_position] == group_name}
+    for frame_name in frame_names:
+        if frame_name in members:
+            continue
+        members.add(frame_name)
+        row = [""] * field_count
+        row[group_position] = group_name
+        row[name_position] = frame_name
+        if type_position is not None:
+            row[type_position] = "Frame"
+        rows.append(row)
+
+    ret = tables.SetTableForEditingArray(GROUP_ASSIGNMENTS_TABLE, table_version, fields, len(rows),
+                                         [value for row in rows for value in row])
+    if ret[-1] != 0:
+        raise RuntimeError(f"SetTableForEditingArray({GROUP_ASSIGNMENTS_TABLE}) a returnat eroare: {ret[-1]}")
+    result = tables.ApplyEditedTables(True)
+    if result[-1] != 0 or result[0] > 0:
+        raise RuntimeError(f"ApplyEditedTables a eșuat: {result[4]}")
+    return result[1]
+
+
+def _assign_group_per_frame(sap_model, group_name, frame_names, replace=True):
+    """Varianta cu câte un SetGroupAssign pe frame (dacă tabelul nu poate fi editat)"""
+    if replace:
+        # Golește grupul (poate exista dintr-o rulare anterioară întreruptă)
+        sap_model.FrameObj.SetGroupAssign(group_name, group_name, True, 1)
+    failed = 0
+    for frame_name in frame_names:
+        if sap_model.FrameObj.SetGroupAssign(frame_name, group_name, False, 0) != 0:
+            failed += 1
+    return failed
+
+
+def assign_frames_to_group(sap_model, group_name, frame_names, replace=True):
+    """Atribuie frame-urile unui grup existent printr-o singură editare de tabel; returnează numărul eșecurilor.
+
+    Atribuirea frame cu frame este folosită doar dacă tabelul "Group Assignments" nu poate fi editat.
+    """
+    try:
+        return _assign_group_by_table(sap_model, group_name, frame_names, replace)
+    except Exception as e:
+        print(f"⮽⮽ Grupul {group_name} nu a putut fi atribuit prin tabel ({e}), atribui frame cu frame")
+        return _assign_group_per_frame(sap_model, group_name, frame_names, replace)
+
+
+def create_frame_group(sap_model, group_name, frame_names):
+    """Creează (sau golește) un grup ETABS temporar și adaugă frame-urile date în el"""
+    ret = sap_model.GroupDef.SetGroup(group_name)
+    if ret != 0:
+        raise RuntimeError(f"GroupDef.SetGroup a returnat eroare: {ret}")
+    failed = assign_frames_to_group(sap_model, group_name, frame_names)
+    if failed:
+        print(f"⮽⮽ {failed} grinzi nu au putut fi adăugate în grupul {group_name}")
+
+
+def delete_frame_group(sap_model, group_name):
+    """Șterge grupul temporar (erorile sunt doar raportate)"""
+    try:
+        sap_model.GroupDef.Delete(group_name)
+    except Exception as e:
+        print(f"⮽⮽ Nu am putut șterge grupul temporar {group_name}: {e}")
+
+
+@contextlib.contextmanager
+def temporary_frame_group(frame_names, group_name=RESULTS_GROUP_NAME):
+    """Grup ETABS temporar cu frame-urile date, creat o singură dată și șters la ieșire.
+
+    Numele grupului se dă mai departe la extract_frame_forces / extract_beam_design, care nu mai
+    construiesc grupul lor; dacă grupul nu poate fi creat se obține None și fiecare își face propriul grup.
+    """
+    sap_model = None
+    try:
+        sap_model = get_sap_model()
+        create_frame_group(sap_model, group_name, frame_names)
+    except Exception as e:
+        print(f"⮽⮽ Grupul temporar {group_name} nu a putut fi creat: {e}")
+        if sap_model is not None:
+            delete_frame_group(sap_model, group_name)
+        yield None
+        return
+    try:
+        yield group_name
+    finally:
+        delete_frame_group(sap_model, group_name)
+
+
+def _selected_for_output(names_result, get_selected):
+    """Numele din rezultatul unui GetNameList care sunt selectate pentru output"""
+    if names_result[-1] != 0:
+        return []
+    return [name for name in names_result[1] if get_selected(name)[0]]
+
+
+@contextlib.contextmanager
+def preserved_output_selection(sap_model):
+    """Păstrează cazurile și combinațiile selectate pentru output de utilizator și le restaurează la ieșire.
+
+    ETABS nu are un apel pentru toată selecția: se citește câte un Get...SelectedForOutput pe nume.
+    """
+    setup = sap_model.Results.Setup
+    try:
+        cases = _selected_for_output(sap_model.LoadCases.GetNameList(), setup.GetCaseSelectedForOutput)
+        combos = _selected_for_output(sap_model.RespCombo.GetNameList(), setup.GetComboSelectedForOutput)
+    except Exception as e:
+        print(f"⮽⮽ Selecția de output din ETABS nu a putut fi citită și nu va fi restaurată: {e}")
+        yield
+        return
+    try:
+        yield
+    finally:
+        try:
+            setup.DeselectAllCasesAndCombosForOutput()
+            for case in cases:
+                setup.SetCaseSelectedForOutput(case, True)
+            for combo in combos:
+                setup.SetComboSelectedForOutput(combo, True)
+        except Exception as e:
+            print(f"⮽⮽ Selecția de output din ETABS nu a putut fi restaurată: {e}")
+
+
+def _select_combos_for_output(sap_model, combos):
+    sap_model.Results.Setup.DeselectAllCasesAndCombosForOutput()
+    selected = []
+    for combo in combos:
+        if sap_model.Results.Setup.SetComboSelectedForOutput(combo, True) == 0:
+            selected.append(combo)
+        else:
+            print(f"⮽⮽ Combinația {combo} nu a putut fi selectată pentru output")
+    return selected
+
+
+def _group_results(result, wanted):
+    """Împarte rezultatul plat FrameForce pe (grindă, combinație) cu array-uri NumPy"""
+    objects = np.asarray(result[1], dtype=object)
+    stations = np.asarray(result[2], dtype=float)
+    load_cases = np.asarray(result[5], dtype=object)
+    step_types = np.asarray(result[6], dtype=object)
+    components = {
+        "P": np.asarray(result[8], dtype=float),
+        "V2": np.asarray(result[9], dtype=float),
+        "T": np.asarray(result[11], dtype=float),
+        "M3": np.asarray(result[13], dtype=float),
+    }
+
+    results = FrameForceResults()
+    if len(objects) == 0:
+        return results
+
+    keys = np.array([f"{o}\x00{c}\x00{s}" for o, c, s in zip(objects, load_cases, step_types)], dtype=object)
+    # Rândurile aceleiași chei sunt consecutive în ordinea stațiilor; sortare stabilă păstrează ordinea
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    boundaries = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+    for rows in np.split(order, boundaries):
+        frame_name, combo, step_type = objects[rows[0]], load_cases[rows[0]], step_types[rows[0]]
+        if combo not in wanted.get(frame_name, ()):
+            continue
+        entry = {"Station": stations[rows]}
+        for component in FORCE_COMPONENTS:
+            entry[component] = components[component][rows]
+        results.data[(frame_name, combo_label(combo, step_type))] = entry
+    return results
+
+
+def extract_frame_forces(beam_combos, group_name=None):
+    """Extrage eforturile pe stații pentru {grindă: [combinații]} cu un singur apel Results.FrameForce.
+
+    group_name - un grup temporar existent care conține grinzile (vezi temporary_frame_group);
+                 dacă lipsește, grupul este creat și șters aici.
+    Returnează un FrameForceResults; combinațiile înfășurătoare apar ca "NUME (Max)" și "NUME (Min)".
+    """
+    sap_model = get_sap_model()
+    wanted = {frame_name: set(combos) for frame_name, combos in beam_combos.items() if combos}
+    if not wanted:
+        print("-- Nu sunt combinații de extras")
+        return FrameForceResults()
+
+    all_combos = sorted(set().union(*wanted.values()))
+    print(f"-- Extrag eforturile pentru {len(wanted)} grinzi și {len(all_combos)} combinații")
+
+    with contextlib.ExitStack() as stack:
+        if group_name is None:
+            group_name = stack.enter_context(temporary_frame_group(list(wanted)))
+            if group_name is None:
+                return FrameForceResults()
+
+        stack.enter_context(preserved_output_selection(sap_model))
+        selected = _select_combos_for_output(sap_model, all_combos)
+        if not selected:
+            return FrameForceResults()
+
+        result = sap_model.Results.FrameForce(group_name, ITEM_TYPE_ELM_GROUP)
+        if result[-1] != 0:
+            raise RuntimeError(f"Results.FrameForce a returnat eroare: {result[-1]} (modelul este analizat?)")
+
+        results = _group_results(result, wanted)
+        print(f"✓✓ Eforturi extrase: {result[0]} rânduri, {len(results)} perechi grindă - combinație")
+        return results
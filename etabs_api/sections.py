@@ -0,0 +1,96 @@
+from etabs_api.connection import get_sap_model
+from etabs_api.cache import ModelCache
+
+# Intervalul (secunde) în care lista de secțiuni nu mai este reverificată în ETABS
+SECTION_CHECK_INTERVAL = 5.0
+
+
+def _section_entry(section_name, section_type, material, t3=None, t2=None):
+    """Construiește intrarea din catalog pentru o secțiune"""
+    if section_type == "Rectangular":
+        description = f"Rect: {t2}x{t3}"  # Width x Depth
+    elif section_type == "I":
+        description = f"I-Sec: {t3}x{t2}"  # Depth x Width
+    elif section_type == "Tube":
+        description = f"Tube: {t3}x{t2}"  # Depth x Width
+    elif section_type == "Circle":
+        description = f"Circle: D{t3}"
+    else:
+        description = section_name
+
+    return {
+        "name": section_name,
+        "type": section_type,
+        "material": material,
+        "t3": t3,
+        "t2": t2,
+        "description": description,
+    }
+
+
+def _read_section(sap_model, section_name):
+    """Citește tipul, dimensiunile și materialul unei secțiuni (o singură dată per secțiune)"""
+    # Rezultatele comtypes au parametrii de ieșire în ordine și codul de retur la final
+    ret = sap_model.PropFrame.GetRectangle(section_name)
+    if ret[-1] == 0:
+        return _section_entry(section_name, "Rectangular", ret[1], ret[2], ret[3])
+
+    ret = sap_model.PropFrame.GetISection(section_name)
+    if ret[-1] == 0:
+        return _section_entry(section_name, "I", ret[1], ret[2], ret[3])
+
+    ret = sap_model.PropFrame.GetTube(section_name)
+    if ret[-1] == 0:
+        return _section_entry(section_name, "Tube", ret[1], ret[2], ret[3])
+
+    ret = sap_model.PropFrame.GetCircle(section_name)
+    if ret[-1] == 0:
+        return _section_entry(section_name, "Circle", ret[1], ret[2])
+
+    # Alte tipuri de secțiuni - doar materialul
+    ret = sap_model.PropFrame.GetMaterial(section_name)
+    material = ret[0] if ret[-1] == 0 else "N/A"
+    return _section_entry(section_name, "Other", material)
+
+
+def _section_names():
+    """Lista de secțiuni definite în model - semnătura catalogului"""
+    return tuple(get_sap_model().PropFrame.GetNameList()[1])
+
+
+def _load_section_catalog():
+    """Încarcă toate secțiunile din model într-un index în memorie"""
+    sap_model = get_sap_model()
+    catalog = {}
+    for section_name in _section_names():
+        try:
+            catalog[section_name] = _read_section(sap_model, section_name)
+        except Exception as e:
+            print(f"⮽⮽ Eroare la citirea secțiunii {section_name}: {e}")
+            catalog[section_name] = _section_entry(section_name, "Other", "N/A")
+    print(f"-- Catalog secțiuni încărcat: {len(catalog)} secțiuni")
+    return catalog
+
+
+# Catalogul se reîncarcă doar când lista PropFrame.GetNameList se schimbă
+_section_catalog = ModelCache(_load_section_catalog, _section_names, SECTION_CHECK_INTERVAL)
+
+
+def get_section_catalog():
+    """Returnează catalogul secțiunilor {nume secțiune: tip, dimensiuni, material}"""
+    try:
+        return _section_catalog.get()
+    except Exception as e:
+        print(f"⮽⮽ Eroare la încărcarea catalogului de secțiuni: {e}")
+        _section_catalog.invalidate()
+        return {}
+
+
+def get_section_info(section_name):
+    """Returnează intrarea din catalog pentru o secțiune (sau None dacă nu există)"""
+    return get_section_catalog().get(section_name)
+
+
+def invalidate_section_catalog():
+    """Forțează reîncărcarea catalogului la următorul acces"""
+    _section_catalog.invalidate()
@@ -0,0 +1,108 @@
+"""Urmărirea selecției din ETABS prin diferențe, cu interval de interogare adaptiv.
+
+API-ul ETABS nu are o interogare mai ieftină decât SelectObj.GetSelected (nici un contor de
+modificări, nici doar numărul de obiecte selectate), deci fiecare verificare citește selecția
+completă într-un singur apel COM. Economia vine din intervalul adaptiv (verificări rare cât
+timp selecția nu se schimbă); semnătura (numărul de obiecte și hash-ul listei de nume) evită
+doar filtrarea frame-urilor și calculul diferenței când selecția este aceeași.
+"""
+from etabs_api.connection import get_sap_model
+from etabs_api.operations import FRAME_OBJECT_TYPE, get_selected_frames_by_scan
+
+# Intervalul de interogare (ms): minim imediat după o schimbare, crește până la maxim cât timp nu se schimbă nimic
+MIN_INTERVAL_MS = 150
+MAX_INTERVAL_MS = 2000
+BACKOFF_FACTOR = 1.5
+
+
+class SelectionDelta:
+    """Diferența dintre două verificări: frame-urile adăugate și cele scoase din selecție"""
+
+    __slots__ = ("added", "removed", "count")
+
+    def __init__(self, added, removed, count):
+        self.added = added
+        self.removed = removed
+        self.count = count
+
+    def __bool__(self):
+        return bool(self.added or self.removed)
+
+    def __repr__(self):
+        return f"<SelectionDelta +{len(self.added)} -{len(self.removed)} (total {self.count})>"
+
+
+class AdaptiveInterval:
+    """Intervalul până la următoarea verificare: revine la minim după o schimbare, altfel crește treptat"""
+
+    def __init__(self, min_ms=MIN_INTERVAL_MS, max_ms=MAX_INTERVAL_MS, factor=BACKOFF_FACTOR):
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.factor = factor
+        self.current = min_ms
+
+    def next(self, changed):
+        """Intervalul (ms) după o verificare cu sau fără schimbare"""
+        if changed:
+            self.current = self.min_ms
+        else:
+            self.current = min(self.max_ms, int(self.current * self.factor))
+        return self.current
+
+    def reset(self):
+        self.current = self.min_ms
+
+
+class SelectionTracker:
+    """Păstrează ultima selecție de frame-uri și returnează doar diferențele la fiecare verificare"""
+
+    def __init__(self):
+        self.frames = []
+        self._members = set()
+        self._signature = None
+        # Verificări (fiecare = un GetSelected complet) și selecții schimbate (diferență calculată)
+        self.polls = 0
+        self.fetches = 0
+
+    def reset(self, frames=()):
+        """Pornește de la selecția dată (implicit goală)"""
+        self.frames = list(frames)
+        self._members = set(self.frames)
+        self._signature = None
+
+    def _read_selection(self):
+        """Selecția brută într-un singur apel: (semnătură, tipuri, nume).
+
+        Nu există o interogare mai ieftină în ETABS: semnătura se calculează din rezultatul complet
+        și servește doar la a sări peste calculul diferenței, nu la a evita citirea.
+        """
+        result = get_sap_model().SelectObj.GetSelected()
+        if result[-1] != 0:
+            raise RuntimeError(f"SelectObj.GetSelected a returnat eroare: {result[-1]}")
+        object_types, object_names = result[1], result[2]
+        signature = (result[0], hash(tuple(object_names)))
+        return signature, object_types, object_names
+
+    def poll(self):
+        """Verifică selecția; returnează SelectionDelta (gol dacă nu s-a schimbat nimic). Rulează pe firul ETABS."""
+        self.polls += 1
+        try:
+            signature, object_types, object_names = self._read_selection()
+        except Exception as e:
+            print(f"⮽⮽ Selecție bulk indisponibilă, se verifică fiecare frame: {e}")
+            frames = get_selected_frames_by_scan()
+            signature = (len(frames), hash(tuple(frames)))
+            object_types, object_names = [FRAME_OBJECT_TYPE] * len(frames), frames
+
+        if signature == self._signature:
+            return SelectionDelta([], [], len(self.frames))
+        self._signature = signature
+        self.fetches += 1
+
+        frames = [name for obj_type, name in zip(object_types, object_names) if obj_type == FRAME_OBJECT_TYPE]
+        members = set(frames)
+        added = [name for name in frames if name not in self._members]
+        removed = [name for name in self.frames if name not in members]
+        self.frames = frames
+        self._members = members
+        return SelectionDelta(added, removed, len(frames))
@@ -0,0 +1,203 @@
+from etabs_api.connection import get_sap_model
+
+# Tabelele "Frame Assignments" citite prin DatabaseTables și coloanele păstrate din fiecare.
+# Fiecare intrare: cheia tabelului -> (câmpul cu UniqueName, {câmp ETABS: coloană rezultat})
+FRAME_ASSIGNMENT_TABLES = {
+    "Frame Assignments - Summary": ("UniqueName", {
+        "Story": "Story",
+        "Label": "Label",
+        "Analysis Section": "Section",
+        "Design Type": "DesignType",
+        "Length": "Length",
+    }),
+    "Frame Assignments - Property Modifiers": ("UniqueName", {
+        "Area Modifier": "ModArea",
+        "As2 Modifier": "ModAs2",
+        "As3 Modifier": "ModAs3",
+        "Torsion Modifier": "ModTorsion",
+        "I22 Modifier": "ModI22",
+        "I33 Modifier": "ModI33",
+        "Mass Modifier": "ModMass",
+        "Weight Modifier": "ModWeight",
+    }),
+    "Frame Assignments - Releases and Partial Fixity": ("UniqueName", {
+        "PI": "ReleasePI", "V2I": "ReleaseV2I", "V3I": "ReleaseV3I",
+        "TI": "ReleaseTI", "M2I": "ReleaseM2I", "M3I": "ReleaseM3I",
+        "PJ": "ReleasePJ", "V2J": "ReleaseV2J", "V3J": "ReleaseV3J",
+        "TJ": "ReleaseTJ", "M2J": "ReleaseM2J", "M3J": "ReleaseM3J",
+    }),
+    "Frame Assignments - Insertion Point": ("UniqueName", {
+        "Cardinal Point": "CardinalPoint",
+        "Mirror2": "Mirror2",
+        "No Transform Stiffness": "NoTransform",
+    }),
+    "Beam Object Connectivity": ("Unique Name", {
+        "GUID": "GUID", "UniquePtI": "PointI", "UniquePtJ": "PointJ",
+    }),
+    "Column Object Connectivity": ("Unique Name", {
+        "GUID": "GUID", "UniquePtI": "PointI", "UniquePtJ": "PointJ",
+    }),
+    "Brace Object Connectivity": ("Unique Name", {
+        "GUID": "GUID", "UniquePtI": "PointI", "UniquePtJ": "PointJ",
+    }),
+}
+
+# Coloanele numerice (tabelele ETABS returnează toate valorile ca text)
+NUMERIC_COLUMNS = {
+    "Length", "ModArea", "ModAs2", "ModAs3", "ModTorsion", "ModI22", "ModI33", "ModMass", "ModWeight",
+}
+
+# Tabelul cu atribuirile pe grupuri (un rând pentru fiecare pereche grup - obiect)
+GROUP_ASSIGNMENTS_TABLE = "Group Assignments"
+GROUP_NAME_FIELD = "Group Name"
+GROUP_OBJECT_TYPE_FIELD = "Object Type"
+GROUP_OBJECT_NAME_FIELD = "Object Unique Name"
+
+
+class FrameAttributeTable:
+    """Atributele frame-urilor organizate pe coloane și indexate după UniqueName"""
+
+    def __init__(self):
+        self.names = []
+        self.index = {}
+        self.columns = {}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def _row_index(self, name):
+        """Returnează poziția frame-ului, adăugând un rând gol dacă nu există"""
+        position = self.index.get(name)
+        if position is None:
+            position = len(self.names)
+            self.index[name] = position
+            self.names.append(name)
+            for values in self.columns.values():
+                values.append(None)
+        return position
+
+    def set(self, name, column, value):
+        """Setează valoarea unei coloane pentru un frame"""
+        position = self._row_index(name)
+        values = self.columns.get(column)
+        if values is None:
+            values = [None] * len(self.names)
+            self.columns[column] = values
+        values[position] = value
+
+    def get(self, name, column, default=None):
+        """Returnează valoarea unei coloane pentru un frame (sau default)"""
+        position = self.index.get(name)
+        values = self.columns.get(column)
+        if position is None or values is None or values[position] is None:
+            return default
+        return values[position]
+
+    def row(self, name):
+        """Returnează toate atributele unui frame ca dicționar"""
+        position = self.index.get(name)
+        if position is None:
+            return None
+        return {column: values[position] for column, values in self.columns.items()}
+
+
+def _convert_value(column, value):
+    """Convertește valorile text din tabelele ETABS în numere pentru coloanele numerice"""
+    if column in NUMERIC_COLUMNS and value not in (None, ""):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    return value
+
+
+def read_table_data(table_key, group_name="All", fields=None):
+    """Citește un tabel ETABS într-un singur apel și returnează (câmpuri, număr de rânduri, date plate).
+
+    fields restrânge citirea la câmpurile date (FieldKeyList); implicit se citesc toate câmpurile.
+    """
+    sap_model = get_sap_model()
+    result = sap_model.DatabaseTables.GetTableForDisplayArray(table_key, list(fields or []), group_name, 0, [], 0, [])
+    fields, number_records, table_data, ret = result[2], result[3], result[4], result[-1]
+    if ret != 0:
+        raise RuntimeError(f"GetTableForDisplayArray({table_key}) a returnat eroare: {ret}")
+    return list(fields), number_records, table_data
+
+
+def table_column(fields, table_data, field):
+    """Valorile unui câmp pentru toate rândurile, direct din datele plate (fără împărțire pe rânduri)"""
+    return list(table_data[fields.index(field)::len(fields)])
+
+
+def read_table(table_key, group_name="All", fields=None):
+    """Citește un tabel ETABS într-un singur apel și returnează (câmpuri, listă de rânduri)"""
+    fields, number_records, table_data = read_table_data(table_key, group_name, fields)
+    field_count = len(fields)
+    rows = [table_data[i * field_count:(i + 1) * field_count] for i in range(number_records)]
+    return fields, rows
+
+
+def get_frame_assignments(frame_names=None, group_name="All", include_groups=True, tables=None, columns=None):
+    """Extrage atributele frame-urilor din tabelele "Frame Assignments" cu un număr constant de apeluri COM.
+
+    Returnează un FrameAttributeTable indexat după UniqueName. Dacă frame_names este dat,
+    se păstrează doar frame-urile cerute. tables înlocuiește FRAME_ASSIGNMENT_TABLES (aceeași formă).
+    columns restrânge extragerea la coloanele date (ex: ("Label", "GUID")): sunt citite doar
+    tabelele care le conțin și doar câmpurile lor; "Groups" cere și tabelul de grupuri.
+    """
+    wanted = set(frame_names) if frame_names is not None else None
+    table = FrameAttributeTable()
+    calls = 0
+    if columns is not None:
+        include_groups = include_groups and "Groups" in columns
+
+    for table_key, (name_field, column_map) in (tables or FRAME_ASSIGNMENT_TABLES).items():
+        if columns is not None:
+            column_map = {field: column for field, column in column_map.items() if column in columns}
+            if not column_map:
+                continue
+        try:
+            fields, rows = read_table(table_key, group_name,
+                                      [name_field, *column_map] if columns is not None else None)
+            calls += 1
+        except Exception as e:
+            print(f"⮽⮽ Tabelul '{table_key}' nu a putut fi citit: {e}")
+            continue
+
+        if name_field not in fields:
+            print(f"⮽⮽ Tabelul '{table_key}' nu conține câmpul {name_field}")
+            continue
+
+        name_position = fields.index(name_field)
+        positions = {column: fields.index(field) for field, column in column_map.items() if field in fields}
+        for row in rows:
+            name = row[name_position]
+            if wanted is not None and name not in wanted:
+                continue
+            for column, position in positions.items():
+                table.set(name, column, _convert_value(column, row[position]))
+
+    if include_groups:
+        try:
+            fields, rows = read_table(GROUP_ASSIGNMENTS_TABLE, group_name)
+            calls += 1
+            group_position = fields.index(GROUP_NAME_FIELD)
+            type_position = fields.index(GROUP_OBJECT_TYPE_FIELD)
+            name_position = fields.index(GROUP_OBJECT_NAME_FIELD)
+            for row in rows:
+                name = row[name_position]
+                if row[type_position] != "Frame" or (wanted is not None and name not in wanted):
+                    continue
+                groups = table.get(name, "Groups")
+                if groups is None:
+                    groups = []
+                    table.set(name, "Groups", groups)
+                groups.append(row[group_position])
+        except Exception as e:
+            print(f"⮽⮽ Tabelul '{GROUP_ASSIGNMENTS_TABLE}' nu a putut fi citit: {e}")
+
+    print(f"-- Extrase atributele pentru {len(table)} frame-uri în {calls} apeluri DatabaseTables")
+    return table
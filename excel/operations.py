@@ -1,11 +1,17 @@
 import os
-import xlwings as xw
-import sqlite3
+from contextlib import closing
 from datetime import datetime
+from itertools import groupby
+
+from db.schema import get_schema_version, load_groups
+from db.session import get_connection, session
+from etabs_api.instrumentation import instrumented_stage
 
 
 def copy_excel_file(source_excel_path, destination_excel_path):
     """Creează o copie a unui fișier Excel folosind xlwings."""
+    import xlwings as xw
+
     app = None
     source_wb = None
 
@@ -77,77 +83,60 @@ def copy_excel_file(source_excel_path, destination_excel_path):
                 pass
 
 
+def iter_frame_groups(db_path="frames.db"):
+    """
+    Yields beam groups one at a time, streamed from the cursor in (Scenario, GroupID, OrderID) order.
+    Each group has the same shape as the entries of frame_group()["groups"]; only the current
+    group's beams are held in memory.
+    """
+    # Read-only: a missing database is reported instead of created (writers bring it to the current schema)
+    conn = get_connection(db_path, readonly=True)
+
+    # Group settings are read once (one row per group); beams are streamed in index order
+    group_settings = load_groups(conn)
+    cursor = conn.execute("""
+        SELECT id, UniqueName, Label, GroupID, OrderID, Scenario
+        FROM Frames 
+        ORDER BY Scenario, GroupID, OrderID
+    """)
+    try:
+        for (scenario, group_id), beams in groupby(cursor, key=lambda beam: (beam[5], beam[3])):
+            yield {
+                "group_id": group_id,
+                "scenario": scenario,
+                "beams": [{
+                    "db_id": beam[0],
+                    "unique_name": beam[1],
+                    "label": beam[2],
+                    "selection_order": beam[4]  # OrderID
+                } for beam in beams],
+                "settings": group_settings.get((scenario, group_id), {})
+            }
+    finally:
+        # Releases the read statement even if the consumer stops early
+        cursor.close()
+
+
 def frame_group(db_path="frames.db"):
     """
     Extracts and groups beam data from temporary database file.
+    Materializes every group; use iter_frame_groups to process one group at a time.
     """
     try:
         if not os.path.exists(db_path):
             print(f"⮽⮽ Database file not found: {db_path}")
             return None
 
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Get all frames from database with ALL available columns
-        cursor.execute("""
-            SELECT id, UniqueName, Label, GroupID, OrderID, Scenario,
-                   Rezistente, DCL, DCM, DCH, Secundare, DirX, DirY,
-                   CombUpper, CombLower, Etaj
-            FROM Frames 
-            ORDER BY Scenario, GroupID, OrderID
-        """)
-
-        beams = cursor.fetchall()
-        conn.close()
+        groups = list(iter_frame_groups(db_path))
+        total_beams = sum(len(group["beams"]) for group in groups)
+        print(f"-- Found {total_beams} beams in database")
 
-        print(f"-- Found {len(beams)} beams in database")
-
-        # Group beams by scenario and group
         grouped_beams = {
-            "groups": [],
-            "total_beams": len(beams),
+            "groups": groups,
+            "total_beams": total_beams,
             "timestamp": datetime.now().isoformat()
         }
 
-        # Group beams properly
-        groups_dict = {}
-        for beam in beams:
-            scenario = beam[5]  # Scenario column (index 5)
-            group_id = beam[3]  # GroupID column (index 3)
-
-            key = f"{scenario}_{group_id}"
-            if key not in groups_dict:
-                groups_dict[key] = {
-                    "group_id": group_id,
-                    "scenario": scenario,
-                    "beams": [],
-                    "settings": {
-                        "rezistente": beam[6],  # Rezistente
-                        "dcl": beam[7],  # DCL
-                        "dcm": beam[8],  # DCM
-                        "dch": beam[9],  # DCH
-                        "secundare": beam[10],  # Secundare
-                        "dir_x": beam[11],  # DirX
-                        "dir_y": beam[12],  # DirY
-                        "comb_upper": beam[13],  # CombUpper
-                        "comb_lower": beam[14],  # CombLower
-                        "etaj": beam[15]  # Etaj
-                    }
-                }
-
-            beam_info = {
-                "db_id": beam[0],
-                "unique_name": beam[1],
-                "label": beam[2],
-                "selection_order": beam[4]  # OrderID (index 4)
-            }
-            groups_dict[key]["beams"].append(beam_info)
-
-        # Convert to list
-        for group_key, group_data in groups_dict.items():
-            grouped_beams["groups"].append(group_data)
-
         print(f"-- Created {len(grouped_beams['groups'])} beam groups")
         return grouped_beams
 
@@ -158,10 +147,13 @@ def frame_group(db_path="frames.db"):
         return None
 
 
+@instrumented_stage("create_structured_excel_layout")
 def create_structured_excel_layout(excel_path, template_excel_path, db_path="frames.db"):
     """
     Creates structured Excel layout with beam data organized in rows and columns.
     """
+    import xlwings as xw
+
     app = None
     wb = None
     template_wb = None
@@ -170,10 +162,8 @@ def create_structured_excel_layout(excel_path, template_excel_path, db_path="fra
         print(f"-- Starting structured Excel layout creation for: {excel_path}")
         print(f"-- Using template: {template_excel_path}")
 
-        # Get grouped beam data
-        beam_groups = frame_group(db_path)
-        if not beam_groups:
-            print("⮽⮽ No beam data found for Excel creation")
+        if not os.path.exists(db_path):
+            print(f"⮽⮽ Database file not found: {db_path}")
             return False
 
         # Verify template exists
@@ -191,6 +181,7 @@ def create_structured_excel_layout(excel_path, template_excel_path, db_path="fra
         # Open the template workbook to read from
         template_wb = app.books.open(template_excel_path)
         print("-- Template workbook opened successfully")
+        template_sheet = get_template_sheet(template_wb)
 
         # Open the destination workbook to write to
         wb = app.books.open(excel_path)
@@ -200,73 +191,65 @@ def create_structured_excel_layout(excel_path, template_excel_path, db_path="fra
         existing_sheets = [sheet.name for sheet in wb.sheets]
         print(f"-- Existing sheets: {existing_sheets}")
 
-        # Process each combination and create/update sheets
-        sheet_combinations = get_sheet_combinations(beam_groups)
-        print(f"-- Found {len(sheet_combinations)} unique sheet combinations")
-
-        # Track sheet names we've processed in THIS session to avoid duplicates
-        processed_sheet_names = set()
-
-        # Dictionary to collect all beam positions from all sheets
-        all_beam_positions = {}
-
-        for combo in sheet_combinations:
-            sheet_name = combo["sheet_name"]
-
-            if sheet_name in processed_sheet_names:
-                print(f"-- Skipping duplicate sheet name in combinations: {sheet_name}")
-                continue
-
-            processed_sheet_names.add(sheet_name)
-
-            print(f"-- Processing sheet: {sheet_name}")
-
-            try:
-                if sheet_name in existing_sheets:
-                    sheet = wb.sheets[sheet_name]
-                    sheet.clear()
-                    print(f"-- Cleared existing sheet: {sheet_name}")
-                else:
-                    sheet = wb.sheets.add(sheet_name)
-                    print(f"-- Created new sheet: {sheet_name}")
-
-                matching_beams = get_beams_for_criteria(beam_groups, combo)
-
-                if matching_beams:
-                    print(f"-- Found {len(matching_beams)} beams for criteria {sheet_name}")
-
-                    beams_by_group = {}
-                    for beam_item in matching_beams:
-                        group_id = beam_item["group_id"]
-                        if group_id not in beams_by_group:
-                            beams_by_group[group_id] = []
-                        beams_by_group[group_id].append(beam_item)
-
-                    # Process groups and get beam positions
-                    sheet_beam_positions = process_group_layout(sheet, template_wb, beams_by_group, combo)
-
-                    # Add positions from this sheet to the main collection
-                    if sheet_beam_positions:
-                        all_beam_positions.update(sheet_beam_positions)
-
-                else:
-                    print(f"-- No beams found for criteria {sheet_name}")
-
-            except Exception as e:
-                print(f"⮽⮽ Error processing sheet {sheet_name}: {e}")
-                import traceback
-                traceback.print_exc()
-
-        # Save the workbook
-        wb.save()
-        print("-- Structured Excel layout created and saved successfully")
-
-        # Update database with Excel positions
-        if all_beam_positions:
-            print(f"-- Updating database with {len(all_beam_positions)} beam positions")
-            update_beam_positions_in_database(all_beam_positions, db_path)
-        else:
-            print("-- No beam positions to update in database")
+        # Sheets created / cleared in THIS session: name -> {"sheet", "combo", "groups"} (None if it failed)
+        sheets = {}
+
+        # Each group is laid out on its sheet as soon as it is read from the database; its ETABS
+        # attributes are fetched and its positions written in the same step, so only one group is held
+        group_count = 0
+        position_count = 0
+        with session(db_path) as conn, closing(iter_frame_groups(db_path)) as groups:
+            positions_cursor = conn.cursor()
+            for group in groups:
+                group_count += 1
+                combo = group_sheet_combination(group)
+                sheet_name = combo["sheet_name"]
+
+                if sheet_name not in sheets:
+                    print(f"-- Processing sheet: {sheet_name}")
+                    try:
+                        if sheet_name in existing_sheets:
+                            sheet = wb.sheets[sheet_name]
+                            sheet.clear()
+                            print(f"-- Cleared existing sheet: {sheet_name}")
+                        else:
+                            sheet = wb.sheets.add(sheet_name)
+                            print(f"-- Created new sheet: {sheet_name}")
+                        sheets[sheet_name] = {"sheet": sheet, "combo": combo, "groups": 0}
+                    except Exception as e:
+                        print(f"⮽⮽ Error processing sheet {sheet_name}: {e}")
+                        import traceback
+                        traceback.print_exc()
+                        sheets[sheet_name] = None
+
+                sheet_state = sheets[sheet_name]
+                if sheet_state is None:
+                    continue
+
+                # A sheet keeps the criteria of its first group (names are truncated, criteria are not)
+                settings = group["settings"]
+                if not matches_criteria(group, settings, sheet_state["combo"]):
+                    print(f"-- Group {group['group_id']} does not match criteria {sheet_name}, skipped")
+                    continue
+
+                # ETABS attributes for this group's beams only (one table read, not one query per beam)
+                frame_table = get_frame_table_for_names([beam["unique_name"] for beam in group["beams"]])
+                beams = [{"group_id": group["group_id"], "beam_data": beam, "settings": settings}
+                         for beam in group["beams"]]
+                group_beam_positions = layout_group(sheet_state["sheet"], template_sheet, group["group_id"], beams,
+                                                    sheet_state["groups"], sheet_state["combo"], frame_table)
+                sheet_state["groups"] += 1
+                position_count += store_beam_positions(positions_cursor, group_beam_positions)
+
+            print(f"-- Laid out {group_count} beam groups on {len(sheets)} sheets")
+            if group_count == 0:
+                print("-- No beam data found for Excel creation")
+
+            # Save the workbook; the positions are committed with it when the session closes
+            wb.save()
+            print("-- Structured Excel layout created and saved successfully")
+
+        print(f"-- Updated {position_count} beam positions in database")
 
         return True
 
@@ -296,15 +279,11 @@ def create_structured_excel_layout(excel_path, template_excel_path, db_path="fra
                 pass
 
 
-def process_group_layout(sheet, template_sheet, beams_by_group, combo):
+def process_group_layout(sheet, template_sheet, beams_by_group, combo, frame_table=None):
     """Processes beam groups and creates the structured layout, returns beam positions"""
     beam_positions = {}  # Dicționar pentru a stoca pozițiile grinzilor
 
     try:
-        # Start position for first group
-        start_row = 1
-        group_vertical_offset = 54  # Each group offset down by 54 cells
-
         # Get template sheet
         template_sheet = get_template_sheet(template_sheet)
 
@@ -312,20 +291,9 @@ def process_group_layout(sheet, template_sheet, beams_by_group, combo):
         sorted_groups = sorted(beams_by_group.items(), key=lambda x: x[0])
 
         for group_index, (group_id, beams) in enumerate(sorted_groups):
-            current_row = start_row + (group_index * group_vertical_offset)
-
-            print(f"-- Processing group {group_id} at row {current_row} with {len(beams)} beams")
-
-            # Process each beam in the group and capture positions
-            group_beam_positions = process_beams_in_group(
-                sheet, template_sheet, beams, current_row, group_id, combo
-            )
-
             # Adaugă pozițiile din acest grup la dicționarul principal
-            beam_positions.update(group_beam_positions)
-
-            # Add group separator or information
-            add_group_info(sheet, current_row, group_id, combo, len(beams))
+            beam_positions.update(
+                layout_group(sheet, template_sheet, group_id, beams, group_index, combo, frame_table))
 
         return beam_positions
 
@@ -336,7 +304,34 @@ def process_group_layout(sheet, template_sheet, beams_by_group, combo):
         return beam_positions
 
 
-def process_beams_in_group(sheet, template_sheet, beams, start_row, group_id, combo):
+def layout_group(sheet, template_sheet, group_id, beams, group_index, combo, frame_table=None):
+    """Lays out one group at its position on the sheet (template sheet already resolved), returns beam positions"""
+    # Start position for first group
+    start_row = 1
+    group_vertical_offset = 54  # Each group offset down by 54 cells
+
+    try:
+        current_row = start_row + (group_index * group_vertical_offset)
+
+        print(f"-- Processing group {group_id} at row {current_row} with {len(beams)} beams")
+
+        # Process each beam in the group and capture positions
+        group_beam_positions = process_beams_in_group(
+            sheet, template_sheet, beams, current_row, group_id, combo, frame_table
+        )
+
+        # Add group separator or information
+        add_group_info(sheet, current_row, group_id, combo, len(beams))
+        return group_beam_positions
+
+    except Exception as e:
+        print(f"⮽⮽ Error laying out group {group_id}: {e}")
+        import traceback
+        traceback.print_exc()
+        return {}
+
+
+def process_beams_in_group(sheet, template_sheet, beams, start_row, group_id, combo, frame_table=None):
     """Processes individual beams and returns their Excel positions"""
     beam_positions = {}
     horizontal_offset = 40
@@ -394,7 +389,7 @@ def process_beams_in_group(sheet, template_sheet, beams, start_row, group_id, co
         print(f"-- Beam {unique_name} positioned at {excel_col_letter}{excel_row}")
 
         # Populate beam data in the copied cells
-        populate_beam_data(sheet, beam, settings, start_row, beam_index, group_id)
+        populate_beam_data(sheet, beam, settings, start_row, beam_index, group_id, frame_table)
 
     return beam_positions
 
@@ -459,6 +454,8 @@ def copy_column_widths(source_range, dest_range):
 
 def copy_excel_file_with_column_widths(source_excel_path, destination_excel_path):
     """Creează o copie a unui fișier Excel folosind xlwings, păstrând toate formatările"""
+    import xlwings as xw
+
     app = None
     source_wb = None
     dest_wb = None
@@ -599,8 +596,12 @@ def copy_all_row_heights(source_sheet, dest_sheet):
         print(f"⮽⮽ Error copying all row heights: {e}")
 
 
-def populate_beam_data(sheet, beam, settings, start_row, beam_index, group_id):
-    """Populates beam-specific data in the copied cell ranges"""
+def populate_beam_data(sheet, beam, settings, start_row, beam_index, group_id, frame_table=None):
+    """
+    Populates beam-specific data in the copied cell ranges.
+    Beam properties come from frame_table (bulk ETABS extraction) when available,
+    otherwise ETABS is queried for this beam.
+    """
     try:
         # Calculate the horizontal position based on beam index
         if beam_index == 0:
@@ -624,18 +625,31 @@ def populate_beam_data(sheet, beam, settings, start_row, beam_index, group_id):
             'section': (3, 5),  # Row 3, Column E within the copied range
         }
 
-        # Get beam properties from ETABS
+        # Get beam properties from the bulk table or from ETABS
         try:
-            from etabs_api.operations import get_label_and_story, get_section_name, get_section_material, \
-                get_frame_length
+            if frame_table is not None and beam['unique_name'] in frame_table:
+                label = frame_table.get(beam['unique_name'], "Label")
+                story = frame_table.get(beam['unique_name'], "Story")
+                section_name = frame_table.get(beam['unique_name'], "Section", "N/A")
+                length = frame_table.get(beam['unique_name'], "Length", 0.0)
+
+                from etabs_api.sections import get_section_info
+                section = get_section_info(section_name)
+                material = section["material"] if section else "N/A"
+
+                print(
+                    f"-- Beam data (bulk): Label={label}, Story={story}, Section={section_name}, Material={material}, Length={length}")
+            else:
+                from etabs_api.operations import get_label_and_story, get_section_name, get_section_material, \
+                    get_frame_length
 
-            label, story = get_label_and_story(beam['unique_name'])
-            section_name = get_section_name(beam['unique_name'])
-            material = get_section_material(beam['unique_name'])
-            length = get_frame_length(beam['unique_name'])
+                label, story = get_label_and_story(beam['unique_name'])
+                section_name = get_section_name(beam['unique_name'])
+                material = get_section_material(beam['unique_name'])
+                length = get_frame_length(beam['unique_name'])
 
-            print(
-                f"-- Beam data: Label={label}, Story={story}, Section={section_name}, Material={material}, Length={length}")
+                print(
+                    f"-- Beam data: Label={label}, Story={story}, Section={section_name}, Material={material}, Length={length}")
 
         except Exception as e:
             print(f"⮽⮽ Error getting beam properties: {e}")
@@ -742,42 +756,11 @@ def get_sheet_combinations(beam_groups):
     combinations_dict = {}  # Use dict to ensure uniqueness by sheet name
 
     for group in beam_groups.get("groups", []):
-        settings = group.get("settings", {})
-
-        # Extract criteria (handle None values)
-        story = settings.get("etaj", "Unknown")
-        if story is None:
-            story = "Unknown"
-
-        scenario = group.get("scenario", "Unknown")
-        dir_x = settings.get("dir_x", "False").lower() == "true"
-        dir_y = settings.get("dir_y", "False").lower() == "true"
-        secondary = settings.get("secundare", "False").lower() == "true"
-
-        # Determine direction
-        if secondary:
-            direction = "Secondary"
-        elif dir_x and dir_y:
-            direction = "Both"
-        elif dir_x:
-            direction = "DirX"
-        elif dir_y:
-            direction = "DirY"
-        else:
-            direction = "NoDirection"
-
-        # Generate sheet name
-        sheet_name = generate_sheet_name(story, scenario, direction, secondary)
+        combo = group_sheet_combination(group)
 
         # Use sheet name as key to ensure uniqueness
-        if sheet_name not in combinations_dict:
-            combinations_dict[sheet_name] = {
-                "story": story,
-                "scenario": scenario,
-                "direction": direction,
-                "secondary": secondary,
-                "sheet_name": sheet_name
-            }
+        if combo["sheet_name"] not in combinations_dict:
+            combinations_dict[combo["sheet_name"]] = combo
 
     # Convert to list
     sheet_combinations = list(combinations_dict.values())
@@ -790,6 +773,41 @@ def get_sheet_combinations(beam_groups):
     return sheet_combinations
 
 
+def group_sheet_combination(group):
+    """Returns the sheet criteria (story, scenario, direction, secondary, sheet name) of one beam group"""
+    settings = group.get("settings", {})
+
+    # Extract criteria (handle None values)
+    story = settings.get("etaj", "Unknown")
+    if story is None:
+        story = "Unknown"
+
+    scenario = group.get("scenario", "Unknown")
+    dir_x = settings.get("dir_x", "False").lower() == "true"
+    dir_y = settings.get("dir_y", "False").lower() == "true"
+    secondary = settings.get("secundare", "False").lower() == "true"
+
+    # Determine direction
+    if secondary:
+        direction = "Secondary"
+    elif dir_x and dir_y:
+        direction = "Both"
+    elif dir_x:
+        direction = "DirX"
+    elif dir_y:
+        direction = "DirY"
+    else:
+        direction = "NoDirection"
+
+    return {
+        "story": story,
+        "scenario": scenario,
+        "direction": direction,
+        "secondary": secondary,
+        "sheet_name": generate_sheet_name(story, scenario, direction, secondary)
+    }
+
+
 def generate_sheet_name(story, scenario, direction, secondary):
     """Generates a sheet name based on criteria with shorter names for Excel compatibility"""
     parts = []
@@ -918,21 +936,10 @@ def create_dynamic_excel_sheets(excel_path, db_path="frames.db", template_excel_
 def update_database_with_excel_positions(db_path="frames.db"):
     """Actualizează baza de date cu pozițiile Excel pentru fiecare grindă"""
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Verifică dacă coloanele există deja (pentru compatibilitate)
-        cursor.execute("PRAGMA table_info(Frames)")
-        columns = [column[1] for column in cursor.fetchall()]
+        # Sesiunea aduce bazele de date mai vechi la schema curentă (coloanele Excel, indexuri, Groups)
+        with session(db_path) as conn:
+            print(f"-- Schema bazei de date: versiunea {get_schema_version(conn)}")
 
-        if 'ExcelColumn' not in columns:
-            print("-- Adăugare coloane Excel în baza de date...")
-            cursor.execute("ALTER TABLE Frames ADD COLUMN ExcelColumn TEXT")
-            cursor.execute("ALTER TABLE Frames ADD COLUMN ExcelRow INTEGER")
-            cursor.execute("ALTER TABLE Frames ADD COLUMN SheetName TEXT")
-
-        conn.commit()
-        conn.close()
         print("-- Baza de date este pregătită pentru pozițiile Excel")
         return True
 
@@ -941,34 +948,28 @@ def update_database_with_excel_positions(db_path="frames.db"):
         return False
 
 
+def store_beam_positions(cursor, beam_positions):
+    """Writes the Excel positions of a batch of beams with a single executemany, returns the rows updated"""
+    if not beam_positions:
+        return 0
+    cursor.executemany("""
+    UPDATE Frames 
+    SET ExcelColumn = ?, ExcelRow = ?, SheetName = ?
+    WHERE UniqueName = ?
+    """, ((position['column'], position['row'], position['sheet_name'], unique_name)
+          for unique_name, position in beam_positions.items()))
+    if cursor.rowcount < len(beam_positions):
+        print(f"⮽⮽ Could not find {len(beam_positions) - cursor.rowcount} beams in database")
+    return cursor.rowcount
+
+
 def update_beam_positions_in_database(beam_positions, db_path="frames.db"):
     """Actualizează baza de date cu pozițiile Excel colectate"""
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        updated_count = 0
-        for unique_name, position in beam_positions.items():
-            cursor.execute("""
-            UPDATE Frames 
-            SET ExcelColumn = ?, ExcelRow = ?, SheetName = ?
-            WHERE UniqueName = ?
-            """, (
-                position['column'],
-                position['row'],
-                position['sheet_name'],
-                unique_name
-            ))
-
-            if cursor.rowcount > 0:
-                updated_count += 1
-                print(
-                    f"-- Updated position for {unique_name}: {position['sheet_name']}!{position['column']}{position['row']}")
-            else:
-                print(f"⮽⮽ Could not find beam {unique_name} in database")
+        # One transaction, one executemany
+        with session(db_path) as conn:
+            updated_count = store_beam_positions(conn.cursor(), beam_positions)
 
-        conn.commit()
-        conn.close()
         print(f"-- Successfully updated {updated_count} beam positions in database")
         return True
 
@@ -977,6 +978,25 @@ def update_beam_positions_in_database(beam_positions, db_path="frames.db"):
         return False
 
 
+def get_frame_table_for_groups(beam_groups):
+    """Fetches ETABS attributes for every beam in the groups with a constant number of API calls"""
+    return get_frame_table_for_names(
+        [beam["unique_name"] for group in beam_groups.get("groups", []) for beam in group["beams"]])
+
+
+def get_frame_table_for_names(unique_names):
+    """Fetches ETABS attributes for the given beams with a constant number of API calls"""
+    try:
+        from etabs_api.tables import get_frame_assignments
+
+        # Only the columns populate_beam_data reads
+        return get_frame_assignments(unique_names, columns=("Label", "Story", "Section", "Length"))
+
+    except Exception as e:
+        print(f"⮽⮽ Bulk ETABS extraction failed, falling back to per-beam queries: {e}")
+        return None
+
+
 def get_template_sheet(template_wb):
     """Get the template sheet from the workbook"""
     try:
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import sqlite3
+
+from db.session import session
 
 class AlternativeWindow:
     def __init__(self, db_file_path):
@@ -8,7 +9,7 @@ class AlternativeWindow:
 
         self.root = tk.Tk()
         self.root.title("BEAM DESIGN BY CCO")  # Small title in window frame
-        self.root.geometry("500x550")  # Taller window (increased height)
+        self.root.geometry("500x630")  # Taller window (increased height)
 
         # Initialize Tkinter variables AFTER creating the root window
         self.excel_work_file = tk.StringVar()
@@ -23,7 +24,7 @@ class AlternativeWindow:
         """Center the window on screen"""
         self.root.update_idletasks()
         width = 500
-        height = 560
+        height = 640
         x = (self.root.winfo_screenwidth() // 2) - (width // 2)
         y = (self.root.winfo_screenheight() // 2) - (height // 2)
         self.root.geometry(f'{width}x{height}+{x}+{y}')
@@ -71,7 +72,25 @@ class AlternativeWindow:
         )
         btn_inject.pack(pady=5)
 
-        # Button 3: Overwrite DB to Excel
+        # Button 3: Inject DB to ETABS
+        btn_inject_etabs = ttk.Button(
+            buttons_container,
+            text="Injectare date DB ==> ETABS",
+            command=self.inject_db_to_etabs,
+            width=30
+        )
+        btn_inject_etabs.pack(pady=5)
+
+        # Button 4: Extract ETABS analysis / design results to DB
+        btn_results = ttk.Button(
+            buttons_container,
+            text="Extragere rezultate ETABS ==> DB",
+            command=self.extract_results_to_db,
+            width=30
+        )
+        btn_results.pack(pady=5)
+
+        # Button 5: Overwrite DB to Excel
         btn_overwrite = ttk.Button(
             buttons_container,
             text="Suprascriere date DB ==> EXCEL",
@@ -80,7 +99,7 @@ class AlternativeWindow:
         )
         btn_overwrite.pack(pady=5)
 
-        # Button 4: Create new Excel from DB
+        # Button 6: Create new Excel from DB
         btn_create_excel = ttk.Button(
             buttons_container,
             text="Creare fisier excel nou dupa DB",
@@ -142,28 +161,27 @@ class AlternativeWindow:
     def view_db_data(self):
         """Show all DB data in an interactive table"""
         try:
-            # Connect to database
-            conn = sqlite3.connect(self.db_file_path)
-            cursor = conn.cursor()
+            # Shared session for the database (same connection as the db / excel layers)
+            with session(self.db_file_path, readonly=True) as conn:
+                cursor = conn.cursor()
 
-            # Get all tables
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-            tables = cursor.fetchall()
+                # Get all tables
+                cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+                tables = cursor.fetchall()
 
-            if not tables:
-                messagebox.showinfo("Info", "⮽⮽ Nu exista tabele in baza de date.")
-                return
-
-            # For simplicity, show data from the first table
-            table_name = tables[0][0]
-            cursor.execute(f"SELECT * FROM {table_name}")
-            rows = cursor.fetchall()
+                if not tables:
+                    messagebox.showinfo("Info", "⮽⮽ Nu exista tabele in baza de date.")
+                    return
 
-            # Get column names
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = [column[1] for column in cursor.fetchall()]
+                # Show the Frames table (or the first table if there is none)
+                table_names = [table[0] for table in tables]
+                table_name = "Frames" if "Frames" in table_names else table_names[0]
+                cursor.execute(f"SELECT * FROM {table_name}")
+                rows = cursor.fetchall()
 
-            conn.close()
+                # Get column names
+                cursor.execute(f"PRAGMA table_info({table_name})")
+                columns = [column[1] for column in cursor.fetchall()]
 
             # Show interactive table
             self.show_interactive_table(columns, rows, f"Date din tabelul: {table_name}")
@@ -226,6 +244,33 @@ class AlternativeWindow:
         messagebox.showinfo("Info", "Functia 'Injectare date EXCEL ==> DB' va fi implementata.")
         # Placeholder for Excel injection functionality
 
+    def inject_db_to_etabs(self):
+        """Inject DB target values into ETABS (dry run first, then apply after confirmation)"""
+        try:
+            from etabs_api.injector import inject_to_etabs, apply_plan
+            plan = inject_to_etabs(self.db_file_path, dry_run=True)
+            if not len(plan):
+                messagebox.showinfo("Info", "Modelul ETABS este deja la zi cu baza de date.")
+                return
+            if messagebox.askyesno("Confirmare injectare", f"{plan.summary()}\n\nAplicati modificarile in ETABS?"):
+                applied = apply_plan(plan)
+                messagebox.showinfo("Succes", f"Aplicate {applied} / {len(plan)} modificari in ETABS.")
+        except Exception as e:
+            print(f"⮽⮽ Eroare la injectarea in ETABS: {e}")
+            messagebox.showerror("Eroare", f"Eroare: {e}")
+
+    def extract_results_to_db(self):
+        """Extract frame forces and concrete design results from ETABS into the DB (explicit step)"""
+        try:
+            from db.operations import store_analysis_results
+            if store_analysis_results(self.db_file_path):
+                messagebox.showinfo("Succes", "Rezultatele ETABS au fost salvate in baza de date.")
+            else:
+                messagebox.showerror("Eroare", "Rezultatele ETABS nu au putut fi extrase.")
+        except Exception as e:
+            print(f"⮽⮽ Eroare la extragerea rezultatelor ETABS: {e}")
+            messagebox.showerror("Eroare", f"Eroare: {e}")
+
     def overwrite_db_to_excel(self):
         """Overwrite Excel file with DB data"""
         messagebox.showinfo("Info", "Functia 'Suprascriere date DB ==> EXCEL' va fi implementata.")
@@ -3,10 +3,14 @@ from tkinter import ttk, filedialog, messagebox
 import sys
 import os
 import json
-import sqlite3
 from datetime import datetime
-from etabs_api.connection import get_sap_model
-sap_model = get_sap_model()
+from db.session import close_connections
+from etabs_api.connection import lazy_sap_model
+from etabs_api.executor import get_executor, shutdown_executor
+from etabs_api.instrumentation import instrumented_stage
+from etabs_api.selection import AdaptiveInterval, SelectionTracker
+# Conexiunea la ETABS se face la primul apel real, nu la import
+sap_model = lazy_sap_model
 
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -39,13 +43,13 @@ except ImportError:
 # Importă operațiuni Excel direct
 try:
     from excel.operations import *
-except ImportError:
+except ImportError as e:
     print(f"⮽⮽ Avertisment de import operatiuni EXCEL: {e}")
 
 # Importă operațiuni bază de date direct
 try:
     from db.operations import create_database
-except ImportError:
+except ImportError as e:
     print(f"⮽⮽ Avertisment de import operatiuni Baza de Date : {e}")
 
 
@@ -102,6 +106,14 @@ class DesignApp:
         self.all_beam_groups_b = []  # Pentru Suprastructură
         self.current_scenario = None
         self.tracking_id = None
+        self.tracking_generation = 0
+        # Selecția se urmărește prin diferențe, cu interval care crește cât timp nu se schimbă nimic
+        self.selection_tracker = SelectionTracker()
+        self.tracking_interval = AdaptiveInterval()
+
+        # ==================== FIR ETABS DEDICAT ====================
+        # Apelurile ETABS lungi rulează pe un fir separat ca GUI-ul să rămână responsiv
+        self.executor = get_executor(self.root)
 
         # ==================== CONTAINER PRINCIPAL ====================
         container = ttk.Frame(self.root)
@@ -123,14 +135,10 @@ class DesignApp:
         self.story_var = tk.StringVar()
         self.story_dropdown = ttk.Combobox(container, textvariable=self.story_var, state="readonly")
 
-        # Umple dropdown cu etaje din ETABS
-        try:
-            stories = etabs_api.operations.get_story_names()
-            self.story_dropdown['values'] = stories
-            print(f"-- Încărcat {len(stories)} etaje din ETABS")
-        except Exception as e:
-            print(f"⮽⮽ Eroare la încărcarea etajelor: {e}")
-            self.story_dropdown['values'] = []
+        # Umple dropdown cu etaje din ETABS (citite pe firul ETABS)
+        self.story_dropdown['values'] = []
+        self.executor.submit(etabs_api.operations.get_story_names, callback=self.fill_story_dropdown,
+                             errback=lambda error: print(f"⮽⮽ Eroare la încărcarea etajelor: {error}"))
 
         self.story_dropdown.pack(pady=5)
         self.story_dropdown.bind('<<ComboboxSelected>>', self.update_etaj_value)
@@ -164,11 +172,9 @@ class DesignApp:
         )
         self.scenario_b.frame.grid(row=0, column=1, padx=20, pady=10, sticky="n")
 
-        # Umple listbox-uri cu combinații
-        self.fill_listbox(self.scenario_a.list_upper)
-        self.fill_listbox(self.scenario_a.list_lower)
-        self.fill_listbox(self.scenario_b.list_upper)
-        self.fill_listbox(self.scenario_b.list_lower)
+        # Umple listbox-uri cu combinații (numele sunt citite o singură dată, pe firul ETABS)
+        self.fill_listboxes([self.scenario_a.list_upper, self.scenario_a.list_lower,
+                             self.scenario_b.list_upper, self.scenario_b.list_lower])
 
         # ==================== BUTOANE CONTROL ====================
         self.control_buttons = ControlButtons(
@@ -228,30 +234,6 @@ class DesignApp:
             return
 
         try:
-            # Creează nume de fișier cu timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-            # Obține numele modelului ETABS
-            try:
-                model_name = sap_model.GetModelFilename()
-                # Extrage doar numele fișierului fără cale
-                model_basename = os.path.basename(model_name)
-                model_basename = model_basename.replace('.edb', '')
-            except Exception as e:
-                print(f"⮽⮽ Eroare la obținerea numelui modelului: {e}")
-                model_basename = "ETABS_Model"
-
-            excel_filename = f"{model_basename} - grinzi ({timestamp}).xlsx"
-            excel_path = os.path.join(result_folder, excel_filename)
-
-            # Creează nume pentru baza de date cu același timestamp
-            db_filename = f"{model_basename} - grinzi DB - ({timestamp}).db"
-            db_path = os.path.join(result_folder, db_filename)
-
-            print(f"-- Folder rezultate: {result_folder}")
-            print(f"-- Cale Excel finală: {excel_path}")
-            print(f"-- Cale DB finală: {db_path}")
-
             # Pas 1: Creează baza de date LOCALĂ cu toate grinzile selectate
             print("-- Creare bază de date locală cu grinzile selectate")
             all_beams = []
@@ -264,81 +246,140 @@ class DesignApp:
                 messagebox.showerror("⮽⮽ Eroare", "Nu sunt grinzi selectate pentru a crea baza de date!")
                 return
 
-            # Creează baza de date locală
-            success = create_database(all_beams)
+            # Numele modelului și baza de date locală se obțin pe firul ETABS; pașii Excel continuă când sunt gata
+            self.executor.submit_batch(
+                [(self.get_model_basename,), (create_database, (all_beams,))],
+                callback=lambda results: self.finish_create_excel(results[1], default_file, result_folder,
+                                                                  results[0]),
+                errback=lambda error: messagebox.showerror("⮽⮽ Eroare", f"Eroare la crearea bazei de date: {error}")
+            )
+
+        except Exception as e:
+            print(f"⮽⮽ Eroare la crearea Excel-ului: {e}")
+            messagebox.showerror("Eroare", f"Eroare: {e}")
+
+    def get_model_basename(self):
+        """Numele modelului ETABS fără cale și extensie (rulează pe firul ETABS)"""
+        try:
+            model_name = sap_model.GetModelFilename()
+            # Extrage doar numele fișierului fără cale
+            model_basename = os.path.basename(model_name)
+            return model_basename.replace('.edb', '')
+        except Exception as e:
+            print(f"⮽⮽ Eroare la obținerea numelui modelului: {e}")
+            return "ETABS_Model"
+
+    def finish_create_excel(self, success, default_file, result_folder, model_basename):
+        """Continuă crearea Excel-ului după ce baza de date a fost creată pe firul ETABS"""
+        try:
             if not success:
                 messagebox.showerror("⮽⮽ Eroare", "Nu s-a putut crea baza de date locală!")
                 return
 
             print("✓✓ Bază de date locală creată cu succes!")
 
-            # Pas 2: Copy the template file to new location with preserved formatting
-            print("-- Copiere fișier template la locația nouă (cu păstrarea formatărilor)")
-            try:
-                from excel.operations import copy_excel_file_with_column_widths
-                copy_success = copy_excel_file_with_column_widths(default_file, excel_path)
-                if not copy_success:
-                    messagebox.showerror("⮽⮽ Eroare", "Nu s-a putut copia fișierul template!")
-                    return
-            except ImportError:
-                # Fallback to original method if new function is not available
-                from excel.operations import copy_excel_file
-                copy_success = copy_excel_file(default_file, excel_path)
-                if not copy_success:
-                    messagebox.showerror("⮽⮽ Eroare", "Nu s-a putut copia fișierul template!")
-                    return
-
-            # Pas 3: Create Excel with structured layout
-            print("-- Creare schelet Excel cu datele grinzilor")
-            try:
-                # Use the new structured layout
-                from excel.operations import create_structured_excel_layout
-                excel_success = create_structured_excel_layout(
-                    excel_path=excel_path,
-                    template_excel_path=default_file,  # Use the default file as template
-                    db_path="frames.db"
-                )
-                if not excel_success:
-                    messagebox.showerror("⮽⮽ Eroare", "Nu s-a putut crea structura Excel!")
-                    return
-            except Exception as e:
-                print(f"⮽⮽ Eroare la crearea Excel-ului structurat: {e}")
-                messagebox.showerror("⮽⮽ Eroare", f"Eroare la crearea Excel-ului: {e}")
-                return
+            # Creează nume de fișier cu timestamp
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            excel_filename = f"{model_basename} - grinzi ({timestamp}).xlsx"
+            excel_path = os.path.join(result_folder, excel_filename)
 
-            # Pas 4: Create Excel skeleton with beam data
-            print("-- Creare schelet Excel cu datele grinzilor")
-            try:
-                # Use the new structured layout instead of dynamic sheets
-                from excel.operations import create_structured_excel_layout
-                excel_success = create_structured_excel_layout(
-                    excel_path=excel_path,
-                    template_excel_path=default_file,  # Use the default file as template
-                    db_path="frames.db"
-                )
-                if not excel_success:
-                    messagebox.showerror("⮽⮽ Eroare", "Nu s-a putut crea structura Excel!")
-                    return
-            except ImportError as e:
-                print(f"⮽⮽ Eroare la importul funcției create_structured_excel_layout: {e}")
-                messagebox.showerror("⮽⮽ Eroare", f"Funcția de creare structurată nu este disponibilă: {e}")
-                return
+            # Creează nume pentru baza de date cu același timestamp
+            db_filename = f"{model_basename} - grinzi DB - ({timestamp}).db"
+            db_path = os.path.join(result_folder, db_filename)
 
-            # Afișează mesaj de succes
-            print(f"✓✓ Proces completat cu succes!")
-            messagebox.showinfo("✓✓ Succes",
-                                f"Proces completat cu succes!\n\n"
-                                f"Fișier Excel creat:\n{excel_path}\n\n"
-                                f"Bază de date creată:\n{db_path}")
+            print(f"-- Folder rezultate: {result_folder}")
+            print(f"-- Cale Excel finală: {excel_path}")
+            print(f"-- Cale DB finală: {db_path}")
+
+            # Excel-ul citește atributele grinzilor din ETABS, deci se construiește pe firul ETABS
+            self.executor.submit(
+                self.build_excel_file, default_file, excel_path,
+                callback=lambda error: self.show_excel_result(error, excel_path, db_path),
+                errback=lambda error: messagebox.showerror("⮽⮽ Eroare", f"Eroare la crearea Excel-ului: {error}")
+            )
 
         except Exception as e:
             print(f"⮽⮽ Eroare la crearea Excel-ului: {e}")
             messagebox.showerror("Eroare", f"Eroare: {e}")
 
+    def build_excel_file(self, default_file, excel_path):
+        """Copiază template-ul și creează structura Excel (rulează pe firul ETABS).
+
+        Returnează mesajul de eroare pentru utilizator, sau None dacă Excel-ul a fost creat.
+        """
+        # Pas 2: Copy the template file to new location with preserved formatting
+        print("-- Copiere fișier template la locația nouă (cu păstrarea formatărilor)")
+        try:
+            from excel.operations import copy_excel_file_with_column_widths
+            copy_success = copy_excel_file_with_column_widths(default_file, excel_path)
+        except ImportError:
+            # Fallback to original method if new function is not available
+            from excel.operations import copy_excel_file
+            copy_success = copy_excel_file(default_file, excel_path)
+        if not copy_success:
+            return "Nu s-a putut copia fișierul template!"
+
+        # Pas 3: Create Excel with structured layout
+        print("-- Creare schelet Excel cu datele grinzilor")
+        try:
+            # Use the new structured layout
+            from excel.operations import create_structured_excel_layout
+            excel_success = create_structured_excel_layout(
+                excel_path=excel_path,
+                template_excel_path=default_file,  # Use the default file as template
+                db_path="frames.db"
+            )
+            if not excel_success:
+                return "Nu s-a putut crea structura Excel!"
+        except Exception as e:
+            print(f"⮽⮽ Eroare la crearea Excel-ului structurat: {e}")
+            return f"Eroare la crearea Excel-ului: {e}"
+
+        # Pas 4: Create Excel skeleton with beam data
+        print("-- Creare schelet Excel cu datele grinzilor")
+        try:
+            # Use the new structured layout instead of dynamic sheets
+            from excel.operations import create_structured_excel_layout
+            excel_success = create_structured_excel_layout(
+                excel_path=excel_path,
+                template_excel_path=default_file,  # Use the default file as template
+                db_path="frames.db"
+            )
+            if not excel_success:
+                return "Nu s-a putut crea structura Excel!"
+        except ImportError as e:
+            print(f"⮽⮽ Eroare la importul funcției create_structured_excel_layout: {e}")
+            return f"Funcția de creare structurată nu este disponibilă: {e}"
+        return None
+
+    def show_excel_result(self, error, excel_path, db_path):
+        """Afișează rezultatul creării Excel-ului (pe firul Tk)"""
+        if error:
+            messagebox.showerror("⮽⮽ Eroare", error)
+            return
+
+        # Afișează mesaj de succes
+        print(f"✓✓ Proces completat cu succes!")
+        messagebox.showinfo("✓✓ Succes",
+                            f"Proces completat cu succes!\n\n"
+                            f"Fișier Excel creat:\n{excel_path}\n\n"
+                            f"Bază de date creată:\n{db_path}")
+
     def close_application(self):
         """Închide aplicația și șterge fișierele temporare locale"""
         print("-- Închidere aplicația...")
 
+        # Oprește tracking
+        if hasattr(self, 'beam_selection_active') and self.beam_selection_active:
+            self.stop_beam_selection()
+
+        # Cererile ETABS încă neîncepute se anulează; grinzile ascunse sunt arătate și grupul temporar
+        # șters pe firul ETABS, care este oprit (așteptând cererea în curs) înainte de ștergerea fișierelor
+        self.executor.cancel_pending()
+        self.executor.submit(etabs_api.operations.cleanup_hidden_frames,
+                             errback=lambda error: print(f"⮽⮽ Nu am putut curăța grupul temporar din ETABS: {error}"))
+        shutdown_executor(wait=True)
+
         # Șterge fișierul temporar JSON
         if os.path.exists("beam_selection_temp.json"):
             try:
@@ -347,17 +388,15 @@ class DesignApp:
             except Exception as e:
                 print(f"⮽⮽ Nu am putut șterge fișierul temporar JSON: {e}")
 
-        # Șterge baza de date locală
-        if os.path.exists("frames.db"):
-            try:
-                os.remove("frames.db")
-                print("✓✓ Baza de date locală ștearsă")
-            except Exception as e:
-                print(f"⮽⮽ Nu am putut șterge baza de date locală: {e}")
-
-        # Oprește tracking
-        if hasattr(self, 'beam_selection_active') and self.beam_selection_active:
-            self.stop_beam_selection()
+        # Șterge baza de date locală (și copia de la rularea anterioară); conexiunile deschise se închid întâi
+        close_connections()
+        for db_file in ("frames.db", "frames.db.prev"):
+            if os.path.exists(db_file):
+                try:
+                    os.remove(db_file)
+                    print(f"✓✓ Baza de date locală {db_file} ștearsă")
+                except Exception as e:
+                    print(f"⮽⮽ Nu am putut șterge baza de date locală {db_file}: {e}")
 
         print("-- Aplicația se închide...")
         self.root.destroy()
@@ -377,6 +416,7 @@ class DesignApp:
             print("-- Fișier temporar șters")
 
         # Șterge fișierul bazei de date locale
+        close_connections("frames.db")
         if os.path.exists("frames.db"):
             os.remove("frames.db")
             print("-- Baza de date locală ștearsă")
@@ -399,7 +439,7 @@ class DesignApp:
         }
 
         # Șterge selecția ETABS
-        etabs_api.operations.clear_frame_selection()
+        self.hide_and_clear_selection()
 
         # Actualizează butoanele
         self.update_scenario_buttons("A")
@@ -410,7 +450,11 @@ class DesignApp:
     def check_selection(self):
         """Afișează sumarul tuturor grinzilor selectate"""
         print("-- Verificare date grinzi...")
-        summary_data = self.get_detailed_summary_data()
+        # Datele din ETABS se citesc pe firul dedicat; popup-ul se deschide când sunt gata
+        self.executor.submit(self.get_detailed_summary_data, callback=self.show_summary_popup)
+
+    def show_summary_popup(self, summary_data):
+        """Afișează popup-ul de sumar cu datele obținute pe firul ETABS"""
         if summary_data and summary_data.get("scenarios"):
             SimpleSummaryPopup(self.root, summary_data)
         else:
@@ -439,7 +483,7 @@ class DesignApp:
 
         # Rest of the method remains the same...
         # Șterge orice selecție anterioară în ETABS
-        etabs_api.operations.clear_frame_selection()
+        self.hide_and_clear_selection()
 
         print(f"-- Început selecție grinzi pentru {scenario}")
         print(f"-- Stare butoane la începutul selecției: {current_state['button_states']}")
@@ -454,57 +498,79 @@ class DesignApp:
     def start_tracking(self):
         """Începe urmărirea selecțiilor de grinzi"""
         if self.beam_selection_active:
-            self.track_beam_selections()
-
-    # def track_beam_selections(self):
-    #     """Urmărește selecțiile de grinzi în ETABS în timp real"""
-    #     if not self.beam_selection_active:
-    #         return
-    #
-    #     try:
-    #         # Obține frame-urile selectate din ETABS
-    #         selected_frames = etabs_api.operations.get_selected_frames_live()
-    #
-    #         # Actualizează grupul curent cu toate frame-urile selectate
-    #         self.current_beam_group = selected_frames.copy()
-    #
-    #         if selected_frames:
-    #             print(f"-- Grinzi selectate curent ({len(selected_frames)}): {selected_frames}")
-    #
-    #         # Continuă urmărirea
-    #         self.tracking_id = self.root.after(500, self.track_beam_selections)
-    #
-    #     except Exception as e:
-    #         print(f"⮽⮽ Eroare la urmărirea grinzilor: {e}")
-    #         self.tracking_id = self.root.after(500, self.track_beam_selections)
-    def track_beam_selections(self):
-        """Urmărește selecțiile de grinzi în ETABS în timp real"""
-        if not self.beam_selection_active:
+            self.tracking_generation += 1
+            self.tracking_interval.reset()
+            # Resetarea rulează pe firul ETABS, înaintea primei verificări
+            self.executor.submit(self.selection_tracker.reset, self.current_beam_group)
+            self.track_beam_selections(self.tracking_generation)
+
+    def track_beam_selections(self, generation):
+        """Urmărește selecțiile de grinzi în ETABS (interogarea rulează pe firul ETABS)"""
+        if not self.beam_selection_active or generation != self.tracking_generation:
             return
 
-        try:
-            # Obține frame-urile selectate din ETABS
-            selected_frames = etabs_api.operations.get_selected_frames_live()
+        self.tracking_id = None
+        self.executor.submit(
+            self.selection_tracker.poll,
+            callback=lambda delta: self.on_selection_delta(delta, generation),
+            errback=lambda error: self.on_tracking_error(error, generation)
+        )
 
-            # Verifică dacă selecția s-a schimbat față de ultima apelare
-            if set(selected_frames) != set(self.current_beam_group):
-                # Actualizează grupul curent doar dacă s-a schimbat
-                self.current_beam_group = selected_frames.copy()
+    def apply_selection_delta(self, delta):
+        """Aplică grinzile adăugate / scoase din selecție peste grupul curent"""
+        if not delta:
+            return
+        removed = set(delta.removed)
+        self.current_beam_group = [name for name in self.current_beam_group if name not in removed]
+        present = set(self.current_beam_group)
+        self.current_beam_group.extend(name for name in delta.added if name not in present)
+
+        changes = []
+        if delta.added:
+            changes.append(f"+{len(delta.added)} {delta.added[:10]}{' ...' if len(delta.added) > 10 else ''}")
+        if delta.removed:
+            changes.append(f"-{len(delta.removed)} {delta.removed[:10]}{' ...' if len(delta.removed) > 10 else ''}")
+        print(f"-- Selecție grinzi ({len(self.current_beam_group)}): {', '.join(changes)}")
+
+    def on_selection_delta(self, delta, generation):
+        """Primește diferența selecției de la firul ETABS și programează următoarea verificare"""
+        if not self.beam_selection_active or generation != self.tracking_generation:
+            return
 
-                if selected_frames:
-                    print(f"-- Grinzi selectate curent ({len(selected_frames)}): {selected_frames}")
-                else:
-                    print("-- Nicio grindă selectată")
+        self.apply_selection_delta(delta)
 
-            # Continuă urmărirea
-            self.tracking_id = self.root.after(500, self.track_beam_selections)
+        # Interval scurt imediat după o schimbare, tot mai lung cât timp selecția rămâne la fel
+        delay = self.tracking_interval.next(bool(delta))
+        self.tracking_id = self.root.after(delay, lambda: self.track_beam_selections(generation))
 
-        except Exception as e:
-            print(f"⮽⮽ Eroare la urmărirea grinzilor: {e}")
-            self.tracking_id = self.root.after(500, self.track_beam_selections)
+    def on_tracking_error(self, error, generation):
+        """Gestionează erorile interogării selecției și continuă urmărirea"""
+        print(f"⮽⮽ Eroare la urmărirea grinzilor: {error}")
+        if self.beam_selection_active and generation == self.tracking_generation:
+            delay = self.tracking_interval.next(False)
+            self.tracking_id = self.root.after(delay, lambda: self.track_beam_selections(generation))
+
+    def refresh_selection_then(self, action):
+        """Citește ultima selecție din ETABS înainte de action (intervalul adaptiv poate fi de până la 2 s)"""
+        if not self.beam_selection_active:
+            action()
+            return
+        generation = self.tracking_generation
+
+        def apply_and_continue(delta):
+            if self.beam_selection_active and generation == self.tracking_generation:
+                self.apply_selection_delta(delta)
+            action()
+
+        def continue_on_error(error):
+            print(f"⮽⮽ Selecția nu a putut fi reîmprospătată: {error}")
+            action()
+
+        self.executor.submit(self.selection_tracker.poll, callback=apply_and_continue, errback=continue_on_error)
 
     def stop_tracking(self):
         """Oprește urmărirea selecției grinzilor"""
+        self.tracking_generation += 1
         if self.tracking_id:
             self.root.after_cancel(self.tracking_id)
             self.tracking_id = None
@@ -531,6 +597,10 @@ class DesignApp:
     def handle_confirm_continue(self):
         """Gestionează apăsarea butonului 'Confirmă și continuă'"""
         print("Confirmă și continuă")
+        self.refresh_selection_then(self.finish_confirm_continue)
+
+    def finish_confirm_continue(self):
+        """Confirmă grupul după ce selecția a fost citită din ETABS"""
         if self.confirm_and_continue():
             if self.confirmation_dialog:
                 group_count = len(self.all_beam_groups_a if self.current_scenario == "A" else self.all_beam_groups_b)
@@ -548,6 +618,10 @@ class DesignApp:
     def handle_confirm_stop(self):
         """Gestionează apăsarea butonului 'Confirmă și oprește'"""
         print("Confirmă și oprește")
+        self.refresh_selection_then(self.finish_confirm_stop)
+
+    def finish_confirm_stop(self):
+        """Confirmă grupul final după ce selecția a fost citită din ETABS"""
         if self.confirm_and_stop():
             if self.confirmation_dialog:
                 self.confirmation_dialog.close_dialog()
@@ -584,15 +658,8 @@ class DesignApp:
             # Salvează în fișier temporar CU STARE CAPTURATĂ LA ÎNCEPUT
             self.save_temp_data_with_selection_state(self.current_scenario, current_groups, selection_state)
 
-            # Ascunde grinzile
-            success = etabs_api.operations.hide_specific_frames(self.current_beam_group)
-            if success:
-                print("-- Grinzi ascunse cu succes în ETABS")
-            else:
-                print("⮽⮽ Metoda de ascundere a eșuat")
-
-            # Șterge selecția pentru următorul grup
-            etabs_api.operations.clear_frame_selection()
+            # Ascunde grinzile și șterge selecția pentru următorul grup
+            self.hide_and_clear_selection(self.current_beam_group)
             self.current_beam_group = []
 
             print("-- Gata pentru selecția următorului grup de grinzi...")
@@ -626,11 +693,12 @@ class DesignApp:
             # Salvează în fișier temporar CU STARE CAPTURATĂ LA ÎNCEPUT
             self.save_temp_data_with_selection_state(self.current_scenario, current_groups, selection_state)
 
-            # Ascunde grinzile
-            etabs_api.operations.hide_specific_frames(self.current_beam_group)
+            # Ascunde grinzile și șterge selecția
+            self.hide_and_clear_selection(self.current_beam_group)
+        else:
+            self.hide_and_clear_selection()
 
-        # Șterge selecția și oprește
-        etabs_api.operations.clear_frame_selection()
+        # Oprește selecția
         self.stop_beam_selection()
 
         # Clean up the stored selection state
@@ -644,7 +712,7 @@ class DesignApp:
         print("-- Selecție anulată")
 
         # Șterge selecția în ETABS
-        etabs_api.operations.clear_frame_selection()
+        self.hide_and_clear_selection()
         self.current_beam_group = []
         self.stop_beam_selection()
 
@@ -654,11 +722,42 @@ class DesignApp:
 
         return True
 
-    def fill_listbox(self, listbox):
+    def fill_listboxes(self, listboxes):
+        """Citește combinațiile pe firul ETABS și umple listbox-urile date când sunt gata"""
+        def fill_all(names):
+            for listbox in listboxes:
+                self.fill_listbox(listbox, names)
+
+        self.executor.submit(etabs_api.operations.get_comb_names, callback=fill_all,
+                             errback=lambda error: print(f"⮽⮽ Eroare la încărcarea combinațiilor: {error}"))
+
+    def fill_listbox(self, listbox, names):
         """Umple listbox-ul dat cu combinații de proiectare"""
-        for i in etabs_api.operations.get_comb_names():
+        for i in names:
             listbox.insert(tk.END, f"{i}")
 
+    def fill_story_dropdown(self, stories):
+        """Umple dropdown-ul de etaje cu numele citite pe firul ETABS"""
+        self.story_dropdown['values'] = stories
+        print(f"-- Încărcat {len(stories)} etaje din ETABS")
+
+    def hide_and_clear_selection(self, beam_group=None):
+        """Ascunde grinzile confirmate și golește selecția ETABS, pe firul ETABS (în ordinea cererilor)"""
+        calls = []
+        if beam_group:
+            calls.append((etabs_api.operations.hide_specific_frames, (list(beam_group),)))
+        calls.append((etabs_api.operations.clear_frame_selection,))
+        self.executor.submit_batch(
+            calls,
+            callback=lambda results: self.on_frames_hidden(results[0]) if beam_group else None,
+            errback=lambda error: print(f"⮽⮽ Eroare la ascunderea grinzilor / golirea selecției: {error}"))
+
+    def on_frames_hidden(self, success):
+        if success:
+            print("-- Grinzi ascunse cu succes în ETABS")
+        else:
+            print("⮽⮽ Metoda de ascundere a eșuat")
+
     def set_variant(self, scenario, variant):
         """Gestionează apăsarea butoanelor de variantă"""
         scenario_obj = self.scenario_a if scenario == "A" else self.scenario_b
@@ -907,6 +1006,7 @@ class DesignApp:
             # Fallback to old method if there's an error
             return self._get_detailed_summary_data_fallback()
 
+    @instrumented_stage("get_detailed_summary_data")
     def get_detailed_summary_data(self):
         """Returnează datele detaliate pentru verificare - folosește setările din JSON"""
         try:
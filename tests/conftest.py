@@ -0,0 +1,43 @@
+"""Fixturi comune: modelul ETABS simulat și un folder de lucru temporar pentru frames.db"""
+import os
+import sys
+
+import pytest
+
+# Modulele aplicației sunt la rădăcina depozitului (fără pachet instalabil)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Folder de lucru curent (frames.db, beam_selection_temp.json); conexiunile se închid la final"""
+    from db.session import close_connections
+
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    close_connections()
+
+
+@pytest.fixture
+def fake_model():
+    """FakeSapModel folosit ca SapModel curent, cu cache-urile de model golite"""
+    from etabs_api.connection import reset_connection, set_sap_model
+    from etabs_api.fake_model import FakeSapModel, generate_model
+    from etabs_api.operations import invalidate_caches
+
+    model = FakeSapModel(generate_model(600, seed=0))
+    set_sap_model(model)
+    invalidate_caches()
+    yield model
+    invalidate_caches()
+    reset_connection()
+
+
+@pytest.fixture
+def beams(fake_model, workdir):
+    """Grinzile modelului simulat, scrise în beam_selection_temp.json"""
+    from etabs_api.fake_model import _write_selection_json
+
+    names = [name for name, frame in fake_model.data.frames.items() if frame["label"].startswith("B")][:120]
+    _write_selection_json("beam_selection_temp.json", names, group_size=20)
+    return names
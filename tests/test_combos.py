@@ -0,0 +1,31 @@
+from etabs_api.combos import ComboCatalogue, _read_definitions_per_combo, get_combo_catalogue
+from etabs_api.operations import get_comb_names
+
+
+def test_comb_names_use_a_single_name_list_call(fake_model):
+    for _ in range(4):
+        names = get_comb_names()
+
+    assert names == list(fake_model.data.combos)
+    assert fake_model.call_counts["RespCombo.GetNameList"] == 1
+    assert fake_model.call_counts["RespCombo.GetCaseList"] == 0
+    assert fake_model.call_counts["DatabaseTables.GetTableForDisplayArray"] == 0
+
+
+def test_definitions_are_read_lazily_from_one_table(fake_model):
+    catalogue = get_combo_catalogue()
+    fake_model.reset_counts()
+
+    assert catalogue.combo_type("ENV SEISM") == "Envelope"
+    assert catalogue.expand("SEISM EX+") == {"DEAD": 1.0, "SDEAD": 1.0, "LIVE": 0.3, "EX": 1.0}
+    assert catalogue.combos_containing("EY") == ["SEISM EY+", "SEISM EY-", "ENV SEISM"]
+    assert dict(fake_model.call_counts) == {"DatabaseTables.GetTableForDisplayArray": 1}
+
+
+def test_table_definitions_match_per_combo_calls(fake_model):
+    names = get_comb_names()
+    from_table = get_combo_catalogue()
+    per_combo = ComboCatalogue(names, loader=_read_definitions_per_combo)
+
+    assert from_table.definitions == per_combo.definitions
+    assert from_table.combo_types == per_combo.combo_types
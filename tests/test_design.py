@@ -0,0 +1,43 @@
+from etabs_api.design import DESIGN_GROUP_NAME, extract_beam_design
+from etabs_api.results import extract_frame_forces, temporary_frame_group
+
+
+def _beam_names(fake_model, count=40):
+    return [name for name, frame in fake_model.data.frames.items() if frame["label"].startswith("B")][:count]
+
+
+def test_design_shares_forces_group(fake_model):
+    names = _beam_names(fake_model)
+    fake_model.reset_counts()
+    with temporary_frame_group(names) as group_name:
+        forces = extract_frame_forces({name: ["ULS1"] for name in names}, group_name)
+        design = extract_beam_design(names, group_name)
+
+    # Un singur grup temporar pentru ambele extrageri, un apel pe fiecare
+    assert fake_model.call_counts["DatabaseTables.SetTableForEditingArray"] == 1
+    assert fake_model.call_counts["Results.FrameForce"] == 1
+    assert fake_model.call_counts["DesignConcrete.GetSummaryResultsBeam"] == 1
+    assert len(forces) == len(names)
+    assert 0 < len(design) <= len(names)
+
+
+def test_design_results_per_beam(fake_model):
+    names = _beam_names(fake_model)
+    fake_model.reset_counts()
+    design = extract_beam_design(names[:10])
+
+    assert fake_model.call_counts["DesignConcrete.GetSummaryResultsBeam"] == 1
+    assert DESIGN_GROUP_NAME not in fake_model.data.groups
+    assert set(name for name, _ in design.items()) <= set(names[:10])
+    for _, entry in design.items():
+        assert len(entry["Location"]) == len(entry["TopArea"]) == len(entry["TopCombo"]) > 0
+        assert (entry["Location"][1:] >= entry["Location"][:-1]).all()
+
+
+def test_design_unavailable(fake_model):
+    fake_model.data.design_available = False
+    fake_model.reset_counts()
+
+    assert len(extract_beam_design(_beam_names(fake_model))) == 0
+    assert fake_model.call_counts["DesignConcrete.GetSummaryResultsBeam"] == 0
+    assert fake_model.call_counts["DatabaseTables.SetTableForEditingArray"] == 0
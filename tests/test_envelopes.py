@@ -0,0 +1,79 @@
+import numpy as np
+
+from db.operations import create_database, load_frame_envelopes, load_frame_forces, store_analysis_results
+from etabs_api.envelopes import compute_envelopes, reduce_envelope
+from etabs_api.results import base_combo_name
+
+
+def test_reduce_envelope_ragged_stations():
+    nan = np.nan
+    # 2 grinzi x 2 combinații x 3 stații; a doua grindă are doar 2 stații (completare NaN)
+    values = np.array([
+        [[1.0, 5.0, -2.0], [3.0, 4.0, -1.0]],
+        [[2.0, -3.0, nan], [-1.0, 6.0, nan]],
+    ])
+    max_values, max_combo, min_values, min_combo = reduce_envelope(values)
+
+    np.testing.assert_array_equal(max_values, [[3.0, 5.0, -1.0], [2.0, 6.0, nan]])
+    np.testing.assert_array_equal(min_values, [[1.0, 4.0, -2.0], [-1.0, -3.0, nan]])
+    np.testing.assert_array_equal(max_combo, [[1, 0, 1], [0, 1, -1]])
+    np.testing.assert_array_equal(min_combo, [[0, 1, 0], [1, 0, -1]])
+
+
+def test_reduce_envelope_governing_combo_respects_mask():
+    values = np.array([[[10.0, -10.0], [1.0, 2.0], [3.0, -4.0]]])
+    # Combinația 0 (extremul absolut) nu aparține setului grinzii
+    mask = np.array([[False, True, True]])
+    max_values, max_combo, min_values, min_combo = reduce_envelope(values, mask)
+
+    np.testing.assert_array_equal(max_values, [[3.0, 2.0]])
+    np.testing.assert_array_equal(max_combo, [[2, 1]])
+    np.testing.assert_array_equal(min_values, [[1.0, -4.0]])
+    np.testing.assert_array_equal(min_combo, [[1, 2]])
+
+
+def test_reduce_envelope_no_allowed_combo():
+    values = np.ones((1, 2, 2))
+    max_values, max_combo, _, _ = reduce_envelope(values, np.zeros((1, 2), dtype=bool))
+
+    assert np.isnan(max_values).all()
+    assert (max_combo == -1).all()
+
+
+def test_compute_envelopes_names_governing_combos():
+    def pair(stations, m3):
+        stations = np.array(stations, dtype=float)
+        return {"Station": stations, "M3": np.array(m3, dtype=float)}
+
+    forces = {
+        ("B1", "ULS1"): pair([0, 1, 2], [1, 7, 2]),
+        ("B1", "ULS2"): pair([0, 1, 2], [4, 3, 5]),
+        ("B2", "ULS1"): pair([0, 2], [-1, -6]),
+    }
+    envelope = compute_envelopes(["B1", "B2"], [["ULS1", "ULS2"], ["ULS1"]], forces, ("M3",))["M3"]
+
+    first = envelope.row(0)
+    np.testing.assert_array_equal(first["Max"], [4, 7, 5])
+    assert first["MaxCombo"] == ["ULS2", "ULS1", "ULS2"]
+    second = envelope.row(1)
+    np.testing.assert_array_equal(second["Station"], [0, 2])
+    assert second["MinCombo"] == ["ULS1", "ULS1"]
+
+
+def test_results_step_stores_envelopes(fake_model, beams):
+    assert create_database(beams)
+    fake_model.reset_counts()
+    assert store_analysis_results()
+    # Înfășurătorile se calculează din FrameForces, fără apeluri ETABS suplimentare
+    assert fake_model.call_counts["Results.FrameForce"] == 1
+
+    envelopes = load_frame_envelopes()
+    forces = load_frame_forces()
+    assert envelopes
+    for (beam, _, comb_set, component), entry in envelopes.items():
+        combos = {"Upper": {"ULS1"}, "Lower": {"SEISM EX+", "SEISM EX-"}}[comb_set]
+        values = np.array([forces[key][component] for key in forces
+                           if key[0] == beam and base_combo_name(key[1]) in combos])
+        np.testing.assert_allclose(entry["Max"], values.max(axis=0))
+        np.testing.assert_allclose(entry["Min"], values.min(axis=0))
+        assert {base_combo_name(combo) for combo in entry["MaxCombo"] + entry["MinCombo"]} <= combos
@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pytest
+
+from etabs_api.connection import get_sap_model
+from etabs_api.executor import EtabsExecutor
+
+
+class _Root:
+    """Înlocuitor minimal pentru Tk: after() doar reține funcția, pomparea se face manual"""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, func):
+        self.scheduled.append(func)
+        return len(self.scheduled)
+
+    def after_cancel(self, after_id):
+        pass
+
+    def pump(self):
+        self.scheduled.pop(0)()
+
+
+@pytest.fixture
+def executor(fake_model):
+    executor = EtabsExecutor().start()
+    yield executor
+    executor.shutdown()
+
+
+def test_submit_runs_on_worker_with_model(executor, fake_model):
+    caller = threading.get_ident()
+    future = executor.submit(lambda: (threading.get_ident(), get_sap_model()))
+
+    worker, model = future.result(timeout=5)
+    assert worker != caller
+    assert model is fake_model
+
+
+def test_submit_batch_keeps_order(executor, fake_model):
+    names = list(fake_model.data.frames)[:3]
+    fake_model.reset_counts()
+    future = executor.submit_batch([(lambda name: get_sap_model().FrameObj.GetGUID(name)[0], (name,))
+                                    for name in names] + [(len, ("abc",))])
+
+    assert future.result(timeout=5) == [fake_model.data.frames[name]["guid"] for name in names] + [3]
+    assert fake_model.call_counts["FrameObj.GetGUID"] == 3
+
+
+def test_callbacks_and_errors_without_tk(executor):
+    results, errors = [], []
+    done = threading.Event()
+
+    def fail():
+        raise ValueError("eroare ETABS")
+
+    executor.submit(lambda: 42, callback=results.append)
+    executor.submit(fail, callback=results.append, errback=lambda error: (errors.append(error), done.set()))
+
+    assert done.wait(5)
+    assert results == [42]
+    assert isinstance(errors[0], ValueError)
+
+
+def test_cancel_pending(executor):
+    release = threading.Event()
+    started = threading.Event()
+    blocking = executor.submit(lambda: (started.set(), release.wait(5)))
+    assert started.wait(5)
+
+    pending = [executor.submit(lambda: None) for _ in range(3)]
+    assert executor.cancel_pending() == 3
+    release.set()
+
+    assert blocking.result(timeout=5)[1] is True
+    assert all(future.cancelled() for future in pending)
+
+
+def test_shutdown_finishes_scheduled_requests(fake_model):
+    executor = EtabsExecutor().start()
+    futures = [executor.submit(lambda i=i: i * i) for i in range(5)]
+
+    executor.shutdown(wait=True)
+
+    assert [future.result(timeout=0) for future in futures] == [0, 1, 4, 9, 16]
+    assert executor._thread is None
+
+
+def test_callbacks_pumped_on_root_thread(fake_model):
+    root = _Root()
+    executor = EtabsExecutor(root).start()
+    threads = []
+    try:
+        executor.submit(lambda: 1, callback=lambda _: threads.append(threading.get_ident())).result(timeout=5)
+        time.sleep(0.05)
+        assert threads == []
+
+        # Callback-ul rulează doar la pomparea de pe firul "Tk"
+        deadline = time.monotonic() + 5
+        while not threads and time.monotonic() < deadline:
+            root.pump()
+        assert threads == [threading.get_ident()]
+    finally:
+        executor.shutdown()
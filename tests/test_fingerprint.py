@@ -0,0 +1,88 @@
+from db.operations import create_database, load_frame_forces, store_analysis_results
+
+
+def _build(beams):
+    assert create_database(beams)
+    return store_analysis_results()
+
+
+def _forces(db_path="frames.db"):
+    return {key: value["M3"].tolist() for key, value in load_frame_forces(db_path).items()}
+
+
+def test_unchanged_model_reuses_frame_forces(fake_model, beams):
+    assert _build(beams)
+    first = _forces()
+
+    fake_model.reset_counts()
+    assert _build(beams)
+
+    assert fake_model.call_counts["Results.FrameForce"] == 0
+    assert _forces() == first
+
+
+def test_combo_change_reextracts_frame_forces(fake_model, beams):
+    assert _build(beams)
+    first = _forces()
+
+    # Doar factorul unei combinații se schimbă: frame-urile (și hash-urile lor) rămân aceleași
+    fake_model.data.combos["ULS1"] = [(0, "DEAD", 1.5), (0, "SDEAD", 1.5), (0, "LIVE", 1.5)]
+    fake_model.reset_counts()
+    assert _build(beams)
+
+    assert fake_model.call_counts["Results.FrameForce"] == 1
+    second = _forces()
+    assert second.keys() == first.keys()
+    changed = [key for key in first if first[key] != second[key]]
+    assert changed and all(combo == "ULS1" for _, combo in changed)
+
+
+def test_load_pattern_change_reextracts_frame_forces(fake_model, beams):
+    assert _build(beams)
+    fake_model.data.load_cases.append("WIND")
+
+    fake_model.reset_counts()
+    assert _build(beams)
+    assert fake_model.call_counts["Results.FrameForce"] == 1
+
+
+def test_analysis_state_change_reextracts_frame_forces(fake_model, beams):
+    assert _build(beams)
+    fake_model.data.locked = False
+
+    fake_model.reset_counts()
+    _build(beams)
+    assert fake_model.call_counts["Results.FrameForce"] == 1
+
+
+def test_unchanged_model_skips_results_extraction(fake_model, beams):
+    fake_model.reset_counts()
+    assert _build(beams)
+    fresh = fake_model.total_calls
+
+    fake_model.reset_counts()
+    assert _build(beams)
+
+    for call in ("Results.FrameForce", "DesignConcrete.GetSummaryResultsBeam",
+                 "DatabaseTables.SetTableForEditingArray"):
+        assert fake_model.call_counts[call] == 0
+    assert fake_model.total_calls < fresh
+
+
+def test_results_rerun_on_same_database_keeps_results(fake_model, beams):
+    assert _build(beams)
+    first = _forces()
+
+    fake_model.reset_counts()
+    assert store_analysis_results()
+
+    assert fake_model.call_counts["Results.FrameForce"] == 0
+    assert fake_model.call_counts["DesignConcrete.GetSummaryResultsBeam"] == 0
+    assert _forces() == first
+
+
+def test_create_database_does_not_fingerprint_model(fake_model, beams):
+    fake_model.reset_counts()
+    assert create_database(beams)
+
+    assert fake_model.call_counts["Analyze.GetCaseStatus"] == 0
@@ -0,0 +1,45 @@
+import sqlite3
+
+from etabs_api import operations
+from etabs_api.frame_store import FRAME_STORE_TABLES, FrameStore, load_frame_store
+
+
+def test_getters_read_the_bulk_store(fake_model, beams):
+    fake_model.reset_counts()
+    modifiers = {name: operations.get_prop_modifiers(name) for name in beams}
+    releases = {name: operations.get_end_releases(name) for name in beams}
+    ratios = {name: operations.get_rebar_ratio(name) for name in beams}
+    table_calls = fake_model.call_counts["DatabaseTables.GetTableForDisplayArray"]
+
+    # Un apel per tabel pentru tot modelul, niciun apel per frame
+    assert table_calls <= len(FRAME_STORE_TABLES)
+    assert fake_model.call_counts["FrameObj.GetModifiers"] == 0
+    assert fake_model.call_counts["FrameObj.GetReleases"] == 0
+
+    name = beams[0]
+    frame = fake_model.data.frames[name]
+    assert list(modifiers[name].values()) == list(frame["modifiers"])
+    assert [releases[name]["i"][key] for key in releases[name]["i"]] == list(frame["releases_i"])
+    assert ratios[name] == frame["rebar_ratio"]
+
+    fake_model.reset_counts()
+    operations.get_end_length_offsets(name)
+    operations.get_output_stations(name)
+    assert fake_model.call_counts["DatabaseTables.GetTableForDisplayArray"] == 0
+
+
+def test_frame_without_rebar_row_has_no_ratio(fake_model, beams):
+    fake_model.data.frames[beams[0]]["rebar_ratio"] = None
+    assert operations.get_rebar_ratio(beams[0]) is None
+
+
+def test_store_round_trip_through_sqlite(fake_model, beams):
+    store = load_frame_store(beams)
+    conn = sqlite3.connect(":memory:")
+    store.to_sqlite(conn)
+    loaded = FrameStore.from_sqlite(conn)
+    conn.close()
+
+    assert loaded.names == store.names
+    assert loaded.records.tobytes() == store.records.tobytes()
+    assert loaded.prop_modifiers(beams[3]) == store.prop_modifiers(beams[3])
@@ -0,0 +1,43 @@
+import math
+
+import numpy as np
+
+from etabs_api.geometry import FrameGeometry, get_frame_geometry
+from etabs_api.operations import get_frame_length
+
+
+def test_frame_geometry_vectors():
+    geometry = FrameGeometry(["1", "2", "3"],
+                             [[0, 0, 0], [0, 0, 0], [1, 1, 0]],
+                             [[3, 4, 0], [0, 0, 3], [1, 3, 0]])
+
+    np.testing.assert_allclose(geometry.lengths, [5.0, 3.0, 2.0])
+    assert geometry.vertical.tolist() == [False, True, False]
+    assert math.isclose(geometry.plan_angle("3"), 90.0)
+    assert geometry.midpoint("2") == (0.0, 0.0, 1.5)
+    np.testing.assert_allclose(geometry.lengths_for(["3", "X"]), [2.0, 0.0])
+    assert np.isnan(geometry.plan_angles_for(["X"])[0])
+    assert geometry.length("X", default=-1.0) == -1.0
+
+
+def test_geometry_matches_points_in_one_call(fake_model):
+    fake_model.reset_counts()
+    geometry = get_frame_geometry()
+
+    assert fake_model.call_counts["FrameObj.GetAllFrames"] == 1
+    assert fake_model.call_counts["PointObj.GetCoordCartesian"] == 0
+    assert len(geometry) == len(fake_model.data.frames)
+    for name, frame in list(fake_model.data.frames.items())[:50]:
+        point_i, point_j = (fake_model.data.points[p] for p in frame["points"])
+        assert math.isclose(geometry.length(name), math.dist(point_i, point_j), rel_tol=1e-9)
+
+
+def test_frame_length_uses_cached_geometry(fake_model):
+    names = list(fake_model.data.frames)[:100]
+    get_frame_geometry()
+    fake_model.reset_counts()
+
+    lengths = [get_frame_length(name) for name in names]
+
+    assert fake_model.total_calls == 0
+    assert all(length > 0 for length in lengths)
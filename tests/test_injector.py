@@ -0,0 +1,106 @@
+import sqlite3
+
+from db.operations import create_database
+from etabs_api.injector import apply_plan, plan_injection
+
+
+def _set_target(column, value, name):
+    with sqlite3.connect("frames.db") as conn:
+        conn.execute(f"UPDATE Frames SET {column} = ? WHERE UniqueName = ?", (value, name))
+    conn.close()
+
+
+def _other_section(fake_model, name):
+    current = fake_model.data.frames[name]["section"]
+    return next(section for section in ("B25x50", "B30x60", "B40x80") if section != current)
+
+
+def test_new_database_has_no_targets(fake_model, beams):
+    assert create_database(beams)
+
+    with sqlite3.connect("frames.db") as conn:
+        targets = conn.execute("SELECT COUNT(*) FROM Frames WHERE Section IS NOT NULL OR ModI33 IS NOT NULL "
+                               "OR RebarRatio IS NOT NULL").fetchone()[0]
+    conn.close()
+    assert targets == 0
+    assert len(plan_injection()) == 0
+
+
+def test_inject_applies_edited_targets(fake_model, beams):
+    from etabs_api.injector import inject_to_etabs
+
+    assert create_database(beams)
+    name = beams[5]
+    section = _other_section(fake_model, name)
+    _set_target("Section", section, name)
+    _set_target("RebarRatio", 0.012, beams[6])
+
+    assert len(inject_to_etabs(dry_run=True)) == 2
+    assert fake_model.data.frames[name]["section"] != section
+
+    fake_model.reset_counts()
+    inject_to_etabs(dry_run=False)
+    assert fake_model.data.frames[name]["section"] == section
+    assert fake_model.data.frames[beams[6]]["rebar_ratio"] == 0.012
+    assert fake_model.call_counts["View.RefreshView"] == 1
+    assert len(plan_injection()) == 0
+
+
+def test_changed_target_section_produces_plan(fake_model, beams):
+    assert create_database(beams)
+    name = beams[3]
+    section = _other_section(fake_model, name)
+    _set_target("Section", section, name)
+
+    plan = plan_injection()
+    assert [(change.frame_name, change.desired) for change in plan.sections] == [(name, section)]
+    assert not plan.modifiers and not plan.rebar_ratios
+
+    assert apply_plan(plan) == 1
+    assert fake_model.data.frames[name]["section"] == section
+    assert len(plan_injection()) == 0
+
+
+def test_changed_target_modifier_produces_plan(fake_model, beams):
+    assert create_database(beams)
+    _set_target("ModI33", 0.35, beams[0])
+
+    plan = plan_injection()
+    assert len(plan) == 1
+    assert plan.modifiers[0].frame_name == beams[0]
+    assert plan.modifiers[0].desired[5] == 0.35
+
+
+def test_section_changed_in_model_is_restored(fake_model, beams):
+    assert create_database(beams)
+    name = beams[7]
+    original = fake_model.data.frames[name]["section"]
+    _set_target("Section", original, name)
+    fake_model.data.frames[name]["section"] = _other_section(fake_model, name)
+
+    plan = plan_injection()
+    assert [(change.frame_name, change.desired) for change in plan.sections] == [(name, original)]
+
+
+def test_rebar_ratio_without_table_row_is_reported_failed(fake_model, beams):
+    from etabs_api.injector import FrameChange, InjectionPlan
+
+    assigned, unassigned = beams[0], beams[1]
+    fake_model.data.frames[unassigned]["rebar_ratio"] = None
+    plan = InjectionPlan()
+    plan.rebar_ratios = [FrameChange(assigned, "RebarRatio", 0.0, 0.02),
+                         FrameChange(unassigned, "RebarRatio", float("nan"), 0.02)]
+
+    assert apply_plan(plan) == 1
+    assert fake_model.data.frames[assigned]["rebar_ratio"] == 0.02
+    assert fake_model.data.frames[unassigned]["rebar_ratio"] is None
+
+
+def test_unreadable_rebar_ratio_is_planned(fake_model, beams):
+    assert create_database(beams)
+    name = beams[2]
+    fake_model.data.frames[name]["rebar_ratio"] = None
+    _set_target("RebarRatio", 0.015, name)
+
+    plan = plan_injection()
+    assert [change.frame_name for change in plan.rebar_ratios] == [name]
@@ -0,0 +1,52 @@
+from etabs_api import model_index
+from etabs_api.model_index import ModelIndex, get_model_index
+from etabs_api.operations import get_label_and_story
+
+
+def test_model_index_lookups():
+    index = ModelIndex(["1", "2", "3"], ["B1", "B2", "C1"], ["Story2", "Story1", "Story2"],
+                       ["Story2", "Story1"], [6.0, 3.0])
+
+    assert index.label_and_story("3") == ["C1", "Story2"]
+    assert index.label_and_story("X") is None
+    assert index.story_names == ["Story1", "Story2"]
+    assert index.story_elevation("Story2") == 6.0 and index.story_elevation("Roof") is None
+    assert index.story_at_elevation(4.5) == "Story2"
+    assert index.story_at_elevation(3.0005) == "Story1"
+    assert index.story_at_elevation(9.0) is None
+    assert sorted(index.frames_on_story("Story2")) == ["1", "3"]
+
+
+def test_model_index_two_bulk_calls(fake_model):
+    fake_model.reset_counts()
+    index = get_model_index()
+
+    assert fake_model.call_counts["FrameObj.GetLabelNameList"] == 1
+    assert fake_model.call_counts["Story.GetStories"] == 1
+    assert len(index) == len(fake_model.data.frames)
+    assert index.story_names == [story[0] for story in fake_model.data.stories]
+
+
+def test_label_and_story_served_from_index(fake_model):
+    names = list(fake_model.data.frames)[:200]
+    get_model_index()
+    fake_model.reset_counts()
+
+    values = [get_label_and_story(name) for name in names]
+
+    assert fake_model.call_counts["FrameObj.GetLabelFromName"] == 0
+    assert fake_model.call_counts["FrameObj.GetLabelNameList"] == 0
+    assert values == [[fake_model.data.frames[name]["label"], fake_model.data.frames[name]["story"]]
+                      for name in names]
+
+
+def test_model_index_rebuilt_when_frame_count_changes(fake_model, monkeypatch):
+    monkeypatch.setattr(model_index._index_cache, "interval", 0)
+    get_model_index()
+
+    source = next(iter(fake_model.data.frames.values()))
+    fake_model.data.frames["NEW"] = dict(source, label="B9999")
+    fake_model.reset_counts()
+
+    assert get_model_index().label_and_story("NEW") == ["B9999", source["story"]]
+    assert fake_model.call_counts["FrameObj.GetLabelNameList"] == 1
@@ -0,0 +1,24 @@
+from etabs_api import operations
+from etabs_api.operations import HIDDEN_GROUP_NAME, cleanup_hidden_frames, hide_specific_frames
+
+
+def test_hide_assigns_group_with_one_table_edit(fake_model, beams):
+    first, second = beams[:40], beams[40:60]
+    fake_model.data.selected[:] = beams[:5]
+    try:
+        fake_model.reset_counts()
+        assert hide_specific_frames(first)
+        assert fake_model.call_counts["DatabaseTables.SetTableForEditingArray"] == 1
+        assert fake_model.call_counts["FrameObj.SetGroupAssign"] == 0
+        assert fake_model.call_counts["SelectObj.GetSelected"] == 0
+        assert fake_model.data.groups[HIDDEN_GROUP_NAME] == set(first)
+
+        # Grupurile următoare se adaugă la cele deja ascunse
+        fake_model.reset_counts()
+        assert hide_specific_frames(second + first[:3])
+        assert fake_model.call_counts["DatabaseTables.SetTableForEditingArray"] == 1
+        assert fake_model.data.groups[HIDDEN_GROUP_NAME] == set(first + second)
+    finally:
+        assert cleanup_hidden_frames()
+    assert HIDDEN_GROUP_NAME not in fake_model.data.groups
+    assert not operations._hidden_group_created
@@ -0,0 +1,87 @@
+import sqlite3
+
+import pytest
+
+from db.operations import create_database, store_analysis_results
+from etabs_api.results import RESULTS_GROUP_NAME, extract_frame_forces, temporary_frame_group
+
+
+def _count(table):
+    with sqlite3.connect("frames.db") as conn:
+        count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    conn.close()
+    return count
+
+
+def test_create_database_does_not_extract_results(fake_model, beams):
+    fake_model.reset_counts()
+    assert create_database(beams)
+
+    assert fake_model.call_counts["Results.FrameForce"] == 0
+    assert fake_model.call_counts["DesignConcrete.GetSummaryResultsBeam"] == 0
+    assert fake_model.call_counts["ResultsSetup.DeselectAllCasesAndCombosForOutput"] == 0
+
+
+def test_results_step_restores_output_selection(fake_model, beams):
+    fake_model.data.output_cases.update({"DEAD", "LIVE"})
+    fake_model.data.output_combos.update({"SLS1"})
+    assert create_database(beams)
+
+    fake_model.reset_counts()
+    assert store_analysis_results()
+    assert fake_model.call_counts["Results.FrameForce"] == 1
+    assert fake_model.call_counts["DesignConcrete.GetSummaryResultsBeam"] == 1
+    assert _count("FrameForces") > 0 and _count("BeamDesign") > 0
+
+    assert fake_model.data.output_cases == {"DEAD", "LIVE"}
+    assert fake_model.data.output_combos == {"SLS1"}
+
+
+def _beam_names(fake_model, count=30):
+    return [name for name, frame in fake_model.data.frames.items() if frame["label"].startswith("B")][:count]
+
+
+def test_extract_frame_forces_single_call(fake_model):
+    names = _beam_names(fake_model)
+    beam_combos = {name: ["ULS1"] if i % 2 else ["ULS1", "SEISM EX+"] for i, name in enumerate(names)}
+    fake_model.reset_counts()
+    results = extract_frame_forces(beam_combos)
+
+    # Un singur FrameForce pe grupul temporar (creat cu o editare de tabel și șters la final)
+    assert fake_model.call_counts["Results.FrameForce"] == 1
+    assert fake_model.call_counts["DatabaseTables.SetTableForEditingArray"] == 1
+    assert fake_model.call_counts["FrameObj.SetGroupAssign"] == 0
+    assert RESULTS_GROUP_NAME not in fake_model.data.groups
+    assert {key for key, _ in results.items()} == {(name, combo) for name, combos in beam_combos.items()
+                                                   for combo in combos}
+    for _, forces in results.items():
+        assert len(forces["Station"]) == len(forces["M3"]) > 0
+        assert (forces["Station"][1:] >= forces["Station"][:-1]).all()
+
+
+def test_extract_frame_forces_envelope_labels(fake_model):
+    names = _beam_names(fake_model, 5)
+    results = extract_frame_forces({name: ["ENV SEISM"] for name in names})
+
+    assert {combo for _, combo in (key for key, _ in results.items())} == {"ENV SEISM (Max)", "ENV SEISM (Min)"}
+
+
+def test_temporary_group_is_shared_and_removed(fake_model):
+    names = _beam_names(fake_model)
+    fake_model.reset_counts()
+    with temporary_frame_group(names, "SHARED") as group_name:
+        assert fake_model.data.groups[group_name] == set(names)
+        extract_frame_forces({name: ["ULS1"] for name in names}, group_name)
+        extract_frame_forces({name: ["SLS1"] for name in names}, group_name)
+
+    # Grupul dat nu este recreat de extrageri
+    assert fake_model.call_counts["DatabaseTables.SetTableForEditingArray"] == 1
+    assert fake_model.call_counts["Results.FrameForce"] == 2
+    assert "SHARED" not in fake_model.data.groups
+
+
+def test_temporary_group_removed_on_error(fake_model):
+    with pytest.raises(RuntimeError):
+        with temporary_frame_group(_beam_names(fake_model), "BROKEN"):
+            raise RuntimeError("extragere eșuată")
+    assert "BROKEN" not in fake_model.data.groups
@@ -0,0 +1,82 @@
+import re
+import sqlite3
+
+import pytest
+
+from db.schema import (HOT_QUERIES, LEGACY_FRAMES_TABLE_SQL, SCHEMA_VERSION, check_query_plans, create_frame_indexes,
+                       create_schema, explain_query_plan, migrate)
+
+N_BEAMS = 2000
+
+# "SCAN Frames" fără index = scanare completă (SQLite < 3.36 scrie "SCAN TABLE Frames")
+FULL_SCAN = re.compile(r"^SCAN (TABLE )?Frames(?! USING)")
+
+
+def _frame_rows():
+    return [(str(i), f"guid-{i}", i // 50, i % 50, "AB"[i % 2], f"Sheet{i // 500}") for i in range(N_BEAMS)]
+
+
+def _schema_db(path):
+    conn = sqlite3.connect(path)
+    create_schema(conn)
+    conn.executemany(
+        "INSERT INTO Frames (UniqueName, GUID, GroupID, OrderID, Scenario, SheetName) VALUES (?, ?, ?, ?, ?, ?)",
+        _frame_rows())
+    create_frame_indexes(conn)
+    conn.commit()
+    return conn
+
+
+def _migrated_db(path):
+    """Bază de date din versiunea 1 (fără coloane Excel, fără indexuri), adusă la schema curentă"""
+    conn = sqlite3.connect(path)
+    conn.execute(LEGACY_FRAMES_TABLE_SQL)
+    conn.executemany(
+        "INSERT INTO Frames (UniqueName, GUID, GroupID, OrderID, Scenario, CombUpper, CombLower) "
+        "VALUES (?, ?, ?, ?, ?, 'ULS1', 'SEISM EX+')",
+        [row[:5] for row in _frame_rows()])
+    conn.commit()
+    assert migrate(conn) == SCHEMA_VERSION
+    return conn
+
+
+@pytest.fixture(params=["schema", "migrated", "create_database"])
+def frames_db(request, tmp_path):
+    if request.param == "create_database":
+        # Baza de date construită de create_database pe modelul simulat
+        from db.operations import create_database
+
+        request.getfixturevalue("beams")
+        assert create_database([])
+        conn = sqlite3.connect("frames.db")
+    else:
+        builder = _schema_db if request.param == "schema" else _migrated_db
+        conn = builder(str(tmp_path / "frames.db"))
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_its_index(frames_db, name):
+    query, params, index = HOT_QUERIES[name]
+    plan = explain_query_plan(frames_db, query, params)
+
+    assert any(re.search(rf"USING (COVERING )?INDEX {index}\b", detail) for detail in plan), plan
+    # O scanare este acceptată doar dacă parcurge indexul (ORDER BY servit de idx_frames_group_order)
+    assert not any(FULL_SCAN.match(detail) for detail in plan), plan
+    assert not any("TEMP B-TREE" in detail for detail in plan), plan
+
+
+def test_check_query_plans_reports_all_ok(frames_db):
+    report = check_query_plans(frames_db)
+    assert set(report) == set(HOT_QUERIES)
+    assert all(ok for ok, _ in report.values()), report
+
+
+def test_plans_without_indexes_are_reported(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "frames.db"))
+    create_schema(conn)
+    report = check_query_plans(conn)
+    conn.close()
+    assert not any(ok for ok, _ in report.values()), report
+
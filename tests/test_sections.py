@@ -0,0 +1,48 @@
+from etabs_api import sections
+from etabs_api.fake_model import _add_section
+from etabs_api.operations import get_section_material
+from etabs_api.sections import get_section_catalog, get_section_info
+
+
+def test_catalog_reads_every_section(fake_model):
+    catalog = get_section_catalog()
+
+    assert set(catalog) == set(fake_model.data.sections)
+    assert get_section_info("B30x60") == {"name": "B30x60", "type": "Rectangular", "material": "C25/30",
+                                          "t3": 0.60, "t2": 0.30, "description": "Rect: 0.3x0.6"}
+    assert get_section_info("IPE300")["type"] == "I"
+    assert get_section_info("D40")["type"] == "Circle"
+    assert get_section_info("MISSING") is None
+
+
+def test_catalog_is_cached(fake_model):
+    get_section_catalog()
+    fake_model.reset_counts()
+
+    for _ in range(10):
+        get_section_info("B25x50")
+    assert fake_model.total_calls == 0
+
+
+def test_material_per_frame_reuses_catalog(fake_model):
+    names = list(fake_model.data.frames)[:40]
+    get_section_catalog()
+    fake_model.reset_counts()
+
+    materials = [get_section_material(name) for name in names]
+
+    # Un GetSection per frame; proprietățile secțiunilor vin din catalog
+    assert fake_model.call_counts["FrameObj.GetSection"] == len(names)
+    assert not any(key.startswith("PropFrame.Get") and key != "PropFrame.GetNameList"
+                   for key in fake_model.call_counts)
+    assert materials == [fake_model.data.sections[fake_model.data.frames[name]["section"]]["material"]
+                         for name in names]
+
+
+def test_catalog_reloads_when_sections_change(fake_model, monkeypatch):
+    monkeypatch.setattr(sections._section_catalog, "interval", 0)
+    get_section_catalog()
+
+    _add_section(fake_model.data, "B50x90", "Rectangular", "C35/45", 0.90, 0.50)
+
+    assert get_section_info("B50x90")["material"] == "C35/45"
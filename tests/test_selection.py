@@ -0,0 +1,61 @@
+from etabs_api.selection import AdaptiveInterval, SelectionTracker
+
+
+def test_adaptive_interval_backoff():
+    interval = AdaptiveInterval(min_ms=100, max_ms=400, factor=2)
+
+    assert [interval.next(False) for _ in range(4)] == [200, 400, 400, 400]
+    assert interval.next(True) == 100
+    interval.next(False)
+    interval.reset()
+    assert interval.current == 100
+
+
+def test_tracker_returns_deltas(fake_model):
+    names = list(fake_model.data.frames)[:5]
+    tracker = SelectionTracker()
+
+    fake_model.data.selected[:] = names[:3]
+    delta = tracker.poll()
+    assert delta.added == names[:3] and delta.removed == [] and delta.count == 3
+
+    fake_model.data.selected[:] = names[1:5]
+    delta = tracker.poll()
+    assert delta.added == names[3:5] and delta.removed == names[:1]
+    assert tracker.frames == names[1:5]
+
+
+def test_tracker_one_call_per_poll(fake_model):
+    names = list(fake_model.data.frames)[:200]
+    fake_model.data.selected[:] = names
+    tracker = SelectionTracker()
+    fake_model.reset_counts()
+
+    deltas = [tracker.poll() for _ in range(10)]
+
+    # Fiecare verificare citește selecția completă într-un apel; diferența se calculează o singură dată
+    assert fake_model.total_calls == fake_model.call_counts["SelectObj.GetSelected"] == 10
+    assert fake_model.call_counts["FrameObj.GetSelected"] == 0
+    assert bool(deltas[0]) and not any(deltas[1:])
+    assert (tracker.polls, tracker.fetches) == (10, 1)
+
+
+def test_tracker_reset_starts_from_given_selection(fake_model):
+    names = list(fake_model.data.frames)[:4]
+    fake_model.data.selected[:] = names
+    tracker = SelectionTracker()
+    tracker.reset(names[:2])
+
+    delta = tracker.poll()
+    assert delta.added == names[2:] and delta.removed == []
+
+
+def test_polling_with_backoff_on_idle_selection(fake_model):
+    fake_model.data.selected[:] = list(fake_model.data.frames)[:10]
+    tracker = SelectionTracker()
+    interval = AdaptiveInterval()
+
+    # Cât timp selecția nu se schimbă intervalul crește până la maxim
+    delays = [interval.next(bool(tracker.poll())) for _ in range(12)]
+    assert delays[0] == interval.min_ms
+    assert delays == sorted(delays) and delays[-1] == interval.max_ms
@@ -0,0 +1,59 @@
+import math
+
+from etabs_api.tables import FRAME_ASSIGNMENT_TABLES, FrameAttributeTable, get_frame_assignments
+
+
+def _summary(fake_model, name):
+    frame = fake_model.data.frames[name]
+    point_i, point_j = (fake_model.data.points[p] for p in frame["points"])
+    return frame["label"], frame["story"], frame["section"], math.dist(point_i, point_j)
+
+
+def test_frame_attribute_table_columns():
+    table = FrameAttributeTable()
+    table.set("1", "Label", "B1")
+    table.set("2", "Length", 5.0)
+
+    assert len(table) == 2 and "1" in table and "3" not in table
+    assert table.get("1", "Length", 0.0) == 0.0
+    assert table.get("2", "Length") == 5.0
+    assert table.get("3", "Label", "N/A") == "N/A"
+    assert table.row("1") == {"Label": "B1", "Length": None}
+    assert table.row("3") is None
+
+
+def test_frame_assignments_constant_calls(fake_model):
+    names = list(fake_model.data.frames)[:50]
+    fake_model.reset_counts()
+    table = get_frame_assignments(names)
+
+    # Un apel DatabaseTables pe tabel (+ tabelul de grupuri), niciun apel per frame
+    assert fake_model.call_counts["DatabaseTables.GetTableForDisplayArray"] == len(FRAME_ASSIGNMENT_TABLES) + 1
+    assert fake_model.total_calls == fake_model.call_counts["DatabaseTables.GetTableForDisplayArray"]
+    assert sorted(table.names) == sorted(names)
+    for name in names:
+        label, story, section, length = _summary(fake_model, name)
+        assert (table.get(name, "Label"), table.get(name, "Story"), table.get(name, "Section")) == \
+               (label, story, section)
+        assert math.isclose(table.get(name, "Length"), length, abs_tol=1e-4)
+        assert table.get(name, "GUID") == fake_model.data.frames[name]["guid"]
+
+
+def test_frame_assignments_reads_only_requested_columns(fake_model):
+    fake_model.reset_counts()
+    table = get_frame_assignments(columns=("Label", "GUID"))
+
+    # Summary (Label) + cele trei tabele de conectivitate (GUID), fără tabelul de grupuri
+    assert fake_model.call_counts["DatabaseTables.GetTableForDisplayArray"] == 4
+    assert len(table) == len(fake_model.data.frames)
+    assert set(table.columns) == {"Label", "GUID"}
+
+
+def test_frame_assignments_groups(fake_model):
+    names = list(fake_model.data.frames)[:3]
+    fake_model.data.groups["G1"] = set(names[:2])
+
+    table = get_frame_assignments(names, columns=("Groups",))
+
+    assert table.get(names[0], "Groups") == ["G1"]
+    assert table.get(names[2], "Groups") is None